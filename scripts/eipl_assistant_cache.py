@@ -0,0 +1,218 @@
+"""
+Response cache for the EIPL Assist chat backend (``gemini_eipl_backend``).
+
+- Keyed on a hash of the terminal context with volatile fields (``generated_at``) removed and keys
+  sorted, plus the question lower-cased with whitespace and trailing punctuation normalized.
+- In-process LRU with TTL, optionally backed by Redis so several workers share answers.
+- Single-flight: concurrent identical questions share one model call.
+- Failed model calls are not cached.
+- Lookups by outcome on the shared Prometheus registry (``eipl_assistant_cache_requests_total``);
+  the hit rate is ``(hit + redis_hit + coalesced) / total``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import eipl_watchdog_metrics as metrics
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    redis = None
+
+LOGGER = logging.getLogger("eipl-assistant-cache")
+
+VOLATILE_CONTEXT_KEYS = frozenset({"generated_at"})
+
+REQUESTS = metrics.REGISTRY.register(
+    metrics.Counter(
+        "eipl_assistant_cache_requests_total",
+        "Assistant response cache lookups: hit, redis_hit, miss, coalesced.",
+        ["outcome"],
+    )
+)
+MODEL_SECONDS = metrics.REGISTRY.register(
+    metrics.Histogram("eipl_assistant_model_call_seconds", "Time for one uncached assistant model call.")
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _strip_volatile(item) for key, item in value.items() if key not in VOLATILE_CONTEXT_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def context_fingerprint(terminal_context_json: str) -> str:
+    """SHA-256 of the context's canonical JSON without volatile fields (of the raw text if not JSON)."""
+    try:
+        canonical = json.dumps(
+            _strip_volatile(json.loads(terminal_context_json)),
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+    except ValueError:
+        canonical = terminal_context_json.strip()
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def normalize_question(question: str) -> str:
+    return _WHITESPACE.sub(" ", question).strip().rstrip("?!. ").casefold()
+
+
+def response_key(terminal_context_json: str, question: str) -> str:
+    question_hash = hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()
+    return f"{context_fingerprint(terminal_context_json)}:{question_hash}"
+
+
+class AssistantResponseCache:
+    """
+    Assistant replies (the JSON payload sent to the frontend) per context and question.
+
+    Redis shares replies between workers; each worker still keeps its own LRU copy, so a reply
+    found in Redis can be served locally for up to ``ttl_seconds`` more.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 60.0,
+        max_entries: int = 1000,
+        redis_client: Optional[Any] = None,
+        redis_prefix: str = "eipl:assistant:",
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.redis_client = redis_client
+        self.redis_prefix = redis_prefix
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, "Future[str]"] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    def get(self, terminal_context_json: str, question: str, compute: Callable[[], str]) -> str:
+        key = response_key(terminal_context_json, question)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._local.get(key)
+            if cached is not None and cached[0] > now:
+                self._local.move_to_end(key)
+                self.hits += 1
+                REQUESTS.inc(outcome="hit")
+                return cached[1]
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                outcome = "coalesced"
+            else:
+                future = Future()
+                self._inflight[key] = future
+                outcome = "leader"
+        if outcome == "coalesced":
+            REQUESTS.inc(outcome=outcome)
+            return future.result()
+
+        try:
+            value = self._get_redis(key)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                REQUESTS.inc(outcome="redis_hit")
+                self._put_local(key, value)
+            else:
+                with self._lock:
+                    self.misses += 1
+                REQUESTS.inc(outcome="miss")
+                started = time.monotonic()
+                value = compute()
+                MODEL_SECONDS.observe(time.monotonic() - started)
+                self._put_local(key, value)
+                self._put_redis(key, value)
+        except Exception as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def _put_local(self, key: str, value: str) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _get_redis(self, key: str) -> Optional[str]:
+        if self.redis_client is None:
+            return None
+        try:
+            return self.redis_client.get(f"{self.redis_prefix}{key}")
+        except Exception:
+            LOGGER.exception("Redis assistant cache lookup failed; calling the model.")
+            return None
+
+    def _put_redis(self, key: str, value: str) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.set(f"{self.redis_prefix}{key}", value, ex=max(1, int(self.ttl_seconds)))
+        except Exception:
+            LOGGER.exception("Redis assistant cache write failed.")
+
+
+def create_assistant_cache(
+    ttl_seconds: float,
+    redis_url: Optional[str],
+    max_entries: int = 1000,
+) -> AssistantResponseCache:
+    if redis_url and redis is not None:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True)
+            client.ping()
+            return AssistantResponseCache(ttl_seconds=ttl_seconds, max_entries=max_entries, redis_client=client)
+        except Exception:
+            LOGGER.exception("Redis unavailable; using in-process assistant cache.")
+    return AssistantResponseCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+
+def create_assistant_cache_from_env() -> Optional[AssistantResponseCache]:
+    """
+    Cache configured by ``ASSISTANT_CACHE_TTL_SECONDS`` (0 disables), ``ASSISTANT_CACHE_MAX_ENTRIES``
+    and ``ASSISTANT_CACHE_REDIS_URL``.
+    """
+    ttl_seconds = float(os.getenv("ASSISTANT_CACHE_TTL_SECONDS", "60"))
+    if ttl_seconds <= 0:
+        return None
+    return create_assistant_cache(
+        ttl_seconds=ttl_seconds,
+        redis_url=os.getenv("ASSISTANT_CACHE_REDIS_URL", "").strip() or None,
+        max_entries=int(os.getenv("ASSISTANT_CACHE_MAX_ENTRIES", "1000")),
+    )
@@ -0,0 +1,180 @@
+"""
+Async (``AsyncSession``) variants of the executive briefing and gate-pass APIs for FastAPI and
+other asyncio servers.
+
+Each function issues the same statements as its sync counterpart in ``executive_briefing_api`` /
+``gate_pass_approval_engine`` and returns the same payload. The engine needs an async driver:
+``postgresql+asyncpg://...`` or ``sqlite+aiosqlite:///...``.
+
+The briefing's independent metric queries run concurrently with ``asyncio.gather``. A session
+holds one connection and cannot run statements concurrently, so each metric gets a short-lived
+session on the caller's engine; size the pool for roughly six connections per in-flight briefing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import date
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+import executive_briefing_api as briefing
+import gate_pass_approval_engine as gate_pass
+from eipl_compliance_cache import ComplianceCache
+from gate_pass_approval_engine import COMPLIANCE_VIEW, TruckComplianceRecord
+
+
+async def _scalar(session_factory: async_sessionmaker[AsyncSession], stmt: Any) -> Any:
+    async with session_factory() as session:
+        return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def _fetch_briefing_metrics_concurrently(db_session: AsyncSession) -> Dict[str, Any]:
+    session_factory = async_sessionmaker(bind=db_session.bind, expire_on_commit=False)
+    stmts = dict(briefing.briefing_metric_stmts(date.today()), top_incident_id=briefing.top_incident_stmt())
+    # The top incident is fetched alongside the counts rather than after them: one more short
+    # query is cheaper than a second round trip.
+    values = await asyncio.gather(*(_scalar(session_factory, stmt) for stmt in stmts.values()))
+    return briefing.briefing_metrics_from_scalars(dict(zip(stmts, values)))
+
+
+async def _fetch_briefing_metrics_sequentially(db_session: AsyncSession) -> Dict[str, Any]:
+    values = {
+        name: (await db_session.execute(stmt)).scalar_one_or_none()
+        for name, stmt in briefing.briefing_metric_stmts(date.today()).items()
+    }
+    if values["open_incidents"]:
+        values["top_incident_id"] = (await db_session.execute(briefing.top_incident_stmt())).scalar_one_or_none()
+    return briefing.briefing_metrics_from_scalars(values)
+
+
+async def get_executive_briefing_async(
+    db_session: AsyncSession,
+    *,
+    concurrent: bool = True,
+    single_query: bool = False,
+    include_trends: bool = False,
+) -> Dict[str, Any]:
+    """
+    ``get_executive_briefing`` on an ``AsyncSession``.
+
+    ``concurrent`` runs the per-metric queries with ``asyncio.gather``; ``single_query`` reads them
+    in one statement on ``db_session`` instead (and takes precedence).
+    """
+    if single_query:
+        row = (await db_session.execute(briefing.briefing_metrics_stmt(date.today()))).one()
+        briefing_metrics = briefing.briefing_metrics_from_scalars(row._asdict())
+    elif concurrent:
+        briefing_metrics = await _fetch_briefing_metrics_concurrently(db_session)
+    else:
+        briefing_metrics = await _fetch_briefing_metrics_sequentially(db_session)
+    result = briefing.synthesize_briefing(briefing_metrics)
+    if include_trends:
+        rows = (await db_session.execute(briefing.trend_rollup_stmt([briefing.UNTAGGED_TERMINAL]))).scalars()
+        result["trends"] = briefing.trends_from_rollups(rows, [briefing.UNTAGGED_TERMINAL])[briefing.UNTAGGED_TERMINAL]
+    return result
+
+
+async def get_executive_briefing_http_async(db_session: AsyncSession) -> Dict[str, Any]:
+    # Async counterpart of get_executive_briefing_http, for FastAPI routes.
+    return await get_executive_briefing_async(
+        db_session,
+        single_query=os.getenv("BRIEFING_SINGLE_QUERY", "").strip() == "1",
+        include_trends=os.getenv("BRIEFING_INCLUDE_TRENDS", "").strip() == "1",
+    )
+
+
+async def _cache_call(cache: ComplianceCache, method: Callable[..., Any], *args: Any) -> Any:
+    # Redis round trips would block the event loop; the in-process layer is only a dict lookup.
+    if cache.redis_client is not None:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+
+async def _fetch_compliance_records(db_session: AsyncSession, truck_ids: List[str]) -> List[TruckComplianceRecord]:
+    records: List[TruckComplianceRecord] = []
+    for start in range(0, len(truck_ids), gate_pass.BULK_LOOKUP_CHUNK):
+        chunk = truck_ids[start : start + gate_pass.BULK_LOOKUP_CHUNK]
+        records.extend((await db_session.execute(gate_pass.compliance_stmt(chunk))).scalars())
+    return records
+
+
+async def _load_compliance_records(
+    db_session: AsyncSession, truck_ids: List[str]
+) -> Dict[str, TruckComplianceRecord]:
+    cache = gate_pass.get_compliance_cache()
+    if cache is None:
+        return {row.truck_id: row for row in await _fetch_compliance_records(db_session, truck_ids)}
+
+    # The cache's loader is synchronous, so look up without loading and fill the misses here.
+    found, pending = await _cache_call(cache, cache.lookup, COMPLIANCE_VIEW, truck_ids)
+    records = {truck_id: gate_pass.record_from_entry(entry) for truck_id, entry in found.items()}
+    if pending.missing:
+        loaded = {row.truck_id: row for row in await _fetch_compliance_records(db_session, pending.missing)}
+        entries = {truck_id: gate_pass.compliance_entry(row) for truck_id, row in loaded.items()}
+        await _cache_call(cache, cache.fill, COMPLIANCE_VIEW, entries, pending)
+        records.update(loaded)
+    return records
+
+
+async def _verdict_results(
+    db_session: AsyncSession, truck_ids: List[str], user_id: str, today: date
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(truck_ids), gate_pass.BULK_LOOKUP_CHUNK):
+        chunk = truck_ids[start : start + gate_pass.BULK_LOOKUP_CHUNK]
+        for verdict in (await db_session.execute(gate_pass.verdict_stmt(chunk))).scalars():
+            result = gate_pass.verdict_result(verdict, verdict.truck_id, user_id, today)
+            if result is not None:
+                results[verdict.truck_id] = result
+    missing = [truck_id for truck_id in truck_ids if truck_id not in results]
+    if missing:
+        records = await _load_compliance_records(db_session, missing)
+        for truck_id in missing:
+            results[truck_id] = gate_pass.gate_pass_result(records.get(truck_id), truck_id, user_id, today)
+    return results
+
+
+async def process_gate_pass_async(
+    db_session: AsyncSession, truck_id: str, user_id: str, *, use_verdicts: bool = False
+) -> Dict[str, Any]:
+    """``process_gate_pass`` on an ``AsyncSession``, including its ``use_verdicts`` option."""
+    today = date.today()
+    if use_verdicts:
+        return (await _verdict_results(db_session, [truck_id], user_id, today))[truck_id]
+    records = await _load_compliance_records(db_session, [truck_id])
+    return gate_pass.gate_pass_result(records.get(truck_id), truck_id, user_id, today)
+
+
+async def approve_gate_pass_async(
+    db_session: AsyncSession,
+    *,
+    truck_id: str,
+    approved_by_user_id: str,
+    compliance_snapshot: Dict[str, Any],
+    gate_pass_issued: bool = True,
+) -> gate_pass.GatePassAuditLog:
+    """``approve_gate_pass`` on an ``AsyncSession``; the log is returned in the same state."""
+    log = gate_pass.new_audit_log(truck_id, approved_by_user_id, compliance_snapshot, gate_pass_issued)
+    writer = gate_pass.get_audit_writer()
+    if writer is not None:
+        future = writer.submit(gate_pass.writer_audit_row(log))
+        if writer.durable:
+            await asyncio.wrap_future(future)
+        return log
+    if gate_pass.snapshot_dedup_enabled():
+        await db_session.run_sync(lambda session: gate_pass.dedup_audit_snapshot(session.connection(), log))
+    values = gate_pass.audit_log_values(log)
+    db_session.add(log)
+    await db_session.commit()
+    # Detached with its written values loaded: an expired attribute read would need a greenlet.
+    gate_pass.detach_committed(db_session, log, values)
+    return log
+
+
+def create_async_session_factory(db_url: str, **engine_options: Any) -> async_sessionmaker[AsyncSession]:
+    """Session factory for an async URL; ``expire_on_commit=False`` so results stay readable after commit."""
+    engine: AsyncEngine = create_async_engine(db_url, **engine_options)
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
@@ -0,0 +1,179 @@
+"""
+Group-commit writer for gate-pass audit logs.
+
+``approve_gate_pass`` commits each audit row on its own: one transaction and one fsync per gate
+pass. With an ``AuditLogWriter`` configured (see ``gate_pass_approval_engine.set_audit_writer``)
+rows are buffered and written in batched INSERTs, one transaction per batch, whenever
+``max_batch`` rows are waiting or ``flush_interval_seconds`` has passed.
+
+- ``durable=True``: ``approve_gate_pass`` returns only after the row's batch has committed.
+  Concurrent approvals share that commit, so latency is at most one flush interval plus the write.
+- ``durable=False``: ``approve_gate_pass`` returns once the row is buffered; rows still buffered
+  when the process dies are lost. ``close()`` flushes what is left.
+- Row counts and batch sizes on the shared Prometheus registry (``eipl_gate_pass_audit_rows_total``).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Connection, Engine
+
+import eipl_watchdog_metrics as metrics
+
+LOGGER = logging.getLogger("eipl-audit-writer")
+
+ROWS = metrics.REGISTRY.register(
+    metrics.Counter("eipl_gate_pass_audit_rows_total", "Audit rows by write result: written, failed.", ["result"])
+)
+BATCH_ROWS = metrics.REGISTRY.register(
+    metrics.Histogram(
+        "eipl_gate_pass_audit_batch_rows",
+        "Rows written per audit flush.",
+        buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+    )
+)
+
+Row = Dict[str, Any]
+_Pending = Tuple[Row, "Future[None]"]
+
+
+class AuditLogWriter:
+    """
+    Buffers audit rows (plain column dicts for ``table``) and inserts them on a background thread.
+
+    A batch that fails as a whole is retried one row per transaction, so one bad row does not
+    cost the others; rows that still fail are logged and their futures carry the exception.
+    ``prepare`` runs in each write transaction before the INSERT and returns the rows to insert,
+    for companion writes such as deduplicated snapshots.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        table: Table,
+        *,
+        flush_interval_seconds: float = 0.05,
+        max_batch: int = 500,
+        durable: bool = True,
+        prepare: Optional[Callable[[Connection, List[Row]], List[Row]]] = None,
+    ) -> None:
+        self.engine = engine
+        self.table = table
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch = max(1, max_batch)
+        self.durable = durable
+        self.prepare = prepare
+        self.batches = 0
+        self.rows_written = 0
+        self._pending: List[_Pending] = []
+        self._closed = False
+        self._flush_requested = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: Row) -> "Future[None]":
+        """Queue one row; the future resolves once it is committed."""
+        future: "Future[None]" = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("AuditLogWriter is closed.")
+            self._pending.append((row, future))
+            if len(self._pending) >= self.max_batch:
+                self._condition.notify()
+        return future
+
+    def write(self, row: Row, durable: Optional[bool] = None) -> None:
+        """``submit`` and, when durable (the writer's default unless given), wait for the commit."""
+        future = self.submit(row)
+        if self.durable if durable is None else durable:
+            future.result()
+
+    def flush(self) -> None:
+        """Write everything queued so far and wait for it."""
+        with self._condition:
+            futures = [future for _, future in self._pending]
+            self._flush_requested = True
+            self._condition.notify()
+        for future in futures:
+            future.exception()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval_seconds
+                while not (self._closed or self._flush_requested or len(self._pending) >= self.max_batch):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch :]
+                self._flush_requested = bool(self._pending) and self._flush_requested
+                done = self._closed and not self._pending
+            if batch:
+                self._write(batch)
+            if done:
+                return
+
+    def _write(self, batch: List[_Pending]) -> None:
+        try:
+            with self.engine.begin() as connection:
+                self._insert(connection, [row for row, _ in batch])
+        except Exception:
+            LOGGER.exception("Batched write of %s audit row(s) failed; retrying row by row.", len(batch))
+            for row, future in batch:
+                try:
+                    with self.engine.begin() as connection:
+                        self._insert(connection, [row])
+                except Exception as exc:
+                    LOGGER.exception("Audit row %s could not be written.", row.get("id"))
+                    ROWS.inc(result="failed")
+                    future.set_exception(exc)
+                else:
+                    self._written(1)
+                    future.set_result(None)
+            return
+        self._written(len(batch))
+        BATCH_ROWS.observe(len(batch))
+        for _, future in batch:
+            future.set_result(None)
+
+    def _insert(self, connection: Connection, rows: List[Row]) -> None:
+        if self.prepare is not None:
+            rows = self.prepare(connection, rows)
+        connection.execute(insert(self.table), rows)
+
+    def _written(self, count: int) -> None:
+        self.batches += 1
+        self.rows_written += count
+        ROWS.inc(count, result="written")
+
+
+def create_audit_writer_from_env(engine: Engine, table: Table) -> Optional[AuditLogWriter]:
+    """
+    Writer configured by ``GATE_PASS_AUDIT_FLUSH_MS`` (0 disables), ``GATE_PASS_AUDIT_MAX_BATCH``
+    and ``GATE_PASS_AUDIT_DURABLE`` (``0`` returns before the commit).
+    """
+    flush_ms = float(os.getenv("GATE_PASS_AUDIT_FLUSH_MS", "0"))
+    if flush_ms <= 0:
+        return None
+    return AuditLogWriter(
+        engine,
+        table,
+        flush_interval_seconds=flush_ms / 1000.0,
+        max_batch=int(os.getenv("GATE_PASS_AUDIT_MAX_BATCH", "500")),
+        durable=os.getenv("GATE_PASS_AUDIT_DURABLE", "1").strip() != "0",
+    )
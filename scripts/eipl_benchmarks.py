@@ -0,0 +1,1365 @@
+"""
+Offline benchmarks for the EIPL terminal Python scripts.
+
+Usage:
+    python scripts/eipl_benchmarks.py dedup [--redis-url redis://localhost:6379/0]
+    python scripts/eipl_benchmarks.py snapshot [--bays 500 --incidents 5000]
+    python scripts/eipl_benchmarks.py pushdown [--incident-counts 10000 100000 300000]
+    python scripts/eipl_benchmarks.py incidents [--incident-counts 10000 100000 300000]
+    python scripts/eipl_benchmarks.py schedule [--hours 6 --poll-seconds 60]
+    python scripts/eipl_benchmarks.py briefing [--latency-ms 0 5 20 --iterations 20]
+    python scripts/eipl_benchmarks.py terminals [--terminal-counts 5 20 50 --latency-ms 5]
+    python scripts/eipl_benchmarks.py rollup [--history-days 7 30 90]
+    python scripts/eipl_benchmarks.py async [--concurrency 200 --threads 40 --latency-ms 0 20] [--db-url ...]
+    python scripts/eipl_benchmarks.py suite [--scales small medium] [--save run.json] [--compare baseline.json]
+    python scripts/eipl_benchmarks.py convoy [--convoy-sizes 10 100 1000 --latency-ms 0 2]
+    python scripts/eipl_benchmarks.py audit [--threads 8 --seconds 3 --flush-ms 5]
+    python scripts/eipl_benchmarks.py verdicts [--trucks 2000 20000 100000]
+    python scripts/eipl_benchmarks.py snapshots [--approvals 5000 --trucks 200]
+    python scripts/eipl_benchmarks.py assistant [--users 50 --questions 200 --model-ms 800]
+    python scripts/eipl_benchmarks.py herd [--clients 50 --latency-ms 20]
+    python scripts/eipl_benchmarks.py replay [--recording day.jsonl.gz] [--bays 40 --hours 24]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import eipl_assistant_cache as assistant_cache
+import eipl_async_api as async_api
+import eipl_audit_writer as audit_writer
+import eipl_briefing_cache as briefing_cache
+import eipl_briefing_rollup as briefing_rollup
+import eipl_compact_snapshot as compact_snapshot
+import eipl_compliance_verdicts as verdicts
+import eipl_snapshot_dedup as snapshot_dedup
+import eipl_synthetic_data as synthetic_data
+import eipl_terminal_watchdog as watchdog
+import eipl_watchdog_replay as replay
+import executive_briefing_api as briefing
+import gate_pass_approval_engine as gate_pass
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    redis = None
+
+
+DEFAULT_ALERT_COUNTS = [1000, 2500, 5000, 10000]
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def _print_table(title: str, headers: List[str], rows: List[List[Any]]) -> None:
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print(f"\n{title}")
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
+
+
+def bench_dedup(args: argparse.Namespace) -> None:
+    """Per-alert ``should_send`` against batched ``should_send_many``, local and (optionally) Redis."""
+    now = datetime.now(timezone.utc)
+    backends: Dict[str, Optional[Any]] = {"local": None}
+    if args.redis_url:
+        if redis is None:
+            raise SystemExit("redis package is not installed.")
+        client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+        client.ping()
+        backends["redis"] = client
+
+    rows: List[List[Any]] = []
+    for backend, client in backends.items():
+        for count in args.counts:
+            alert_ids = [f"truck-wait-T{i:05d}" for i in range(count)]
+
+            def make_store() -> watchdog.DedupStore:
+                # A fresh prefix per run keeps Redis keys from earlier runs out of the measurement.
+                return watchdog.DedupStore(
+                    ttl_seconds=60,
+                    redis_client=client,
+                    redis_prefix=f"eipl:bench:{uuid.uuid4().hex}:",
+                )
+
+            per_alert_store = make_store()
+            per_alert = _timed(lambda: [per_alert_store.should_send(a, now) for a in alert_ids])
+            batched_store = make_store()
+            batched = _timed(lambda: batched_store.should_send_many(alert_ids, now))
+            rows.append(
+                [
+                    backend,
+                    count,
+                    f"{per_alert * 1000:.1f}",
+                    f"{batched * 1000:.1f}",
+                    f"{per_alert / batched:.1f}x" if batched > 0 else "-",
+                ]
+            )
+
+    _print_table("Alert deduplication", ["backend", "alerts", "per_alert_ms", "batched_ms", "speedup"], rows)
+
+
+def _synthetic_terminal(
+    db_url: str,
+    bays: int,
+    incidents: int,
+    seed: int = 7,
+    occupancy: float = 0.5,
+    open_ratio: Optional[float] = None,
+) -> Any:
+    """
+    Populate ``db_url`` with ``bays`` bays (``occupancy`` of them with a truck) and ``incidents``
+    incidents; ``open_ratio`` sets the share still open (default: a third).
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    engine = create_engine(db_url, future=True)
+    watchdog.Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        for i in range(bays):
+            truck_id = f"TRK-{i:05d}"
+            session.add(
+                watchdog.TruckCompliance(
+                    truck_id=truck_id,
+                    peso_expiry_date=now + timedelta(days=rng.randint(-30, 365)),
+                    spark_arrestor_status=rng.choice(["OK", "PASS", "FAIL"]),
+                )
+            )
+            occupied = rng.random() < occupancy
+            session.add(
+                watchdog.TerminalOps(
+                    bay_id=f"BAY-{i:04d}",
+                    status=rng.choice(["LOADING", "WAITING", "IDLE"]) if occupied else "IDLE",
+                    current_truck_id=truck_id if occupied else None,
+                    lpg_inventory_level=rng.randint(40, 95),
+                    gate_entry_time=now - timedelta(minutes=rng.randint(5, 120)) if occupied else None,
+                )
+            )
+        session.commit()
+        # Core executemany: ORM unit-of-work overhead dominates at hundreds of thousands of rows.
+        for start in range(0, incidents, 50000):
+            session.execute(
+                insert(watchdog.SafetyIncident),
+                [
+                    {
+                        "incident_id": f"INC-{i:07d}",
+                        "severity": rng.choice(["LOW", "MED", "HIGH"]),
+                        "description": "Synthetic safety observation at gantry.",
+                        "created_at": now - timedelta(minutes=incidents - i),
+                        "resolved_status": (
+                            rng.choice(["resolved", "closed", "open"])
+                            if open_ratio is None
+                            else ("open" if rng.random() < open_ratio else rng.choice(["resolved", "closed"]))
+                        ),
+                    }
+                    for i in range(start, min(incidents, start + 50000))
+                ],
+            )
+        session.commit()
+    return engine
+
+
+def bench_snapshot(args: argparse.Namespace) -> None:
+    """Dict snapshot + json.dumps against the compact snapshot + fast serializer on a synthetic terminal."""
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = _synthetic_terminal(f"sqlite:///{os.path.join(workdir, 'terminal.db')}", args.bays, args.incidents)
+        session_factory = sessionmaker(bind=engine)
+        options = dict(horton_sphere_capacity_kl=10000.0, fallback_discharge_rate_tph=6.0, inbound_truck_count=4)
+        variants = {
+            "dict": (watchdog.get_terminal_snapshot, lambda snap: json.dumps(snap).encode("utf-8")),
+            "compact": (watchdog.get_compact_snapshot, compact_snapshot.dumps),
+        }
+
+        rows: List[List[Any]] = []
+        for name, (build, serialize) in variants.items():
+            with session_factory() as session:
+                build(session, **options)  # warm the statement cache
+            build_seconds = 0.0
+            serialize_seconds = 0.0
+            for _ in range(args.iterations):
+                with session_factory() as session:
+                    build_seconds += _timed(lambda: build(session, **options))
+                    snap = build(session, **options)
+                serialize_seconds += _timed(lambda: serialize(snap))
+            body = serialize(snap)
+
+            # Retained size of one snapshot once the session (and its ORM rows) is gone.
+            del snap
+            gc.collect()
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            with session_factory() as session:
+                snap = build(session, **options)
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - baseline
+            tracemalloc.stop()
+            del snap
+
+            rows.append(
+                [
+                    name,
+                    f"{build_seconds / args.iterations * 1000:.2f}",
+                    f"{serialize_seconds / args.iterations * 1000:.2f}",
+                    len(body),
+                    f"{retained / 1024:.0f}",
+                ]
+            )
+        engine.dispose()
+
+    _print_table(
+        f"Snapshot ({args.bays} bays, {args.incidents} incidents, orjson={'yes' if compact_snapshot.orjson else 'no'})",
+        ["variant", "build_ms", "serialize_ms", "json_bytes", "retained_kib"],
+        rows,
+    )
+
+
+def bench_pushdown(args: argparse.Namespace) -> None:
+    """Full snapshot against the SQL-pushdown snapshot, with and without indexes, as incident history grows."""
+    options = dict(horton_sphere_capacity_kl=10000.0, fallback_discharge_rate_tph=6.0, inbound_truck_count=4)
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.incident_counts:
+            engine = _synthetic_terminal(
+                f"sqlite:///{os.path.join(workdir, f'terminal-{count}.db')}",
+                args.bays,
+                count,
+                open_ratio=args.open_ratio,
+            )
+            session_factory = sessionmaker(bind=engine)
+
+            def cycle_ms(build: Callable[..., Any]) -> str:
+                with session_factory() as session:
+                    build(session, **options)
+                    elapsed = sum(_timed(lambda: build(session, **options)) for _ in range(args.iterations))
+                return f"{elapsed / args.iterations * 1000:.1f}"
+
+            full = cycle_ms(watchdog.get_terminal_snapshot)
+            pushdown = cycle_ms(watchdog.get_pushdown_snapshot)
+            watchdog.install_pushdown_indexes(engine)
+            indexed = cycle_ms(watchdog.get_pushdown_snapshot)
+            with session_factory() as session:
+                open_count = len(watchdog.get_pushdown_snapshot(session, **options)["safety_incidents"])
+            rows.append([count, open_count, full, pushdown, indexed])
+            engine.dispose()
+
+    _print_table(
+        f"Pushdown snapshot ({args.bays} bays, SQLite)",
+        ["incidents", "open", "full_ms", "pushdown_ms", "pushdown_indexed_ms"],
+        rows,
+    )
+
+
+def bench_incidents(args: argparse.Namespace) -> None:
+    """New-incident check against the full id set and the created_at watermark as incident history grows."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.incident_counts:
+            db_url = f"sqlite:///{os.path.join(workdir, f'terminal-{count}.db')}"
+            engine = _synthetic_terminal(db_url, args.bays, count)
+            watchdog.install_pushdown_indexes(engine)
+            engine.dispose()
+            config = watchdog.TerminalConfig(terminal_id="bench", db_url=db_url)
+
+            def check_ms(tracker: Optional[watchdog.IncidentWatermark]) -> tuple[str, int]:
+                watcher = watchdog.TerminalWatcher(
+                    config,
+                    dedup=watchdog.DedupStore(ttl_seconds=1800),
+                    dispatcher=replay.ReplaySink(),
+                    incident_watermark=tracker,
+                )
+                try:
+                    watcher.start()
+                    elapsed = sum(_timed(watcher.check_incidents) for _ in range(args.iterations))
+                    assert watcher.state is not None
+                    tracked = len(tracker.recent) if tracker else len(watcher.state.known_incident_ids)
+                finally:
+                    watcher.close()
+                return f"{elapsed / args.iterations * 1000:.2f}", tracked
+
+            ids_ms, ids_tracked = check_ms(None)
+            watermark_ms, watermark_tracked = check_ms(watchdog.IncidentWatermark())
+            rows.append([count, ids_ms, ids_tracked, watermark_ms, watermark_tracked])
+
+    _print_table(
+        "New-incident check (SQLite, indexed)",
+        ["incidents", "id_set_ms", "id_set_tracked", "watermark_ms", "watermark_tracked"],
+        rows,
+    )
+
+
+def bench_schedule(args: argparse.Namespace) -> None:
+    """Queries issued over virtual hours: fixed-interval cycles against the adaptive per-check scheduler."""
+    with tempfile.TemporaryDirectory() as workdir:
+        schedules_spec = args.schedules or watchdog.DEFAULT_CHECK_SCHEDULES
+
+        def run(scenario: str, occupancy: float, adaptive: bool) -> List[Any]:
+            db_url = f"sqlite:///{os.path.join(workdir, f'{scenario}-{adaptive}.db')}"
+            _synthetic_terminal(db_url, args.bays, args.incidents, occupancy=occupancy).dispose()
+            config = watchdog.TerminalConfig(terminal_id="bench", db_url=db_url)
+            clock = replay.VirtualClock(datetime.now(timezone.utc))
+            previous = watchdog.set_clock(clock)
+            watcher = watchdog.TerminalWatcher(
+                config, dedup=watchdog.DedupStore(ttl_seconds=1800), dispatcher=replay.ReplaySink()
+            )
+            queries = [0]
+            event.listen(watcher.engine, "before_cursor_execute", lambda *_: queries.__setitem__(0, queries[0] + 1))
+            end = clock.monotonic() + args.hours * 3600
+            try:
+                watcher.start()
+                if adaptive:
+                    schedules = watchdog.parse_check_schedules(schedules_spec)
+                    scheduler = watchdog.AdaptiveScheduler(watcher.checks(), schedules)
+
+                    def adaptive_loop() -> None:
+                        while clock.monotonic() < end:
+                            clock.sleep(scheduler.run_due())
+
+                    elapsed = _timed(adaptive_loop)
+                    cadence = {s.name: s.base_seconds for s in schedules}
+                else:
+                    def fixed() -> None:
+                        while clock.monotonic() < end:
+                            watcher.run_cycle()
+                            clock.sleep(args.poll_seconds)
+
+                    elapsed = _timed(fixed)
+                    cadence = {"incidents": args.poll_seconds}
+            finally:
+                watchdog.set_clock(previous)
+                watcher.close()
+            return [
+                scenario,
+                "adaptive" if adaptive else "fixed",
+                queries[0],
+                f"{queries[0] / args.hours:.0f}",
+                f"{cadence.get('incidents', '-')}s",
+                f"{elapsed * 1000:.0f}",
+            ]
+
+        # "quiet": no trucks in bays; "busy": half the bays hold trucks that end up past the wait threshold.
+        rows = [
+            run(scenario, occupancy, adaptive)
+            for scenario, occupancy in (("quiet", 0.0), ("busy", 0.5))
+            for adaptive in (False, True)
+        ]
+
+    _print_table(
+        f"Scheduling over {args.hours:g} virtual hours (fixed poll={args.poll_seconds}s, adaptive={schedules_spec})",
+        ["scenario", "loop", "queries", "queries_per_h", "incident_cadence", "cpu_ms"],
+        rows,
+    )
+
+
+def _synthetic_briefing_db(
+    db_url: str, bays: int, queue: int, incidents: int, seed: int = 7, terminals: int = 0
+) -> Any:
+    """
+    Populate the executive briefing tables (its own schema, separate from the watchdog's).
+
+    With ``terminals`` every row is tagged round-robin with one of ``T00``..``Tnn`` and each terminal
+    gets its own inventory history; otherwise rows are untagged (single terminal).
+    """
+    rng = random.Random(seed)
+
+    def terminal(i: int) -> Optional[str]:
+        return f"T{i % terminals:02d}" if terminals else None
+
+    now = datetime.now(timezone.utc)
+    today = date.today()
+    engine = create_engine(db_url, future=True)
+    briefing.Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.execute(
+            insert(briefing.TerminalBay),
+            [
+                {
+                    "bay_id": f"BAY-{i:04d}",
+                    "status": rng.choice(["IDLE", "LOADING", "DISCHARGING", None]),
+                    "active_truck_id": f"TRK-{i:05d}",
+                    "terminal_id": terminal(i),
+                }
+                for i in range(bays)
+            ],
+        )
+        session.execute(
+            insert(briefing.LPGInventory),
+            [
+                {
+                    "horton_sphere_level_percent": rng.uniform(40, 95),
+                    "recorded_at": now - timedelta(minutes=i),
+                    "terminal_id": terminal(i),
+                }
+                for i in range(24 * 60 * max(1, terminals))
+            ],
+        )
+        session.execute(
+            insert(briefing.GateQueue),
+            [
+                {
+                    "truck_id": f"TRK-Q{i:05d}",
+                    "queue_status": "WAITING",
+                    "peso_expiry_date": today + timedelta(days=rng.randint(-30, 365)),
+                    "terminal_id": terminal(i),
+                }
+                for i in range(queue)
+            ],
+        )
+        session.execute(
+            insert(briefing.SafetyIncident),
+            [
+                {
+                    "incident_id": f"INC-{i:07d}",
+                    "status": rng.choice(["OPEN", "CLOSED", "RESOLVED", "RESOLVED"]),
+                    "description": "Synthetic safety observation at gantry.",
+                    "created_at": now - timedelta(minutes=incidents - i),
+                    "terminal_id": terminal(i),
+                }
+                for i in range(incidents)
+            ],
+        )
+        session.commit()
+    return engine
+
+
+def bench_briefing(args: argparse.Namespace) -> None:
+    """Sequential briefing statements against the single round-trip query under simulated network latency."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = _synthetic_briefing_db(
+            f"sqlite:///{os.path.join(workdir, 'briefing.db')}", args.bays, args.queue, args.incidents
+        )
+        latency = [0.0]
+        statements = [0]
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _round_trip(*_: Any) -> None:
+            # Every statement pays one network round trip to a remote database.
+            statements[0] += 1
+            if latency[0]:
+                time.sleep(latency[0])
+
+        session_factory = sessionmaker(bind=engine)
+        for latency_ms in args.latency_ms:
+            latency[0] = latency_ms / 1000.0
+            row: List[Any] = [latency_ms]
+            results = []
+            for single_query in (False, True):
+                with session_factory() as session:
+                    briefing.get_executive_briefing(session, single_query=single_query)  # warm the statement cache
+                    statements[0] = 0
+                    elapsed = sum(
+                        _timed(lambda: briefing.get_executive_briefing(session, single_query=single_query))
+                        for _ in range(args.iterations)
+                    )
+                    issued = statements[0]
+                    results.append(briefing.get_executive_briefing(session, single_query=single_query))
+                row += [issued // args.iterations, f"{elapsed / args.iterations * 1000:.2f}"]
+            if results[0] != results[1]:
+                raise SystemExit("Sequential and single-query briefings differ.")
+            rows.append(row)
+        engine.dispose()
+
+    _print_table(
+        f"Executive briefing ({args.queue} queued, {args.incidents} incidents, SQLite + simulated latency)",
+        ["latency_ms", "sequential_stmts", "sequential_ms", "single_stmts", "single_ms"],
+        rows,
+    )
+
+
+def bench_terminals(args: argparse.Namespace) -> None:
+    """One briefing call per terminal against one batched, grouped call for all of them."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.terminal_counts:
+            engine = _synthetic_briefing_db(
+                f"sqlite:///{os.path.join(workdir, f'terminals-{count}.db')}",
+                args.bays_per_terminal * count,
+                args.queue_per_terminal * count,
+                args.incidents_per_terminal * count,
+                terminals=count,
+            )
+            statements = [0]
+
+            @event.listens_for(engine, "before_cursor_execute")
+            def _round_trip(*_: Any) -> None:
+                statements[0] += 1
+                time.sleep(args.latency_ms / 1000.0)
+
+            terminal_ids = [f"T{i:02d}" for i in range(count)]
+            row: List[Any] = [count]
+            results = []
+            with sessionmaker(bind=engine)() as session:
+                variants = {
+                    "per_terminal": lambda: {
+                        t: briefing.get_executive_briefings(session, [t])[t] for t in terminal_ids
+                    },
+                    "batched": lambda: briefing.get_executive_briefings(session, terminal_ids),
+                }
+                for build in variants.values():
+                    build()  # warm the statement cache
+                    statements[0] = 0
+                    elapsed = sum(_timed(build) for _ in range(args.iterations))
+                    row += [statements[0] // args.iterations, f"{elapsed / args.iterations * 1000:.1f}"]
+                    results.append(build())
+            if results[0] != results[1]:
+                raise SystemExit("Per-terminal and batched briefings differ.")
+            rows.append(row)
+            engine.dispose()
+
+    _print_table(
+        f"Multi-terminal briefings (SQLite, {args.latency_ms:g} ms per statement)",
+        ["terminals", "per_terminal_stmts", "per_terminal_ms", "batched_stmts", "batched_ms"],
+        rows,
+    )
+
+
+def bench_rollup(args: argparse.Namespace) -> None:
+    """24h trends from raw history (range scans, no indexes) against the hourly rollups, plus rollup cost."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for days in args.history_days:
+            engine = _synthetic_briefing_db(
+                f"sqlite:///{os.path.join(workdir, f'rollup-{days}.db')}", 40, 200, args.incidents_per_day * days
+            )
+            session_factory = sessionmaker(bind=engine)
+            now = datetime.now(timezone.utc)
+            with session_factory() as session:
+                # Inventory history at one reading a minute for the whole period.
+                session.execute(
+                    insert(briefing.LPGInventory),
+                    [
+                        {"horton_sphere_level_percent": 40 + (i % 550) / 10, "recorded_at": now - timedelta(minutes=i)}
+                        for i in range(24 * 60, days * 24 * 60)
+                    ],
+                )
+                session.commit()
+                backfill = _timed(lambda: briefing_rollup.run_hourly_rollup(session))
+
+                def raw_trends() -> None:
+                    since = now - timedelta(hours=24)
+                    buckets: Dict[Any, List[float]] = {}
+                    for level, recorded_at in session.execute(
+                        select(briefing.LPGInventory.horton_sphere_level_percent, briefing.LPGInventory.recorded_at)
+                        .where(briefing.LPGInventory.recorded_at >= since)
+                    ):
+                        buckets.setdefault(briefing.hour_bucket(recorded_at), []).append(level)
+                    session.execute(
+                        select(briefing.SafetyIncident.created_at, briefing.SafetyIncident.status)
+                        .where(briefing.SafetyIncident.created_at >= since)
+                    ).all()
+
+                raw = sum(_timed(raw_trends) for _ in range(args.iterations)) / args.iterations
+                rollup = sum(_timed(lambda: briefing.get_briefing_trends(session)) for _ in range(args.iterations))
+                rollup /= args.iterations
+
+                session.execute(
+                    insert(briefing.LPGInventory),
+                    [{"horton_sphere_level_percent": 70.0, "recorded_at": now} for _ in range(60)],
+                )
+                session.commit()
+                incremental = _timed(lambda: briefing_rollup.run_hourly_rollup(session))
+            rows.append(
+                [
+                    days,
+                    f"{backfill * 1000:.0f}",
+                    f"{raw * 1000:.1f}",
+                    f"{rollup * 1000:.2f}",
+                    f"{incremental * 1000:.1f}",
+                ]
+            )
+            engine.dispose()
+
+    _print_table(
+        "Briefing trends (SQLite, 1 inventory reading/min)",
+        ["history_days", "backfill_ms", "raw_scan_ms", "rollup_read_ms", "incremental_run_ms"],
+        rows,
+    )
+
+
+def _async_url(db_url: str) -> str:
+    for sync_prefix, async_prefix in (("sqlite://", "sqlite+aiosqlite://"), ("postgresql://", "postgresql+asyncpg://")):
+        if db_url.startswith(sync_prefix):
+            return async_prefix + db_url[len(sync_prefix):]
+    raise SystemExit(f"No async driver mapping for {db_url}.")
+
+
+def _load_sync(session_factory: Any, request: Callable[[Any], Any], concurrency: int, seconds: float) -> int:
+    """Requests completed by ``concurrency`` threads (FastAPI's sync-route threadpool) in ``seconds``."""
+    deadline = time.perf_counter() + seconds
+
+    def worker() -> int:
+        done = 0
+        while time.perf_counter() < deadline:
+            with session_factory() as session:
+                request(session)
+            done += 1
+        return done
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return sum(pool.map(lambda _: worker(), range(concurrency)))
+
+
+async def _load_async(session_factory: Any, request: Callable[[Any], Any], concurrency: int, seconds: float) -> int:
+    """Requests completed by ``concurrency`` tasks on one event loop in ``seconds``."""
+    deadline = time.perf_counter() + seconds
+
+    async def worker() -> int:
+        done = 0
+        while time.perf_counter() < deadline:
+            async with session_factory() as session:
+                await request(session)
+            done += 1
+        return done
+
+    return sum(await asyncio.gather(*(worker() for _ in range(concurrency))))
+
+
+def _delay_sqlite_statements(engine: Any, latency_ms: float) -> None:
+    """
+    Delay every SQLite statement by ``latency_ms`` on the thread that executes it, like a network
+    round trip: a sync worker blocks, while aiosqlite waits off the event loop.
+    """
+    if not latency_ms:
+        return
+
+    def delay(_: str) -> None:
+        time.sleep(latency_ms / 1000.0)
+
+    @event.listens_for(engine, "connect")
+    def _install(dbapi_connection: Any, _: Any) -> None:
+        if hasattr(dbapi_connection, "run_async"):
+            dbapi_connection.run_async(lambda conn: conn.set_trace_callback(delay))
+        else:
+            dbapi_connection.set_trace_callback(delay)
+
+
+def bench_async(args: argparse.Namespace) -> None:
+    """Requests per second for the sync and async briefing and gate-pass APIs on the same local DB."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        db_url = args.db_url or f"sqlite:///{os.path.join(workdir, 'api.db')}"
+        engine = _synthetic_briefing_db(db_url, 40, 200, args.incidents)
+        gate_pass.Base.metadata.create_all(engine)
+        today = date.today()
+        truck_ids = [f"TRK-{i:05d}" for i in range(args.trucks)]
+        with sessionmaker(bind=engine)() as session:
+            session.execute(
+                insert(gate_pass.TruckComplianceRecord),
+                [
+                    {
+                        "truck_id": truck_id,
+                        "transporter_name": "Synthetic Logistics",
+                        "peso_license_validity": today + timedelta(days=30),
+                        "spark_arrestor_status": "OK",
+                        "earthing_relay_calibration": today + timedelta(days=30),
+                        "rc_fitness_certificate": today + timedelta(days=30),
+                    }
+                    for truck_id in truck_ids
+                ],
+            )
+            session.commit()
+        engine.dispose()
+        rng = random.Random(7)
+
+        for latency_ms in args.latency_ms:
+            if latency_ms and not db_url.startswith("sqlite"):
+                raise SystemExit("--latency-ms is only simulated on SQLite.")
+            # Six connections per client so gathered briefing queries never wait on the pool.
+            pool_size = max(args.concurrency * 6, args.threads)
+            sync_engine = create_engine(db_url, future=True, pool_size=pool_size, max_overflow=0)
+            async_engine = create_async_engine(_async_url(db_url), pool_size=pool_size, max_overflow=0)
+            _delay_sqlite_statements(sync_engine, latency_ms)
+            _delay_sqlite_statements(async_engine.sync_engine, latency_ms)
+            sync_factory = sessionmaker(bind=sync_engine)
+            async_factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+            def run_async(request: Callable[[Any], Any]) -> int:
+                return asyncio.run(_load_async(async_factory, request, args.concurrency, args.seconds))
+
+            def run_sync(request: Callable[[Any], Any]) -> int:
+                # Clients beyond the threadpool queue for a thread, so throughput is bounded by it.
+                return _load_sync(sync_factory, request, min(args.concurrency, args.threads), args.seconds)
+
+            variants: List[Tuple[str, str, Callable[[], int]]] = [
+                ("briefing", "sync", lambda: run_sync(briefing.get_executive_briefing)),
+                (
+                    "briefing",
+                    "async",
+                    lambda: run_async(lambda s: async_api.get_executive_briefing_async(s, concurrent=False)),
+                ),
+                ("briefing", "async+gather", lambda: run_async(async_api.get_executive_briefing_async)),
+                (
+                    "gate_pass",
+                    "sync",
+                    lambda: run_sync(lambda s: gate_pass.process_gate_pass(s, rng.choice(truck_ids), "bench")),
+                ),
+                (
+                    "gate_pass",
+                    "async",
+                    lambda: run_async(
+                        lambda s: async_api.process_gate_pass_async(s, rng.choice(truck_ids), "bench")
+                    ),
+                ),
+            ]
+            for api, variant, run in variants:
+                done = run()
+                rows.append([latency_ms, api, variant, done, f"{done / args.seconds:.0f}"])
+            asyncio.run(async_engine.dispose())
+            sync_engine.dispose()
+
+    _print_table(
+        f"Sync vs async APIs ({args.concurrency} clients, {args.threads} sync threads, {args.seconds:g}s each, "
+        f"{db_url.split(':', 1)[0]})",
+        ["latency_ms", "api", "variant", "requests", "requests_per_s"],
+        rows,
+    )
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    return {
+        "rounds": len(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def bench_suite(args: argparse.Namespace) -> None:
+    """
+    Time the four public APIs on generated databases at each scale, pytest-benchmark style.
+
+    ``--save`` writes the statistics as JSON; ``--compare`` exits non-zero when any median is more
+    than ``--max-regression`` slower than the saved baseline.
+    """
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for index, scale_name in enumerate(args.scales):
+            scale = synthetic_data.SCALES[scale_name]
+            db_url = args.db_url or f"sqlite:///{os.path.join(workdir, f'{scale_name}.db')}"
+            engine = create_engine(db_url, future=True)
+            try:
+                # After the first scale, --db-url only holds what the previous scale generated.
+                synthetic_data.generate(engine, scale, seed=args.seed, force=args.force or index > 0)
+            except ValueError as exc:
+                raise SystemExit(f"{exc} Pass --force to drop them anyway.") from exc
+            session_factory = sessionmaker(bind=engine)
+            truck_ids = [f"TRK-{i:06d}" for i in range(scale.trucks)]
+            rng = random.Random(args.seed)
+            approvals = iter(range(10**9))
+
+            def approve(session: Any) -> Any:
+                truck_id = truck_ids[next(approvals) % len(truck_ids)]
+                return gate_pass.approve_gate_pass(
+                    session, truck_id=truck_id, approved_by_user_id="bench", compliance_snapshot={"bench": True}
+                )
+
+            cases: Dict[str, Callable[[Any], Any]] = {
+                "get_terminal_snapshot": lambda session: watchdog.get_terminal_snapshot(
+                    session, horton_sphere_capacity_kl=10000.0, fallback_discharge_rate_tph=6.0, inbound_truck_count=4
+                ),
+                "get_executive_briefing": briefing.get_executive_briefing,
+                "process_gate_pass": lambda session: gate_pass.process_gate_pass(
+                    session, rng.choice(truck_ids), "bench"
+                ),
+                "approve_gate_pass": approve,
+            }
+            results[scale_name] = {}
+            for name, case in cases.items():
+                with session_factory() as session:
+                    case(session)  # warm-up round: statement cache and connection
+                    samples = []
+                    for _ in range(args.rounds):
+                        samples.append(_timed(lambda: case(session)))
+                        session.expunge_all()
+                results[scale_name][name] = _stats(samples)
+            engine.dispose()
+
+    rows: List[List[Any]] = []
+    for scale_name, cases_stats in results.items():
+        for name, stats in cases_stats.items():
+            rows.append(
+                [
+                    scale_name,
+                    name,
+                    stats["rounds"],
+                    f"{stats['min'] * 1000:.2f}",
+                    f"{stats['median'] * 1000:.2f}",
+                    f"{stats['mean'] * 1000:.2f}",
+                    f"{stats['stddev'] * 1000:.2f}",
+                    f"{1 / stats['mean']:.0f}",
+                ]
+            )
+    _print_table(
+        "API suite (generated data)",
+        ["scale", "benchmark", "rounds", "min_ms", "median_ms", "mean_ms", "stddev_ms", "ops_per_s"],
+        rows,
+    )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump({"results": results}, handle, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+        regressions = []
+        for scale_name, cases_stats in results.items():
+            for name, stats in cases_stats.items():
+                before = baseline.get(scale_name, {}).get(name)
+                if before and stats["median"] > before["median"] * (1 + args.max_regression):
+                    regressions.append(
+                        f"{scale_name}/{name}: median {before['median'] * 1000:.2f} -> {stats['median'] * 1000:.2f} ms"
+                    )
+        if regressions:
+            raise SystemExit("Regressions beyond {:.0%}:\n  {}".format(args.max_regression, "\n  ".join(regressions)))
+        print(f"\nNo regressions beyond {args.max_regression:.0%} against {args.compare}.")
+
+
+def bench_convoy(args: argparse.Namespace) -> None:
+    """Convoy gate-pass pre-check: one process_gate_pass per truck against one process_gate_passes call."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        scale = replace(synthetic_data.SCALES["small"], trucks=max(args.convoy_sizes) * 5, years=0.01)
+        db_url = f"sqlite:///{os.path.join(workdir, 'convoy.db')}"
+        engine = create_engine(db_url, future=True)
+        synthetic_data.generate(engine, scale, seed=args.seed)
+        engine.dispose()
+        rng = random.Random(args.seed)
+        all_trucks = [f"TRK-{i:06d}" for i in range(scale.trucks)]
+
+        for latency_ms in args.latency_ms:
+            engine = create_engine(db_url, future=True)
+            _delay_sqlite_statements(engine, latency_ms)
+            session_factory = sessionmaker(bind=engine)
+            for size in args.convoy_sizes:
+                convoy = rng.sample(all_trucks, size)
+                with session_factory() as session:
+                    gate_pass.process_gate_passes(session, convoy[:1], "bench")  # warm the statement cache
+                    per_truck = _timed(lambda: [gate_pass.process_gate_pass(session, t, "bench") for t in convoy])
+                    expected = [gate_pass.process_gate_pass(session, t, "bench") for t in convoy]
+                    bulk = _timed(lambda: gate_pass.process_gate_passes(session, convoy, "bench"))
+                    if gate_pass.process_gate_passes(session, convoy, "bench") != expected:
+                        raise SystemExit("Bulk and per-truck gate-pass results differ.")
+                blocked = sum(1 for result in expected if result["status"] == "BLOCKED")
+                rows.append(
+                    [
+                        latency_ms,
+                        size,
+                        blocked,
+                        f"{per_truck * 1000:.1f}",
+                        f"{bulk * 1000:.1f}",
+                        f"{per_truck / bulk:.1f}x" if bulk > 0 else "-",
+                    ]
+                )
+            engine.dispose()
+
+    _print_table(
+        "Convoy gate-pass pre-check (SQLite)",
+        ["latency_ms", "trucks", "blocked", "per_truck_ms", "bulk_ms", "speedup"],
+        rows,
+    )
+
+
+def bench_audit(args: argparse.Namespace) -> None:
+    """approve_gate_pass throughput: a commit per row against the group-commit audit writer."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for index, mode in enumerate(("per_row", "writer_durable", "writer_buffered")):
+            db_url = args.db_url or f"sqlite:///{os.path.join(workdir, f'{mode}.db')}"
+            # Per-row commits from several threads queue on SQLite's write lock.
+            connect_args = {"timeout": 30} if db_url.startswith("sqlite") else {}
+            engine = create_engine(db_url, future=True, connect_args=connect_args)
+            audit_tables = [gate_pass.GatePassAuditLog.__table__, gate_pass.ComplianceSnapshot.__table__]
+            # After the first mode, --db-url only holds the rows the previous mode wrote.
+            populated = synthetic_data.populated_tables(engine, audit_tables)
+            if populated and not (args.force or index > 0):
+                raise SystemExit(f"Refusing to drop tables that hold data: {', '.join(populated)}. Pass --force.")
+            gate_pass.Base.metadata.drop_all(engine, tables=audit_tables)
+            gate_pass.Base.metadata.create_all(engine, tables=audit_tables)
+            writer = None
+            if mode != "per_row":
+                writer = audit_writer.AuditLogWriter(
+                    engine,
+                    gate_pass.GatePassAuditLog.__table__,
+                    flush_interval_seconds=args.flush_ms / 1000.0,
+                    durable=mode == "writer_durable",
+                )
+            previous = gate_pass.set_audit_writer(writer)
+            try:
+                # Every approval is for the same truck, so ids must not depend on the second alone.
+                approved = _load_sync(
+                    sessionmaker(bind=engine),
+                    lambda session: gate_pass.approve_gate_pass(
+                        session, truck_id="TRK-00001", approved_by_user_id="bench", compliance_snapshot={"bench": True}
+                    ),
+                    args.threads,
+                    args.seconds,
+                )
+                if writer is not None:
+                    writer.close()
+            finally:
+                gate_pass.set_audit_writer(previous)
+            with sessionmaker(bind=engine)() as session:
+                stored = len(session.execute(select(gate_pass.GatePassAuditLog.id)).all())
+            if stored != approved:
+                raise SystemExit(f"{mode}: {approved} approval(s) but {stored} audit row(s).")
+            rows.append(
+                [
+                    mode,
+                    args.threads,
+                    approved,
+                    f"{approved / args.seconds:.0f}",
+                    writer.batches if writer is not None else approved,
+                ]
+            )
+            engine.dispose()
+
+    _print_table(
+        "Gate-pass audit writes (SQLite)" if not args.db_url else "Gate-pass audit writes",
+        ["mode", "threads", "approvals", "approvals_per_s", "transactions"],
+        rows,
+    )
+
+
+def bench_verdicts(args: argparse.Namespace) -> None:
+    """Expiring-in-7-days report and daily upkeep: truck_compliance scans against the verdict table."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for trucks in args.trucks:
+            scale = replace(synthetic_data.SCALES["small"], trucks=trucks, years=0.01)
+            engine = create_engine(f"sqlite:///{os.path.join(workdir, f'verdicts-{trucks}.db')}", future=True)
+            synthetic_data.generate(engine, scale, seed=args.seed)
+            today = date.today()
+            horizon = today + timedelta(days=7)
+
+            def scan_report() -> List[str]:
+                # Without the verdict table: read every truck and compute the next expiry in Python.
+                with sessionmaker(bind=engine)() as session:
+                    found = []
+                    for record in session.execute(select(gate_pass.TruckComplianceRecord)).scalars():
+                        upcoming = verdicts.verdict_row(record, today)["next_expiry"]
+                        if upcoming is not None and upcoming <= horizon:
+                            found.append(record.truck_id)
+                    return found
+
+            def verdict_report() -> List[str]:
+                with sessionmaker(bind=engine)() as session:
+                    return [entry["truck_id"] for entry in verdicts.expiring_trucks(session, 7, today)]
+
+            with engine.begin() as connection:
+                rebuild = _timed(lambda: verdicts.refresh_verdicts(connection, today=today))
+            expected = scan_report()
+            if sorted(verdict_report()) != sorted(expected):
+                raise SystemExit("Verdict report differs from the full scan.")
+            scan = _timed(scan_report)
+            indexed = _timed(verdict_report)
+            swept: List[int] = []
+            with engine.begin() as connection:
+                # The sweep run the day after tomorrow: generated certificates expire tomorrow at the earliest.
+                sweep_day = today + timedelta(days=2)
+                sweep = _timed(lambda: swept.append(verdicts.sweep_expired_verdicts(connection, sweep_day)))
+            rows.append(
+                [
+                    trucks,
+                    len(expected),
+                    f"{scan * 1000:.1f}",
+                    f"{indexed * 1000:.1f}",
+                    f"{rebuild * 1000:.1f}",
+                    f"{sweep * 1000:.1f}",
+                    swept[0],
+                ]
+            )
+            engine.dispose()
+
+    _print_table(
+        "Fleet compliance verdicts (SQLite)",
+        ["trucks", "expiring_7d", "scan_report_ms", "verdict_report_ms", "rebuild_ms", "sweep_ms", "swept"],
+        rows,
+    )
+
+
+def _sqlite_bytes(engine: Any) -> int:
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+        pages = connection.exec_driver_sql("PRAGMA page_count").scalar()
+        return pages * connection.exec_driver_sql("PRAGMA page_size").scalar()
+
+
+def bench_snapshots(args: argparse.Namespace) -> None:
+    """Audit storage and approval throughput with inline snapshots, deduplicated ones, and after compaction."""
+    rows: List[List[Any]] = []
+    today = date.today()
+    rng = random.Random(args.seed)
+    trucks = [
+        gate_pass.TruckComplianceRecord(
+            truck_id=f"TRK-{i:05d}",
+            transporter_name=f"Transporter {i % 40:02d}",
+            peso_license_validity=today + timedelta(days=rng.randint(1, 365)),
+            spark_arrestor_status="OK",
+            earthing_relay_calibration=today + timedelta(days=rng.randint(1, 365)),
+            rc_fitness_certificate=today + timedelta(days=rng.randint(1, 365)),
+        )
+        for i in range(args.trucks)
+    ]
+    # What the gate UI posts back: the pre-check it showed, unchanged while certificates are.
+    snapshots = [gate_pass.gate_pass_result(truck, truck.truck_id, "gatekeeper", today) for truck in trucks]
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode, dedup, buffered in (
+            ("inline", False, False),
+            ("dedup", True, False),
+            ("inline, buffered writer", False, True),
+            ("dedup, buffered writer", True, True),
+        ):
+            engine = create_engine(f"sqlite:///{os.path.join(workdir, f'{len(rows)}.db')}", future=True)
+            gate_pass.Base.metadata.create_all(
+                engine, tables=[gate_pass.GatePassAuditLog.__table__, gate_pass.ComplianceSnapshot.__table__]
+            )
+            writer = None
+            if buffered:
+                writer = audit_writer.AuditLogWriter(engine, gate_pass.GatePassAuditLog.__table__, durable=False)
+            previous_dedup = gate_pass.set_snapshot_dedup(dedup)
+            previous_writer = gate_pass.set_audit_writer(writer)
+            try:
+                with sessionmaker(bind=engine)() as session:
+
+                    def approve_all() -> None:
+                        for i in range(args.approvals):
+                            snapshot = snapshots[i % len(snapshots)]
+                            gate_pass.approve_gate_pass(
+                                session,
+                                truck_id=snapshot["truck_id"],
+                                approved_by_user_id="gatekeeper",
+                                compliance_snapshot=snapshot,
+                            )
+                        if writer is not None:
+                            writer.flush()
+
+                    elapsed = _timed(approve_all)
+                if writer is not None:
+                    writer.close()
+            finally:
+                gate_pass.set_audit_writer(previous_writer)
+                gate_pass.set_snapshot_dedup(previous_dedup)
+            rows.append([mode, args.approvals, f"{args.approvals / elapsed:.0f}", f"{_sqlite_bytes(engine) / 1e6:.2f}"])
+            if mode == "inline":
+                compacted = _timed(lambda: snapshot_dedup.compact_audit_snapshots(engine))
+                rows.append(
+                    [
+                        f"inline, compacted in {compacted:.1f}s",
+                        args.approvals,
+                        "-",
+                        f"{_sqlite_bytes(engine) / 1e6:.2f}",
+                    ]
+                )
+            engine.dispose()
+
+    _print_table(
+        f"Gate-pass audit snapshots (SQLite, {args.trucks} trucks)",
+        ["mode", "approvals", "approvals_per_s", "db_mb"],
+        rows,
+    )
+
+
+def bench_assistant(args: argparse.Namespace) -> None:
+    """Assistant model calls and reply latency with and without the response cache, on a simulated model."""
+    phrasings = [
+        "Why is gantry stalled?",
+        "why is the gantry stalled",
+        "What is the sphere level?",
+        "Any open safety incidents?",
+        "Which trucks are overdue?",
+        "Why is gantry   stalled ?",
+    ]
+    rng = random.Random(args.seed)
+    # One context per watchdog poll: the data changes each minute, generated_at on every request.
+    contexts = [{"inventory": {"level_percent": 60 + minute}, "open_safety_incidents": []} for minute in range(3)]
+    asked = [(i * len(contexts) // args.questions, rng.choice(phrasings)) for i in range(args.questions)]
+    rows: List[List[Any]] = []
+    for cached in (False, True):
+        cache = assistant_cache.AssistantResponseCache(ttl_seconds=60) if cached else None
+        calls: List[int] = []
+
+        def model() -> str:
+            calls.append(1)
+            time.sleep(args.model_ms / 1000.0)
+            return json.dumps({"reply_text": "simulated", "action_buttons": []})
+
+        def ask(request: Tuple[int, str]) -> float:
+            minute, question = request
+            context_json = json.dumps(dict(contexts[minute], generated_at=datetime.now(timezone.utc).isoformat()))
+            started = time.perf_counter()
+            if cache is None:
+                model()
+            else:
+                cache.get(context_json, question, model)
+            return time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            latencies = sorted(pool.map(ask, asked))
+        rows.append(
+            [
+                "cached" if cached else "uncached",
+                args.questions,
+                len(calls),
+                f"{cache.hit_rate:.0%}" if cache is not None else "-",
+                f"{statistics.median(latencies) * 1000:.0f}",
+                f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}",
+            ]
+        )
+
+    _print_table(
+        f"Assistant replies ({args.users} users, {args.model_ms:.0f} ms simulated model)",
+        ["mode", "questions", "model_calls", "hit_rate", "p50_ms", "p95_ms"],
+        rows,
+    )
+
+
+def bench_herd(args: argparse.Namespace) -> None:
+    """Simultaneous dashboard loads through the HTTP briefing wrapper, uncached and with the briefing cache."""
+    rows: List[List[Any]] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = _synthetic_briefing_db(
+            f"sqlite:///{os.path.join(workdir, 'briefing.db')}", args.bays, args.queue, args.incidents
+        )
+        statements = [0]
+        counter_lock = threading.Lock()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _round_trip(*_: Any) -> None:
+            with counter_lock:
+                statements[0] += 1
+            time.sleep(args.latency_ms / 1000.0)
+
+        session_factory = sessionmaker(bind=engine)
+
+        def load() -> Dict[str, Any]:
+            with session_factory() as session:
+                return briefing.get_executive_briefing_http(session)
+
+        for name, cache in (("uncached", None), ("cached", briefing_cache.BriefingCache(ttl_seconds=30))):
+            previous = briefing.set_briefing_cache(cache)
+            statements[0] = 0
+            latencies: List[float] = []
+            try:
+                with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                    for _ in range(args.waves):
+                        latencies += pool.map(lambda _: _timed(load), range(args.clients))
+            finally:
+                briefing.set_briefing_cache(previous)
+                if cache is not None:
+                    cache.close()
+            latencies.sort()
+            rows.append(
+                [
+                    name,
+                    args.clients * args.waves,
+                    statements[0],
+                    f"{latencies[len(latencies) // 2] * 1000:.1f}",
+                    f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}",
+                    f"{cache.hits}/{cache.coalesced}/{cache.misses}" if cache else "-",
+                ]
+            )
+        engine.dispose()
+
+    _print_table(
+        f"Briefing thundering herd ({args.clients} clients x {args.waves} waves, {args.latency_ms:g} ms per statement)",
+        ["variant", "loads", "statements", "p50_ms", "p99_ms", "hit/coalesced/miss"],
+        rows,
+    )
+
+
+def bench_replay(args: argparse.Namespace) -> None:
+    """Replay one recording (synthesized unless given) through every snapshot/forecast mode."""
+    with tempfile.TemporaryDirectory() as workdir:
+        path = args.recording
+        if path is None:
+            path = os.path.join(workdir, "synthetic.jsonl.gz")
+            replay.synthesize(path, bays=args.bays, hours=args.hours, seed=args.seed)
+
+        rows: List[List[Any]] = []
+        for snapshot_mode in ("full", "compact", "incremental", "pushdown"):
+            for forecast_mode in ("simple", "sphere"):
+                report = replay.replay(path, snapshot_mode=snapshot_mode, forecast_mode=forecast_mode)
+                mae = report.forecast.get("horizon_mae_percent", {})
+                rows.append(
+                    [
+                        snapshot_mode,
+                        forecast_mode,
+                        report.frames,
+                        f"{report.cycles_per_second:.1f}",
+                        sum(report.alerts_by_event.values()),
+                        report.forecast.get("forecasts", 0),
+                        report.forecast.get("tank_top_mae_hours") or "-",
+                        mae.get("1h", "-"),
+                    ]
+                )
+
+    _print_table(
+        "Record/replay",
+        ["snapshot", "forecast", "cycles", "cycles_per_s", "alerts", "forecasts", "tank_top_mae_h", "1h_mae_pct"],
+        rows,
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], None]] = {
+    "dedup": bench_dedup,
+    "snapshot": bench_snapshot,
+    "pushdown": bench_pushdown,
+    "incidents": bench_incidents,
+    "schedule": bench_schedule,
+    "briefing": bench_briefing,
+    "terminals": bench_terminals,
+    "rollup": bench_rollup,
+    "async": bench_async,
+    "suite": bench_suite,
+    "audit": bench_audit,
+    "convoy": bench_convoy,
+    "verdicts": bench_verdicts,
+    "snapshots": bench_snapshots,
+    "assistant": bench_assistant,
+    "herd": bench_herd,
+    "replay": bench_replay,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    dedup = sub.add_parser("dedup", help=bench_dedup.__doc__)
+    dedup.add_argument("--redis-url", default=None)
+    dedup.add_argument("--counts", type=int, nargs="+", default=DEFAULT_ALERT_COUNTS)
+
+    snapshot = sub.add_parser("snapshot", help=bench_snapshot.__doc__)
+    snapshot.add_argument("--bays", type=int, default=500)
+    snapshot.add_argument("--incidents", type=int, default=5000)
+    snapshot.add_argument("--iterations", type=int, default=20)
+
+    pushdown = sub.add_parser("pushdown", help=bench_pushdown.__doc__)
+    pushdown.add_argument("--incident-counts", type=int, nargs="+", default=[10000, 100000, 300000])
+    pushdown.add_argument("--open-ratio", type=float, default=0.001)
+    pushdown.add_argument("--bays", type=int, default=200)
+    pushdown.add_argument("--iterations", type=int, default=5)
+
+    incidents = sub.add_parser("incidents", help=bench_incidents.__doc__)
+    incidents.add_argument("--incident-counts", type=int, nargs="+", default=[10000, 100000, 300000])
+    incidents.add_argument("--bays", type=int, default=40)
+    incidents.add_argument("--iterations", type=int, default=20)
+
+    schedule = sub.add_parser("schedule", help=bench_schedule.__doc__)
+    schedule.add_argument("--hours", type=float, default=6.0)
+    schedule.add_argument("--poll-seconds", type=int, default=60)
+    schedule.add_argument("--schedules", default=None)
+    schedule.add_argument("--bays", type=int, default=40)
+    schedule.add_argument("--incidents", type=int, default=200)
+
+    briefing_parser = sub.add_parser("briefing", help=bench_briefing.__doc__)
+    briefing_parser.add_argument("--latency-ms", type=float, nargs="+", default=[0.0, 5.0, 20.0])
+    briefing_parser.add_argument("--bays", type=int, default=40)
+    briefing_parser.add_argument("--queue", type=int, default=200)
+    briefing_parser.add_argument("--incidents", type=int, default=20000)
+    briefing_parser.add_argument("--iterations", type=int, default=20)
+
+    terminals = sub.add_parser("terminals", help=bench_terminals.__doc__)
+    terminals.add_argument("--terminal-counts", type=int, nargs="+", default=[5, 20, 50])
+    terminals.add_argument("--latency-ms", type=float, default=5.0)
+    terminals.add_argument("--bays-per-terminal", type=int, default=12)
+    terminals.add_argument("--queue-per-terminal", type=int, default=20)
+    terminals.add_argument("--incidents-per-terminal", type=int, default=500)
+    terminals.add_argument("--iterations", type=int, default=5)
+
+    rollup = sub.add_parser("rollup", help=bench_rollup.__doc__)
+    rollup.add_argument("--history-days", type=int, nargs="+", default=[7, 30, 90])
+    rollup.add_argument("--incidents-per-day", type=int, default=100)
+    rollup.add_argument("--iterations", type=int, default=5)
+
+    async_parser = sub.add_parser("async", help=bench_async.__doc__)
+    async_parser.add_argument("--db-url", default=None, help="Local sqlite:// or postgresql:// URL (default: temp SQLite).")
+    async_parser.add_argument("--latency-ms", type=float, nargs="+", default=[0.0, 20.0])
+    async_parser.add_argument("--concurrency", type=int, default=200)
+    async_parser.add_argument("--threads", type=int, default=40, help="Sync threadpool size (Starlette default 40).")
+    async_parser.add_argument("--seconds", type=float, default=5.0)
+    async_parser.add_argument("--incidents", type=int, default=5000)
+    async_parser.add_argument("--trucks", type=int, default=500)
+
+    suite = sub.add_parser("suite", help="Time the four public APIs at each synthetic data scale.")
+    suite.add_argument("--scales", nargs="+", choices=sorted(synthetic_data.SCALES), default=["small", "medium"])
+    suite.add_argument("--db-url", default=None, help="Local database to regenerate per scale (default: temp SQLite).")
+    suite.add_argument("--force", action="store_true", help="Regenerate --db-url even if its tables hold data.")
+    suite.add_argument("--rounds", type=int, default=20)
+    suite.add_argument("--seed", type=int, default=7)
+    suite.add_argument("--save", default=None)
+    suite.add_argument("--compare", default=None)
+    suite.add_argument("--max-regression", type=float, default=0.25)
+
+    convoy = sub.add_parser("convoy", help=bench_convoy.__doc__)
+    convoy.add_argument("--convoy-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    convoy.add_argument("--latency-ms", type=float, nargs="+", default=[0.0, 2.0])
+    convoy.add_argument("--seed", type=int, default=7)
+
+    audit = sub.add_parser("audit", help=bench_audit.__doc__)
+    audit.add_argument("--threads", type=int, default=8)
+    audit.add_argument("--seconds", type=float, default=3.0)
+    audit.add_argument("--flush-ms", type=float, default=5.0)
+    audit.add_argument("--db-url", default=None, help="Defaults to a temporary SQLite file per mode.")
+    audit.add_argument("--force", action="store_true", help="Recreate --db-url audit tables holding data.")
+
+    verdicts_parser = sub.add_parser("verdicts", help=bench_verdicts.__doc__)
+    verdicts_parser.add_argument("--trucks", type=int, nargs="+", default=[2000, 20000, 100000])
+    verdicts_parser.add_argument("--seed", type=int, default=7)
+
+    snapshots = sub.add_parser("snapshots", help=bench_snapshots.__doc__)
+    snapshots.add_argument("--approvals", type=int, default=5000)
+    snapshots.add_argument("--trucks", type=int, default=200)
+    snapshots.add_argument("--seed", type=int, default=7)
+
+    assistant = sub.add_parser("assistant", help=bench_assistant.__doc__)
+    assistant.add_argument("--users", type=int, default=50)
+    assistant.add_argument("--questions", type=int, default=200)
+    assistant.add_argument("--model-ms", type=float, default=800.0)
+    assistant.add_argument("--seed", type=int, default=7)
+
+    herd = sub.add_parser("herd", help=bench_herd.__doc__)
+    herd.add_argument("--clients", type=int, default=50)
+    herd.add_argument("--waves", type=int, default=3)
+    herd.add_argument("--latency-ms", type=float, default=20.0)
+    herd.add_argument("--bays", type=int, default=40)
+    herd.add_argument("--queue", type=int, default=200)
+    herd.add_argument("--incidents", type=int, default=20000)
+
+    replay_parser = sub.add_parser("replay", help=bench_replay.__doc__)
+    replay_parser.add_argument("--recording", default=None)
+    replay_parser.add_argument("--bays", type=int, default=40)
+    replay_parser.add_argument("--hours", type=float, default=24.0)
+    replay_parser.add_argument("--seed", type=int, default=7)
+
+    args = parser.parse_args(argv)
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
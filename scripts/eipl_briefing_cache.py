@@ -0,0 +1,188 @@
+"""
+Executive briefing cache for dashboard loads and start-of-day refreshes.
+
+- Short TTL per briefing key (one key per terminal, ``default`` for the single-terminal API).
+- Single-flight: concurrent misses for a key share one computation instead of one query each.
+- Stale-while-revalidate: past the TTL the last briefing is served while one background refresh runs.
+- Explicit invalidation for writers, plus an optional SQLAlchemy hook that invalidates on commits
+  touching the briefing's source tables.
+- Hit/miss counters on the shared Prometheus registry (``eipl_briefing_cache_requests_total``).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import eipl_watchdog_metrics as metrics
+from eipl_session_hooks import on_write
+
+LOGGER = logging.getLogger("eipl-briefing-cache")
+
+BRIEFING_SOURCE_TABLES = (
+    "lpg_inventory",
+    "safety_incidents",
+    "gate_queue",
+    "terminal_bays",
+    "briefing_hourly_rollup",
+)
+DEFAULT_KEY = "default"
+
+Briefing = Dict[str, Any]
+
+REQUESTS = metrics.REGISTRY.register(
+    metrics.Counter(
+        "eipl_briefing_cache_requests_total",
+        "Briefing cache lookups: hit, stale, miss, coalesced.",
+        ["outcome"],
+    )
+)
+REFRESHES = metrics.REGISTRY.register(
+    metrics.Counter("eipl_briefing_cache_refreshes_total", "Briefing recomputations by result.", ["result"])
+)
+COMPUTE_SECONDS = metrics.REGISTRY.register(
+    metrics.Histogram("eipl_briefing_compute_seconds", "Time to recompute one briefing.")
+)
+
+
+@dataclass
+class _Entry:
+    computed_at: float
+    value: Briefing
+
+
+class BriefingCache:
+    """
+    Briefings keyed by terminal, fresh for ``ttl_seconds`` and servable for ``stale_seconds`` more.
+
+    ``compute`` callables must not depend on the caller's session: a stale hit returns at once and
+    the refresh runs later on a background thread. Invalidation drops the entry outright, so the
+    next lookup recomputes rather than serving what a writer just made obsolete. A computation
+    that started before an invalidation is returned to the callers already waiting on it but not
+    cached, and later lookups do not join it.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 30.0, stale_seconds: float = 120.0, refresh_workers: int = 2) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, "Future[Briefing]"] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=max(1, refresh_workers), thread_name_prefix="briefing-refresh")
+
+    def get(self, compute: Callable[[], Briefing], key: str = DEFAULT_KEY) -> Briefing:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry.computed_at if entry is not None else None
+            if entry is not None and age < self.ttl_seconds:
+                self.hits += 1
+                outcome = "hit"
+            elif entry is not None and age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                outcome = "stale"
+                if key not in self._inflight:
+                    future, generation = self._start_locked(key)
+                    self._refresher.submit(self._run, key, compute, future, generation)
+            else:
+                entry = None
+                future = self._inflight.get(key)
+                if future is None:
+                    self.misses += 1
+                    outcome = "miss"
+                    future, generation = self._start_locked(key)
+                else:
+                    self.coalesced += 1
+                    outcome = "coalesced"
+        REQUESTS.inc(outcome=outcome)
+
+        if entry is not None:
+            return entry.value
+        if outcome == "miss":
+            self._run(key, compute, future, generation)
+        return future.result()
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Drop the given keys (every key when None); writers call this after committing."""
+        with self._lock:
+            targets = list(self._entries) + list(self._inflight) if keys is None else list(keys)
+            for key in targets:
+                self._entries.pop(key, None)
+                # Detach a computation that may predate the write, so the next miss starts afresh.
+                self._inflight.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def invalidate_on_commit(
+        self,
+        target: Any,
+        tables: Iterable[str] = BRIEFING_SOURCE_TABLES,
+        key_for: Optional[Callable[[Any], Optional[str]]] = None,
+    ) -> Callable[[], None]:
+        """
+        Invalidate once a session on ``target`` (a Session class or sessionmaker) commits writes to
+        ``tables``. ``key_for`` maps a written instance to its briefing key; by default, or when it
+        returns None, every briefing is invalidated. Returns a function that removes the listeners.
+        """
+
+        def invalidate(keys: Set[Optional[str]]) -> None:
+            self.invalidate(None if None in keys else keys)
+
+        return on_write(target, tables, key_for or (lambda instance: None), invalidate)
+
+    def close(self) -> None:
+        self._refresher.shutdown(wait=True)
+
+    def _start_locked(self, key: str) -> Tuple["Future[Briefing]", int]:
+        future: "Future[Briefing]" = Future()
+        self._inflight[key] = future
+        return future, self._generations.get(key, 0)
+
+    def _finish_locked(self, key: str, future: "Future[Briefing]") -> None:
+        # After an invalidation the slot may already hold a newer computation; leave that one.
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    def _run(self, key: str, compute: Callable[[], Briefing], future: "Future[Briefing]", generation: int) -> None:
+        started = time.monotonic()
+        try:
+            value = compute()
+        except Exception as exc:
+            REFRESHES.inc(result="failed")
+            LOGGER.exception("Briefing computation failed for %s.", key)
+            with self._lock:
+                self._finish_locked(key, future)
+            future.set_exception(exc)
+            return
+        finished = time.monotonic()
+        COMPUTE_SECONDS.observe(finished - started)
+        with self._lock:
+            self._finish_locked(key, future)
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = _Entry(finished, value)
+                REFRESHES.inc(result="stored")
+            else:
+                REFRESHES.inc(result="discarded")
+        future.set_result(value)
+
+
+def create_briefing_cache_from_env() -> Optional[BriefingCache]:
+    """
+    Cache configured by ``BRIEFING_CACHE_TTL_SECONDS`` (0 disables) and ``BRIEFING_CACHE_STALE_SECONDS``.
+    """
+    ttl_seconds = float(os.getenv("BRIEFING_CACHE_TTL_SECONDS", "30"))
+    if ttl_seconds <= 0:
+        return None
+    return BriefingCache(
+        ttl_seconds=ttl_seconds,
+        stale_seconds=float(os.getenv("BRIEFING_CACHE_STALE_SECONDS", "120")),
+    )
@@ -0,0 +1,324 @@
+"""
+Incremental hourly rollups behind the executive briefing trend section.
+
+Each run folds only what is new since the stored watermarks into ``briefing_hourly_rollup``:
+- inventory readings recorded since the ``lpg_inventory.recorded_at`` watermark (min / max / sum / count
+  per hour);
+- incidents created since the ``safety_incidents.created_at`` watermark (opened per hour);
+
+Both watermarks are re-read with an overlap, since a row can commit after rows stamped later than
+it; ids already folded inside the overlap are remembered and skipped.
+- one sample of queue length, active bays and open incidents, taken at run time into the current hour.
+
+Incidents closed are derived from the open-incident samples: open before + opened since - open now.
+The tables have no closure timestamp, so closures land in the hour of the run that observes them
+and an incident reopened between runs offsets one closure.
+
+The created_at range read uses ``ix_safety_incidents_created_at`` from sql/watchdog_pushdown_indexes.sql,
+the recorded_at one ``ix_lpg_inventory_recorded_at`` from sql/briefing_terminal_indexes.sql.
+
+Usage:
+    TERMINAL_DB_URL=postgresql://... python scripts/eipl_briefing_rollup.py [--once]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, func, select, tuple_
+from sqlalchemy.orm import Session, sessionmaker
+
+from executive_briefing_api import (
+    UNTAGGED_TERMINAL,
+    Base,
+    BriefingHourlyRollup,
+    BriefingRollupState,
+    GateQueue,
+    LPGInventory,
+    SafetyIncident,
+    TerminalBay,
+    active_bay_clause,
+    hour_bucket,
+    open_incident_clause,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+LOGGER = logging.getLogger("eipl-briefing-rollup")
+
+STATE_NAME = "hourly"
+# Rows committed late with an earlier timestamp are still picked up inside these overlaps.
+INVENTORY_OVERLAP_SECONDS = 300.0
+INCIDENT_OVERLAP_SECONDS = 300.0
+FETCH_BATCH_SIZE = 10000
+
+RollupKey = Tuple[str, datetime]
+
+
+@dataclass
+class RollupRun:
+    inventory_rows: int = 0
+    new_incidents: int = 0
+    closed_incidents: int = 0
+    buckets: List[RollupKey] = field(default_factory=list)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _terminal_key(terminal_id: Optional[str]) -> str:
+    return terminal_id if terminal_id is not None else UNTAGGED_TERMINAL
+
+
+def _load_state(session: Session) -> Tuple[BriefingRollupState, Dict[str, Any]]:
+    row = session.get(BriefingRollupState, STATE_NAME, with_for_update=True)
+    if row is None:
+        row = BriefingRollupState(name=STATE_NAME, state={}, updated_at=datetime.now(timezone.utc))
+        session.add(row)
+    return row, dict(row.state or {})
+
+
+def _bucket(buckets: Dict[RollupKey, Dict[str, Any]], terminal_id: str, at: datetime) -> Dict[str, Any]:
+    return buckets.setdefault((terminal_id, hour_bucket(at)), {})
+
+
+def _inside_overlap(recent: Dict[str, str], watermark: datetime, overlap_seconds: float) -> Dict[str, str]:
+    # Only ids still inside the overlap can be read again, and every one of them must be kept.
+    cutoff = watermark - timedelta(seconds=overlap_seconds)
+    return {key: stamp for key, stamp in recent.items() if datetime.fromisoformat(stamp) >= cutoff}
+
+
+def _fold_inventory(session: Session, state: Dict[str, Any], buckets: Dict[RollupKey, Dict[str, Any]]) -> int:
+    watermark = datetime.fromisoformat(state["inventory_watermark"]) if state.get("inventory_watermark") else None
+    recent: Dict[str, str] = dict(state.get("recent_inventory", {}))
+    stmt = select(
+        LPGInventory.id,
+        LPGInventory.terminal_id,
+        LPGInventory.horton_sphere_level_percent,
+        LPGInventory.recorded_at,
+    ).order_by(LPGInventory.recorded_at, LPGInventory.id)
+
+    legacy_last_id = state.pop("inventory_last_id", None)
+    if watermark is None and legacy_last_id is not None:
+        # State from the id watermark: rows up to that id are folded. Remember the ones the first
+        # overlap read will return again, and read anything newer by id one last time.
+        folded = select(LPGInventory.id, LPGInventory.recorded_at).where(LPGInventory.id <= legacy_last_id)
+        latest = session.execute(select(func.max(LPGInventory.recorded_at)).where(LPGInventory.id <= legacy_last_id))
+        watermark = latest.scalar()
+        if watermark is not None:
+            watermark = _as_utc(watermark)
+            since = watermark - timedelta(seconds=INVENTORY_OVERLAP_SECONDS)
+            for row_id, recorded_at in session.execute(folded.where(LPGInventory.recorded_at >= since)):
+                recent[str(row_id)] = _as_utc(recorded_at).isoformat()
+        stmt = stmt.where(LPGInventory.id > legacy_last_id)
+    elif watermark is not None:
+        stmt = stmt.where(LPGInventory.recorded_at >= watermark - timedelta(seconds=INVENTORY_OVERLAP_SECONDS))
+
+    count = 0
+    for row_id, terminal_id, level, recorded_at in session.execute(stmt.execution_options(yield_per=FETCH_BATCH_SIZE)):
+        if str(row_id) in recent:
+            continue
+        recorded_at = _as_utc(recorded_at)
+        agg = _bucket(buckets, _terminal_key(terminal_id), recorded_at)
+        level = float(level)
+        agg["inventory_min"] = min(agg.get("inventory_min", level), level)
+        agg["inventory_max"] = max(agg.get("inventory_max", level), level)
+        agg["inventory_sum"] = agg.get("inventory_sum", 0.0) + level
+        agg["inventory_readings"] = agg.get("inventory_readings", 0) + 1
+        recent[str(row_id)] = recorded_at.isoformat()
+        if watermark is None or recorded_at > watermark:
+            watermark = recorded_at
+        count += 1
+
+    if watermark is not None:
+        recent = _inside_overlap(recent, watermark, INVENTORY_OVERLAP_SECONDS)
+        state["inventory_watermark"] = watermark.isoformat()
+    state["recent_inventory"] = recent
+    return count
+
+
+def _fold_new_incidents(
+    session: Session, state: Dict[str, Any], buckets: Dict[RollupKey, Dict[str, Any]]
+) -> Dict[str, int]:
+    """Opened incidents per hour; returns new incidents per terminal for the closure arithmetic."""
+    watermark = datetime.fromisoformat(state["incident_watermark"]) if state.get("incident_watermark") else None
+    recent: Dict[str, str] = dict(state.get("recent_incidents", {}))
+    stmt = select(SafetyIncident.incident_id, SafetyIncident.terminal_id, SafetyIncident.created_at).order_by(
+        SafetyIncident.created_at, SafetyIncident.incident_id
+    )
+    if watermark is not None:
+        stmt = stmt.where(SafetyIncident.created_at >= watermark - timedelta(seconds=INCIDENT_OVERLAP_SECONDS))
+
+    opened: Dict[str, int] = {}
+    for incident_id, terminal_id, created_at in session.execute(stmt.execution_options(yield_per=FETCH_BATCH_SIZE)):
+        if incident_id in recent:
+            continue
+        created_at = _as_utc(created_at)
+        terminal = _terminal_key(terminal_id)
+        agg = _bucket(buckets, terminal, created_at)
+        agg["incidents_opened"] = agg.get("incidents_opened", 0) + 1
+        opened[terminal] = opened.get(terminal, 0) + 1
+        recent[incident_id] = created_at.isoformat()
+        if watermark is None or created_at > watermark:
+            watermark = created_at
+
+    if watermark is not None:
+        recent = _inside_overlap(recent, watermark, INCIDENT_OVERLAP_SECONDS)
+        state["incident_watermark"] = watermark.isoformat()
+    state["recent_incidents"] = recent
+    return opened
+
+
+def _grouped_counts(session: Session, column: Any, *where: Any) -> Dict[str, int]:
+    stmt = select(column, func.count()).where(*where).group_by(column)
+    return {_terminal_key(terminal_id): int(count) for terminal_id, count in session.execute(stmt)}
+
+
+def _fold_samples(
+    session: Session,
+    state: Dict[str, Any],
+    buckets: Dict[RollupKey, Dict[str, Any]],
+    opened: Dict[str, int],
+    now: datetime,
+) -> int:
+    queue = _grouped_counts(session, GateQueue.terminal_id)
+    bays = _grouped_counts(session, TerminalBay.terminal_id, active_bay_clause())
+    open_now = _grouped_counts(session, SafetyIncident.terminal_id, open_incident_clause())
+    open_before: Dict[str, int] = state.get("open_incidents", {})
+
+    closed_total = 0
+    terminals = {*queue, *bays, *open_now, *open_before, *opened}
+    for terminal in terminals:
+        agg = _bucket(buckets, terminal, now)
+        for name, value in (
+            ("queue_length", queue.get(terminal, 0)),
+            ("active_bays", bays.get(terminal, 0)),
+        ):
+            agg[f"{name}_max"] = value
+            agg[f"{name}_last"] = value
+        agg["open_incidents_last"] = open_now.get(terminal, 0)
+        if terminal in open_before:
+            # A first run has nothing to compare against, so it records no closures.
+            closed = open_before[terminal] + opened.get(terminal, 0) - open_now.get(terminal, 0)
+            if closed > 0:
+                agg["incidents_closed"] = closed
+                closed_total += closed
+    state["open_incidents"] = {terminal: open_now.get(terminal, 0) for terminal in terminals}
+    return closed_total
+
+
+def _merge_buckets(session: Session, buckets: Dict[RollupKey, Dict[str, Any]]) -> None:
+    if not buckets:
+        return
+    existing = {
+        (row.terminal_id, _as_utc(row.bucket_start)): row
+        for row in session.execute(
+            select(BriefingHourlyRollup).where(
+                tuple_(BriefingHourlyRollup.terminal_id, BriefingHourlyRollup.bucket_start).in_(list(buckets))
+            )
+        ).scalars()
+    }
+    for (terminal_id, bucket_start), agg in buckets.items():
+        row = existing.get((terminal_id, bucket_start))
+        if row is None:
+            row = BriefingHourlyRollup(
+                terminal_id=terminal_id,
+                bucket_start=bucket_start,
+                inventory_sum=0.0,
+                inventory_readings=0,
+                incidents_opened=0,
+                incidents_closed=0,
+            )
+            session.add(row)
+        if agg.get("inventory_readings"):
+            row.inventory_min = min(v for v in (row.inventory_min, agg["inventory_min"]) if v is not None)
+            row.inventory_max = max(v for v in (row.inventory_max, agg["inventory_max"]) if v is not None)
+            row.inventory_sum += agg["inventory_sum"]
+            row.inventory_readings += agg["inventory_readings"]
+        for name in ("queue_length", "active_bays"):
+            if f"{name}_last" in agg:
+                peak = getattr(row, f"{name}_max")
+                setattr(row, f"{name}_max", max(peak, agg[f"{name}_max"]) if peak is not None else agg[f"{name}_max"])
+                setattr(row, f"{name}_last", agg[f"{name}_last"])
+        if "open_incidents_last" in agg:
+            row.open_incidents_last = agg["open_incidents_last"]
+        row.incidents_opened += agg.get("incidents_opened", 0)
+        row.incidents_closed += agg.get("incidents_closed", 0)
+
+
+def run_hourly_rollup(session: Session, now: Optional[datetime] = None) -> RollupRun:
+    """
+    Fold everything new since the stored watermarks into the hourly rollup and commit.
+
+    Rollup rows and watermarks commit together, so a failed run is retried from the same point. The
+    first run backfills all inventory and incident history.
+    """
+    now = _as_utc(now or datetime.now(timezone.utc))
+    state_row, state = _load_state(session)
+    buckets: Dict[RollupKey, Dict[str, Any]] = {}
+    run = RollupRun()
+    run.inventory_rows = _fold_inventory(session, state, buckets)
+    opened = _fold_new_incidents(session, state, buckets)
+    run.new_incidents = sum(opened.values())
+    run.closed_incidents = _fold_samples(session, state, buckets, opened, now)
+    _merge_buckets(session, buckets)
+    state_row.state = state
+    state_row.updated_at = now
+    session.commit()
+    run.buckets = sorted(buckets)
+    return run
+
+
+def rollup_forever(db_url: str, interval_seconds: float) -> None:
+    engine = create_engine(db_url, future=True, pool_pre_ping=True)
+    Base.metadata.create_all(engine, tables=[BriefingHourlyRollup.__table__, BriefingRollupState.__table__])
+    session_factory = sessionmaker(bind=engine)
+    while True:
+        started = time.monotonic()
+        try:
+            with session_factory() as session:
+                run = run_hourly_rollup(session)
+            LOGGER.info(
+                "Rollup: %s inventory row(s), %s new incident(s), %s closed, %s bucket(s)",
+                run.inventory_rows,
+                run.new_incidents,
+                run.closed_incidents,
+                len(run.buckets),
+            )
+        except Exception:
+            LOGGER.exception("Rollup run failed; retrying next interval.")
+        time.sleep(max(0.0, interval_seconds - (time.monotonic() - started)))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=os.getenv("TERMINAL_DB_URL", "").strip())
+    parser.add_argument(
+        "--interval-seconds", type=float, default=float(os.getenv("BRIEFING_ROLLUP_INTERVAL_SECONDS", "300"))
+    )
+    parser.add_argument("--once", action="store_true", help="Run one rollup and exit (for cron).")
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        raise SystemExit("Missing TERMINAL_DB_URL environment variable (or --db-url).")
+
+    if args.once:
+        engine = create_engine(args.db_url, future=True)
+        Base.metadata.create_all(engine, tables=[BriefingHourlyRollup.__table__, BriefingRollupState.__table__])
+        with sessionmaker(bind=engine)() as session:
+            run = run_hourly_rollup(session)
+        LOGGER.info("Rollup: %s inventory row(s), %s new incident(s)", run.inventory_rows, run.new_incidents)
+        return
+    rollup_forever(args.db_url, args.interval_seconds)
+
+
+if __name__ == "__main__":
+    main()
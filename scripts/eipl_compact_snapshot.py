@@ -0,0 +1,187 @@
+"""
+Compact terminal snapshot model and fast JSON serialization for the EIPL Predictive Watchdog.
+
+- Slotted records for bays, truck compliance and incidents that keep raw datetimes; ISO strings
+  are produced only when a field is read through the mapping interface or serialized.
+- ``CompactSnapshot`` reads like the dict snapshot (same keys, open incidents filtered on demand)
+  without materializing per-bay dicts.
+- ``dumps`` returns JSON bytes, via orjson when installed and the stdlib otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Order matches the partial index in sql/watchdog_pushdown_indexes.sql (SQLite compares term text).
+CLOSED_INCIDENT_STATUSES = ("resolved", "closed", "true", "1")
+SNAPSHOT_KEYS = (
+    "generated_at",
+    "terminal_ops",
+    "safety_incidents",
+    "open_safety_incidents",
+    "overdue_waits",
+    "inventory",
+)
+
+
+def _iso(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class _Record(Mapping):
+    """Read-only mapping view over a slotted dataclass; datetimes come back as ISO strings."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return _iso(getattr(self, key))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for key in self.__slots__:
+            value = getattr(self, key)
+            values[key] = value.as_dict() if isinstance(value, _Record) else _iso(value)
+        return values
+
+
+@dataclass(eq=True)
+class ComplianceRecord(_Record):
+    __slots__ = ("truck_id", "peso_expiry_date", "spark_arrestor_status")
+    truck_id: Optional[str]
+    peso_expiry_date: Optional[datetime]
+    spark_arrestor_status: Optional[str]
+
+
+@dataclass(eq=True)
+class BayRecord(_Record):
+    __slots__ = (
+        "bay_id",
+        "status",
+        "current_truck_id",
+        "lpg_inventory_level",
+        "gate_entry_time",
+        "wait_time_minutes",
+        "truck_compliance",
+    )
+    bay_id: str
+    status: Optional[str]
+    current_truck_id: Optional[str]
+    lpg_inventory_level: Optional[int]
+    gate_entry_time: Optional[datetime]
+    wait_time_minutes: Optional[int]
+    truck_compliance: Optional[ComplianceRecord]
+
+
+@dataclass(eq=True)
+class IncidentRecord(_Record):
+    __slots__ = ("incident_id", "severity", "description", "resolved_status")
+    incident_id: str
+    severity: Optional[str]
+    description: Optional[str]
+    resolved_status: Optional[str]
+
+    @property
+    def is_open(self) -> bool:
+        return str(self.resolved_status or "").strip().lower() not in CLOSED_INCIDENT_STATUSES
+
+
+class CompactSnapshot(Mapping):
+    """
+    Terminal snapshot backed by record lists.
+
+    Exposes the same keys as the dict snapshot so alert rules read it unchanged;
+    ``open_safety_incidents`` is filtered on access instead of being stored as a second list.
+    """
+
+    __slots__ = ("generated_at", "bays", "incidents", "overdue_waits", "inventory")
+
+    def __init__(
+        self,
+        generated_at: datetime,
+        bays: List[BayRecord],
+        incidents: List[IncidentRecord],
+        overdue_waits: List[Dict[str, Any]],
+        inventory: Dict[str, Any],
+    ) -> None:
+        self.generated_at = generated_at
+        self.bays = bays
+        self.incidents = incidents
+        self.overdue_waits = overdue_waits
+        self.inventory = inventory
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "generated_at":
+            return self.generated_at.isoformat()
+        if key == "terminal_ops":
+            return self.bays
+        if key == "safety_incidents":
+            return self.incidents
+        if key == "open_safety_incidents":
+            return [incident for incident in self.incidents if incident.is_open]
+        if key == "overdue_waits":
+            return self.overdue_waits
+        if key == "inventory":
+            return self.inventory
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SNAPSHOT_KEYS)
+
+    def __len__(self) -> int:
+        return len(SNAPSHOT_KEYS)
+
+    def _serializable(self) -> Dict[str, Any]:
+        # Records stay records here: orjson walks slotted dataclasses natively.
+        return {key: self[key] for key in SNAPSHOT_KEYS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, identical to what ``get_terminal_snapshot`` returns."""
+        values = self._serializable()
+        for key in ("terminal_ops", "safety_incidents", "open_safety_incidents"):
+            values[key] = [record.as_dict() for record in values[key]]
+        return values
+
+    def to_json(self) -> bytes:
+        return dumps(self)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, CompactSnapshot):
+        return value._serializable()
+    if isinstance(value, _Record):
+        return value.as_dict()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (datetime, date)):
+        return _iso(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON bytes for webhook bodies and snapshot consumers."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NAIVE_UTC)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,251 @@
+"""
+Shared truck compliance cache for the EIPL watchdog and the gate-pass approval engine.
+
+- In-process LRU with TTL, optionally backed by Redis so several processes share one copy.
+- Bulk reads: cache misses are handed to the caller's loader in one batch.
+- Explicit invalidation, plus an optional SQLAlchemy hook that invalidates trucks whose
+  ``truck_compliance`` rows were written in a committed session.
+- Bulk warm-up at startup.
+
+Off by default (``COMPLIANCE_CACHE_TTL_SECONDS=0``). The commit hook only sees writes made through
+SQLAlchemy sessions in the same process; writes from other processes or services, and bulk
+UPDATEs, reach a cached truck only when its entry expires. With the cache on, a compliance
+verdict may therefore be up to ``ttl_seconds`` stale: set the TTL to what a gate decision can
+tolerate, or call ``invalidate`` from those writers.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from eipl_session_hooks import on_write
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    redis = None
+
+LOGGER = logging.getLogger("eipl-compliance-cache")
+
+COMPLIANCE_TABLE = "truck_compliance"
+
+Entry = Dict[str, Any]
+Loader = Callable[[List[str]], Dict[str, Entry]]
+
+
+@dataclass
+class PendingLoad:
+    """Trucks a ``lookup`` did not find, with their invalidation generations at that moment."""
+
+    missing: List[str]
+    generations: Dict[str, int] = field(default_factory=dict)
+
+
+class ComplianceCache:
+    """
+    Compliance entries keyed by truck id, stored per ``view``.
+
+    The watchdog and the gate-pass engine map different columns of ``truck_compliance``, so each
+    reads its own projection under its own view name. A truck's views are kept together (one local
+    slot, one Redis hash) so invalidating a truck clears every view at once. Entries must be
+    JSON-serializable. Trucks the loader does not return are not cached, so a newly registered
+    truck is found on its next lookup.
+
+    With Redis the local layer defaults to a short TTL so invalidations made by other processes
+    reach this one quickly. Loaded entries are not stored for trucks invalidated in this process
+    while the load ran, so a read that predates a write cannot outlive it. Redis failures are
+    logged and the cache degrades to the local layer and the database.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int = 300,
+        max_entries: int = 10000,
+        redis_client: Optional[Any] = None,
+        redis_prefix: str = "eipl:compliance:",
+        local_ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.redis_client = redis_client
+        self.redis_prefix = redis_prefix
+        if local_ttl_seconds is None:
+            local_ttl_seconds = min(ttl_seconds, 30) if redis_client is not None else ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._local: "OrderedDict[str, Dict[str, Tuple[float, Entry]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, view: str, truck_id: str, loader: Loader) -> Optional[Entry]:
+        return self.get_many(view, [truck_id], loader).get(truck_id)
+
+    def get_many(self, view: str, truck_ids: Iterable[Optional[str]], loader: Loader) -> Dict[str, Entry]:
+        """Entries for ``truck_ids``; whatever is cached nowhere goes to ``loader`` in one call."""
+        found, pending = self.lookup(view, truck_ids)
+        if pending.missing:
+            loaded = loader(pending.missing)
+            self.fill(view, loaded, pending)
+            found.update(loaded)
+        return found
+
+    def lookup(self, view: str, truck_ids: Iterable[Optional[str]]) -> Tuple[Dict[str, Entry], PendingLoad]:
+        """
+        The cached entries for ``truck_ids`` and the trucks still to load. Callers that cannot hand
+        ``get_many`` a synchronous loader load the misses themselves and pass them to ``fill``.
+        """
+        wanted = list(dict.fromkeys(truck_id for truck_id in truck_ids if truck_id))
+        found = self._get_local(view, wanted)
+
+        missing = [truck_id for truck_id in wanted if truck_id not in found]
+        if missing and self.redis_client is not None:
+            shared = self._get_redis(view, missing)
+            self._put_local(view, shared)
+            found.update(shared)
+            missing = [truck_id for truck_id in missing if truck_id not in shared]
+
+        with self._lock:
+            self.hits += len(wanted) - len(missing)
+            self.misses += len(missing)
+            generations = {truck_id: self._generations.get(truck_id, 0) for truck_id in missing}
+        return found, PendingLoad(missing, generations)
+
+    def fill(self, view: str, entries: Dict[str, Entry], pending: PendingLoad) -> None:
+        """Store entries loaded for ``pending``, except trucks invalidated since the ``lookup``."""
+        with self._lock:
+            current = {
+                truck_id: entry
+                for truck_id, entry in entries.items()
+                if self._generations.get(truck_id, 0) == pending.generations.get(truck_id, 0)
+            }
+        self.put_many(view, current)
+
+    def put_many(self, view: str, entries: Dict[str, Entry]) -> None:
+        if not entries:
+            return
+        self._put_local(view, entries)
+        if self.redis_client is not None:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for truck_id, entry in entries.items():
+                    key = f"{self.redis_prefix}{truck_id}"
+                    pipe.hset(key, view, json.dumps(entry))
+                    pipe.expire(key, self.ttl_seconds)
+                pipe.execute()
+            except Exception:
+                LOGGER.exception("Redis compliance write failed; entries are cached in this process only.")
+
+    def warm(self, view: str, entries: Dict[str, Entry]) -> int:
+        """Bulk-load a view, typically every truck from one startup query."""
+        self.put_many(view, entries)
+        LOGGER.info("Compliance cache warmed: %s truck(s) in view %s", len(entries), view)
+        return len(entries)
+
+    def invalidate(self, truck_ids: Iterable[str]) -> None:
+        truck_ids = [truck_id for truck_id in dict.fromkeys(truck_ids) if truck_id]
+        if not truck_ids:
+            return
+        with self._lock:
+            for truck_id in truck_ids:
+                self._local.pop(truck_id, None)
+                self._generations[truck_id] = self._generations.get(truck_id, 0) + 1
+        if self.redis_client is not None:
+            try:
+                self.redis_client.delete(*(f"{self.redis_prefix}{truck_id}" for truck_id in truck_ids))
+            except Exception:
+                # Runs after commit, so raising would only hide that the write succeeded.
+                LOGGER.exception(
+                    "Redis compliance invalidation failed for %s truck(s); other processes may serve "
+                    "the old entries for up to %ss.",
+                    len(truck_ids),
+                    self.ttl_seconds,
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def invalidate_on_commit(self, target: Any, table_name: str = COMPLIANCE_TABLE) -> Callable[[], None]:
+        """
+        Invalidate trucks written through ``target`` (a Session class or sessionmaker) once the
+        session commits. Rows are matched by table name, so any model mapped to ``table_name``
+        with a ``truck_id`` attribute counts. Returns a function that removes the listeners.
+        """
+        return on_write(target, [table_name], lambda instance: getattr(instance, "truck_id", None), self.invalidate)
+
+    def _get_local(self, view: str, truck_ids: List[str]) -> Dict[str, Entry]:
+        found: Dict[str, Entry] = {}
+        now = time.monotonic()
+        with self._lock:
+            for truck_id in truck_ids:
+                views = self._local.get(truck_id)
+                cached = views.get(view) if views else None
+                if cached is None:
+                    continue
+                expires_at, entry = cached
+                if expires_at <= now:
+                    del views[view]
+                    continue
+                self._local.move_to_end(truck_id)
+                found[truck_id] = entry
+        return found
+
+    def _put_local(self, view: str, entries: Dict[str, Entry]) -> None:
+        expires_at = time.monotonic() + self.local_ttl_seconds
+        with self._lock:
+            for truck_id, entry in entries.items():
+                self._local.setdefault(truck_id, {})[view] = (expires_at, entry)
+                self._local.move_to_end(truck_id)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _get_redis(self, view: str, truck_ids: List[str]) -> Dict[str, Entry]:
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for truck_id in truck_ids:
+                pipe.hget(f"{self.redis_prefix}{truck_id}", view)
+            values = pipe.execute()
+        except Exception:
+            LOGGER.exception("Redis compliance lookup failed; falling back to the database.")
+            return {}
+        return {truck_id: json.loads(value) for truck_id, value in zip(truck_ids, values) if value is not None}
+
+
+def create_compliance_cache(
+    ttl_seconds: int,
+    redis_url: Optional[str],
+    max_entries: int = 10000,
+) -> ComplianceCache:
+    if redis_url and redis is not None:
+        try:
+            client = redis.Redis.from_url(redis_url, decode_responses=True)
+            client.ping()
+            return ComplianceCache(ttl_seconds=ttl_seconds, max_entries=max_entries, redis_client=client)
+        except Exception:
+            LOGGER.exception("Redis unavailable; using in-process compliance cache.")
+    return ComplianceCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+
+def create_compliance_cache_from_env() -> Optional[ComplianceCache]:
+    """
+    Cache configured by ``COMPLIANCE_CACHE_TTL_SECONDS`` (0, the default, disables; entries may be
+    this many seconds stale after writes from other processes), ``COMPLIANCE_CACHE_MAX_ENTRIES``
+    and ``COMPLIANCE_CACHE_REDIS_URL``.
+    """
+    ttl_seconds = int(os.getenv("COMPLIANCE_CACHE_TTL_SECONDS", "0"))
+    if ttl_seconds <= 0:
+        return None
+    return create_compliance_cache(
+        ttl_seconds=ttl_seconds,
+        redis_url=os.getenv("COMPLIANCE_CACHE_REDIS_URL", "").strip() or None,
+        max_entries=int(os.getenv("COMPLIANCE_CACHE_MAX_ENTRIES", "10000")),
+    )
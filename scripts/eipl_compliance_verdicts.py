@@ -0,0 +1,206 @@
+"""
+Materialized fleet compliance verdicts (``truck_compliance_verdict``).
+
+Each truck's pre-check is stored with the earliest upcoming expiry across
+``peso_license_validity``, ``earthing_relay_calibration`` and ``rc_fitness_certificate``:
+- compliance writes refresh their trucks' verdicts in the same transaction (``set_verdict_maintenance``);
+- a daily sweep re-evaluates only verdicts whose ``next_expiry`` has passed, an index range scan;
+- gate checks read one row's stored flags (``process_gate_pass(..., use_verdicts=True)``) and
+  expiring-soon reports are a range scan on ``next_expiry`` (``expiring_trucks``).
+
+Writes that bypass the ORM session (Core or bulk UPDATEs, raw SQL, other services) are not seen by
+the hook, and a gate check would keep trusting the old flags; run ``--rebuild`` after them.
+
+Usage:
+    TERMINAL_DB_URL=postgresql://... python scripts/eipl_compliance_verdicts.py [--rebuild]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import create_engine, delete, event, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from gate_pass_approval_engine import (
+    BULK_LOOKUP_CHUNK,
+    COMPLIANCE_DATE_FIELDS,
+    Base,
+    TruckComplianceRecord,
+    TruckComplianceVerdict,
+    precheck,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+LOGGER = logging.getLogger("eipl-compliance-verdicts")
+
+COMPLIANCE_TABLE = TruckComplianceRecord.__tablename__
+SOURCE_FIELDS = ("truck_id", "transporter_name", "spark_arrestor_status", *COMPLIANCE_DATE_FIELDS)
+
+_MAINTENANCE_UNHOOK: Optional[Callable[[], None]] = None
+
+
+def verdict_row(record: TruckComplianceRecord, today: date) -> Dict[str, Any]:
+    """The ``truck_compliance_verdict`` column values for ``record`` as of ``today``."""
+    checks = precheck(record, today)
+    dates = [getattr(record, name) for name in COMPLIANCE_DATE_FIELDS]
+    upcoming = [value for value in dates if value and value >= today]
+    row = {name: getattr(record, name) for name in SOURCE_FIELDS}
+    row.update(
+        peso_license_valid=checks["peso_license_validity"]["valid"],
+        spark_arrestor_ok=checks["spark_arrestor_status"]["valid"],
+        earthing_relay_valid=checks["earthing_relay_calibration"]["valid"],
+        rc_fitness_valid=checks["rc_fitness_certificate"]["valid"],
+        cleared=all(check["valid"] for check in checks.values()),
+        next_expiry=min(upcoming) if upcoming else None,
+        evaluated_on=today,
+    )
+    return row
+
+
+def _replace_verdicts(connection: Connection, truck_ids: Sequence[str], rows: List[Dict[str, Any]]) -> None:
+    # Delete then insert: portable across SQLite and PostgreSQL, and drops verdicts of deleted trucks.
+    table = TruckComplianceVerdict.__table__
+    for start in range(0, len(truck_ids), BULK_LOOKUP_CHUNK):
+        chunk = truck_ids[start : start + BULK_LOOKUP_CHUNK]
+        connection.execute(delete(table).where(table.c.truck_id.in_(chunk)))
+    if rows:
+        connection.execute(insert(table), rows)
+
+
+def refresh_verdicts(
+    connection: Connection, truck_ids: Optional[Iterable[str]] = None, today: Optional[date] = None
+) -> int:
+    """Recompute verdicts for ``truck_ids`` (every truck when None) from ``truck_compliance``."""
+    today = today or date.today()
+    source = TruckComplianceRecord.__table__
+    columns = [source.c[name] for name in SOURCE_FIELDS]
+    if truck_ids is None:
+        connection.execute(delete(TruckComplianceVerdict.__table__))
+        source_rows = connection.execute(select(*columns))
+        rows = [verdict_row(TruckComplianceRecord(**row._mapping), today) for row in source_rows]
+        if rows:
+            connection.execute(insert(TruckComplianceVerdict.__table__), rows)
+        return len(rows)
+
+    wanted = list(dict.fromkeys(truck_id for truck_id in truck_ids if truck_id))
+    rows = []
+    for start in range(0, len(wanted), BULK_LOOKUP_CHUNK):
+        chunk = wanted[start : start + BULK_LOOKUP_CHUNK]
+        for row in connection.execute(select(*columns).where(source.c.truck_id.in_(chunk))):
+            rows.append(verdict_row(TruckComplianceRecord(**row._mapping), today))
+    _replace_verdicts(connection, wanted, rows)
+    return len(rows)
+
+
+def sweep_expired_verdicts(connection: Connection, today: Optional[date] = None) -> int:
+    """
+    Re-evaluate verdicts whose ``next_expiry`` is before ``today`` from their own copied fields.
+    Only those rows can have changed since they were written, so the rest are not read.
+    """
+    today = today or date.today()
+    verdicts = TruckComplianceVerdict.__table__
+    stale = connection.execute(
+        select(*(verdicts.c[name] for name in SOURCE_FIELDS)).where(verdicts.c.next_expiry < today)
+    ).all()
+    rows = [verdict_row(TruckComplianceRecord(**row._mapping), today) for row in stale]
+    _replace_verdicts(connection, [row["truck_id"] for row in rows], rows)
+    return len(rows)
+
+
+def maintain_verdicts_on_commit(target: Any) -> Callable[[], None]:
+    """
+    Refresh the verdicts of trucks whose ``truck_compliance`` rows a session on ``target`` (a
+    Session class or sessionmaker) flushes, inside the same transaction as the write. Returns a
+    function that removes the listeners.
+    """
+    pending_key = "eipl_compliance_verdicts_pending"
+
+    def after_flush(session: Any, flush_context: Any) -> None:
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            if getattr(instance, "__tablename__", None) == COMPLIANCE_TABLE:
+                session.info.setdefault(pending_key, set()).add(getattr(instance, "truck_id", None))
+
+    def after_flush_postexec(session: Any, flush_context: Any) -> None:
+        pending = session.info.pop(pending_key, None)
+        if pending:
+            refresh_verdicts(session.connection(), pending)
+
+    event.listen(target, "after_flush", after_flush)
+    event.listen(target, "after_flush_postexec", after_flush_postexec)
+
+    def remove() -> None:
+        event.remove(target, "after_flush", after_flush)
+        event.remove(target, "after_flush_postexec", after_flush_postexec)
+
+    return remove
+
+
+def set_verdict_maintenance(enabled: bool) -> bool:
+    """
+    Keep verdicts current on every SQLAlchemy ``Session`` (``maintain_verdicts_on_commit``) and
+    return the previous setting. Enable it in each process that writes ``truck_compliance``.
+    """
+    global _MAINTENANCE_UNHOOK
+    previous = _MAINTENANCE_UNHOOK is not None
+    if enabled and _MAINTENANCE_UNHOOK is None:
+        _MAINTENANCE_UNHOOK = maintain_verdicts_on_commit(Session)
+    elif not enabled and _MAINTENANCE_UNHOOK is not None:
+        _MAINTENANCE_UNHOOK()
+        _MAINTENANCE_UNHOOK = None
+    return previous
+
+
+def expiring_trucks(db_session: Session, within_days: int = 7, today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Trucks with a certificate expiring within ``within_days``, soonest first. Verdicts whose
+    ``next_expiry`` already passed (the daily sweep is late or was skipped) are listed first with
+    ``expired`` set, rather than dropped.
+    """
+    today = today or date.today()
+    verdicts = db_session.execute(
+        select(TruckComplianceVerdict)
+        .where(TruckComplianceVerdict.next_expiry <= today + timedelta(days=within_days))
+        .order_by(TruckComplianceVerdict.next_expiry, TruckComplianceVerdict.truck_id)
+    ).scalars()
+    return [
+        {
+            "truck_id": verdict.truck_id,
+            "transporter_name": verdict.transporter_name or "Unknown",
+            "cleared": verdict.cleared and verdict.next_expiry >= today,
+            "expired": verdict.next_expiry < today,
+            "next_expiry": verdict.next_expiry.isoformat(),
+            "expiring": [name for name in COMPLIANCE_DATE_FIELDS if getattr(verdict, name) == verdict.next_expiry],
+        }
+        for verdict in verdicts
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=os.getenv("TERMINAL_DB_URL", "").strip())
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every verdict instead of the daily sweep.")
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        raise SystemExit("Missing TERMINAL_DB_URL environment variable (or --db-url).")
+
+    engine = create_engine(args.db_url, future=True)
+    Base.metadata.create_all(engine, tables=[TruckComplianceVerdict.__table__])
+    with engine.begin() as connection:
+        if args.rebuild:
+            LOGGER.info("Rebuilt %s verdict(s).", refresh_verdicts(connection))
+        else:
+            LOGGER.info("Swept %s expired verdict(s).", sweep_expired_verdicts(connection))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+SQLAlchemy session hooks shared by the compliance and briefing caches.
+
+``on_write`` collects a key for every row a flush writes to the watched tables and hands the
+keys to an action once the session commits; a rollback drops them. ``rehook`` swaps the hooked
+object behind a module-level ``set_*`` setting, unhooking the previous one.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, Iterable, Optional, Set
+
+from sqlalchemy import event
+
+Unhook = Callable[[], None]
+
+
+def on_write(
+    target: Any,
+    tables: Iterable[str],
+    key_for: Callable[[Any], Hashable],
+    action: Callable[[Set[Hashable]], None],
+) -> Unhook:
+    """
+    Call ``action`` with ``key_for(instance)`` of every instance mapped to one of ``tables`` that
+    a session on ``target`` (a Session class or sessionmaker) inserted, updated or deleted, once
+    that session commits. Returns a function that removes the listeners.
+    """
+    tables = frozenset(tables)
+    # A fresh token per hook, so several hooks on one target keep separate pending sets.
+    pending_key = object()
+
+    def after_flush(session: Any, flush_context: Any) -> None:
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            if getattr(instance, "__tablename__", None) in tables:
+                session.info.setdefault(pending_key, set()).add(key_for(instance))
+
+    def after_commit(session: Any) -> None:
+        pending = session.info.pop(pending_key, None)
+        if pending:
+            action(pending)
+
+    def after_soft_rollback(session: Any, previous_transaction: Any) -> None:
+        session.info.pop(pending_key, None)
+
+    listeners = {
+        "after_flush": after_flush,
+        "after_commit": after_commit,
+        "after_soft_rollback": after_soft_rollback,
+    }
+    for name, listener in listeners.items():
+        event.listen(target, name, listener)
+
+    def remove() -> None:
+        for name, listener in listeners.items():
+            event.remove(target, name, listener)
+
+    return remove
+
+
+def rehook(unhook: Optional[Unhook], value: Optional[Any], hook: Callable[[Any], Unhook]) -> Optional[Unhook]:
+    """
+    Remove the listeners behind ``unhook`` and hook ``value`` in their place (None hooks nothing).
+    Returns the new remover, for the caller to keep until the next swap.
+    """
+    if unhook is not None:
+        # The previous object stops receiving commits and can be collected.
+        unhook()
+    return hook(value) if value is not None else None
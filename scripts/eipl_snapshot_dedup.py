@@ -0,0 +1,109 @@
+"""
+Compact existing gate-pass audit rows onto content-addressed compliance snapshots.
+
+Run sql/gate_pass_snapshot_dedup.sql first. Audit rows are read in id order, ``batch_size`` per
+transaction; each batch stores its distinct snapshots in ``gate_pass_compliance_snapshot``, sets the
+rows' ``snapshot_sha256`` and clears their ``compliance_snapshot``. Rows already holding a reference
+are skipped, so an interrupted run can simply be started again (or resumed with ``--after-id``).
+The space freed inside ``gate_pass_audit_log`` is reused by new rows; on PostgreSQL run
+``VACUUM FULL gate_pass_audit_log`` (or pg_repack) to return it to the filesystem.
+
+Usage:
+    TERMINAL_DB_URL=postgresql://... python scripts/eipl_snapshot_dedup.py [--dry-run] [--batch-size 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import bindparam, create_engine, select, update
+from sqlalchemy.engine import Engine
+
+from gate_pass_approval_engine import GatePassAuditLog, dedup_snapshots, snapshot_hash
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+LOGGER = logging.getLogger("eipl-snapshot-dedup")
+
+COMPACTION_BATCH_SIZE = 5000
+
+
+@dataclass
+class CompactionRun:
+    rows: int = 0
+    last_id: str = ""
+    inline_bytes: int = 0
+    distinct_bytes: int = 0
+    hashes: Set[str] = field(default_factory=set)
+
+
+def compact_audit_snapshots(
+    engine: Engine, batch_size: int = COMPACTION_BATCH_SIZE, dry_run: bool = False, after_id: str = ""
+) -> CompactionRun:
+    """Replace inline snapshots with references, ``batch_size`` audit rows per transaction."""
+    table = GatePassAuditLog.__table__
+    rewrite = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(compliance_snapshot=None, snapshot_sha256=bindparam("b_hash"))
+    )
+    run = CompactionRun(last_id=after_id)
+    while True:
+        with engine.begin() as connection:
+            batch = connection.execute(
+                select(table.c.id, table.c.compliance_snapshot, table.c.snapshot_sha256)
+                .where(table.c.id > run.last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                return run
+            run.last_id = batch[-1].id
+            inline = [row for row in batch if row.snapshot_sha256 is None]
+            for row in inline:
+                size = len(json.dumps(row.compliance_snapshot, separators=(",", ":")))
+                run.inline_bytes += size
+                key = snapshot_hash(row.compliance_snapshot)
+                if key not in run.hashes:
+                    run.hashes.add(key)
+                    run.distinct_bytes += size
+            run.rows += len(inline)
+            if inline and not dry_run:
+                keys = dedup_snapshots(connection, [row.compliance_snapshot for row in inline])
+                updates: List[Dict[str, Any]] = [{"b_id": row.id, "b_hash": key} for row, key in zip(inline, keys)]
+                connection.execute(rewrite, updates)
+        LOGGER.info("%s row(s) compacted onto %s snapshot(s), up to id %s.", run.rows, len(run.hashes), run.last_id)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=os.getenv("TERMINAL_DB_URL", "").strip())
+    parser.add_argument("--batch-size", type=int, default=COMPACTION_BATCH_SIZE)
+    parser.add_argument("--after-id", default="", help="Resume after this audit row id.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be compacted without writing.")
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        raise SystemExit("Missing TERMINAL_DB_URL environment variable (or --db-url).")
+
+    engine = create_engine(args.db_url, future=True)
+    run = compact_audit_snapshots(engine, batch_size=args.batch_size, dry_run=args.dry_run, after_id=args.after_id)
+    engine.dispose()
+    LOGGER.info(
+        "%s%s audit row(s), %s distinct snapshot(s): %s inline snapshot byte(s) -> %s.",
+        "Dry run: " if args.dry_run else "",
+        run.rows,
+        len(run.hashes),
+        run.inline_bytes,
+        run.distinct_bytes,
+    )
+
+
+if __name__ == "__main__":
+    main()
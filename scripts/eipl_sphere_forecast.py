@@ -0,0 +1,168 @@
+"""
+Vectorized per-sphere tank-top forecasting for the EIPL Predictive Watchdog.
+
+Keeps a rolling level history per Horton Sphere in NumPy ring buffers and, each cycle, estimates
+fill/discharge rates and projects several horizons for every sphere in one pass.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+DEFAULT_HORIZONS_HOURS = (1.0, 2.0, 6.0)
+
+
+@dataclass
+class SphereForecast:
+    sphere_ids: List[str]
+    horizons_hours: np.ndarray
+    samples: np.ndarray
+    ready: np.ndarray
+    level_percent: np.ndarray
+    net_rate_percent_per_hour: np.ndarray
+    fill_rate_kl_per_hour: np.ndarray
+    discharge_rate_kl_per_hour: np.ndarray
+    hours_to_tank_top: np.ndarray
+    projected_percent: np.ndarray
+
+    @property
+    def total_discharge_rate_kl_per_hour(self) -> float:
+        return float(self.discharge_rate_kl_per_hour[self.ready].sum()) if self.ready.any() else 0.0
+
+    def sphere(self, index: int) -> Dict[str, Any]:
+        hours = float(self.hours_to_tank_top[index])
+        return {
+            "sphere_id": self.sphere_ids[index],
+            "samples": int(self.samples[index]),
+            "level_percent": round(float(self.level_percent[index]), 2),
+            "net_rate_percent_per_hour": round(float(self.net_rate_percent_per_hour[index]), 3),
+            "fill_rate_kl_per_hour": round(float(self.fill_rate_kl_per_hour[index]), 2),
+            "discharge_rate_kl_per_hour": round(float(self.discharge_rate_kl_per_hour[index]), 2),
+            "time_to_tank_top_hours": round(hours, 2) if np.isfinite(hours) else None,
+            "projected_percent": {
+                f"{h:g}h": round(float(p), 2) for h, p in zip(self.horizons_hours, self.projected_percent[index])
+            },
+        }
+
+
+class SphereForecaster:
+    """
+    Ring buffer of the last ``window`` level samples for every sphere, sampled together each cycle.
+
+    Net rate is the least-squares slope of level over time. Fill and discharge rates are the mean
+    positive and negative step rates between consecutive samples, converted to kl/h with each
+    sphere's capacity. Spheres with fewer than ``min_samples`` readings are reported as not ready.
+    """
+
+    def __init__(
+        self,
+        capacity_kl: Union[float, Mapping[str, float]],
+        *,
+        window: int = 60,
+        horizons_hours: Sequence[float] = DEFAULT_HORIZONS_HOURS,
+        min_samples: int = 3,
+    ) -> None:
+        if window < 2:
+            raise ValueError("window must hold at least two samples.")
+        self.capacity_kl = capacity_kl
+        self.window = window
+        self.horizons_hours = np.asarray(horizons_hours, dtype=float)
+        self.min_samples = max(2, min_samples)
+        self.sphere_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._times = np.full(window, np.nan)
+        self._levels = np.full((0, window), np.nan)
+        self._capacities = np.zeros(0)
+        self._head = 0
+
+    def _ensure_spheres(self, sphere_ids: Sequence[str]) -> None:
+        new_ids = [sphere_id for sphere_id in sphere_ids if sphere_id not in self._index]
+        if not new_ids:
+            return
+        for sphere_id in new_ids:
+            self._index[sphere_id] = len(self.sphere_ids)
+            self.sphere_ids.append(sphere_id)
+        self._levels = np.vstack([self._levels, np.full((len(new_ids), self.window), np.nan)])
+        if isinstance(self.capacity_kl, Mapping):
+            new_caps = [float(self.capacity_kl.get(sphere_id, 0.0)) for sphere_id in new_ids]
+        else:
+            new_caps = [float(self.capacity_kl)] * len(new_ids)
+        self._capacities = np.concatenate([self._capacities, np.asarray(new_caps)])
+
+    def observe(self, at: datetime, levels_percent: Mapping[str, float]) -> None:
+        """Record one sample per sphere; spheres missing from ``levels_percent`` get a gap."""
+        sphere_ids = list(levels_percent.keys())
+        self._ensure_spheres(sphere_ids)
+        column = self._head
+        self._times[column] = _epoch_seconds(at)
+        self._levels[:, column] = np.nan
+        if sphere_ids:
+            rows = np.fromiter((self._index[s] for s in sphere_ids), dtype=np.intp, count=len(sphere_ids))
+            self._levels[rows, column] = np.fromiter(
+                (float(levels_percent[s]) for s in sphere_ids), dtype=float, count=len(sphere_ids)
+            )
+        self._head = (column + 1) % self.window
+
+    def forecast(self, now: Optional[datetime] = None) -> SphereForecast:
+        # Chronological view of the ring: oldest column first.
+        order = (self._head + np.arange(self.window)) % self.window
+        times = self._times[order]
+        levels = self._levels[:, order]
+        if now is not None:
+            reference = _epoch_seconds(now)
+        else:
+            reference = float(np.nanmax(times)) if np.isfinite(times).any() else 0.0
+        t_hours = (times - reference) / 3600.0
+
+        mask = ~np.isnan(levels) & ~np.isnan(t_hours)[None, :]
+        samples = mask.sum(axis=1)
+        safe_n = np.maximum(samples, 1)
+        t_mean = np.where(mask, t_hours[None, :], 0.0).sum(axis=1) / safe_n
+        l_mean = np.where(mask, levels, 0.0).sum(axis=1) / safe_n
+        dt = np.where(mask, t_hours[None, :] - t_mean[:, None], 0.0)
+        dl = np.where(mask, levels - l_mean[:, None], 0.0)
+        var = (dt * dt).sum(axis=1)
+        ready = (samples >= self.min_samples) & (var > 0)
+        slope = np.where(ready, (dt * dl).sum(axis=1) / np.where(var > 0, var, 1.0), 0.0)
+
+        # Latest observed level per sphere: last non-NaN column in chronological order.
+        has_level = mask.any(axis=1)
+        last_col = self.window - 1 - np.argmax(mask[:, ::-1], axis=1)
+        latest = np.where(has_level, levels[np.arange(levels.shape[0]), last_col], 0.0)
+
+        step_hours = np.diff(t_hours)
+        step_rates = np.diff(levels, axis=1) / np.where(step_hours > 0, step_hours, np.nan)[None, :]
+        step_valid = ~np.isnan(step_rates)
+        step_count = np.maximum(step_valid.sum(axis=1), 1)
+        rises = np.where(step_valid, np.maximum(step_rates, 0.0), 0.0).sum(axis=1) / step_count
+        falls = np.where(step_valid, np.maximum(-step_rates, 0.0), 0.0).sum(axis=1) / step_count
+        kl_per_percent = self._capacities / 100.0
+
+        headroom = np.maximum(0.0, 100.0 - latest)
+        rising = ready & (slope > 0)
+        hours_to_top = np.full(latest.shape, np.inf)
+        hours_to_top[rising] = headroom[rising] / slope[rising]
+        projected = np.clip(latest[:, None] + slope[:, None] * self.horizons_hours[None, :], 0.0, 100.0)
+
+        return SphereForecast(
+            sphere_ids=list(self.sphere_ids),
+            horizons_hours=self.horizons_hours,
+            samples=samples,
+            ready=ready,
+            level_percent=latest,
+            net_rate_percent_per_hour=slope,
+            fill_rate_kl_per_hour=np.where(ready, rises * kl_per_percent, 0.0),
+            discharge_rate_kl_per_hour=np.where(ready, falls * kl_per_percent, 0.0),
+            hours_to_tank_top=hours_to_top,
+            projected_percent=projected,
+        )
+
+
+def _epoch_seconds(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
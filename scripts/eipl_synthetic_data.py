@@ -0,0 +1,259 @@
+"""
+Synthetic terminal database at configurable scale, for benchmarks and load tests.
+
+The watchdog, briefing and gate-pass scripts each map their own view of the terminal tables, and
+two tables (``safety_incidents``, ``truck_compliance``) are mapped by more than one script with
+different columns. ``unified_metadata`` merges them into one schema so every script reads the
+same database, as they would in production.
+
+Usage:
+    python scripts/eipl_synthetic_data.py --db-url sqlite:///terminal.db --scale medium
+    python scripts/eipl_synthetic_data.py --db-url postgresql://localhost/eipl_bench --scale large --years 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from dataclasses import dataclass, fields, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import MetaData, Table, create_engine, insert, inspect, literal, select
+from sqlalchemy.engine import Engine
+
+import eipl_terminal_watchdog as watchdog
+import executive_briefing_api as briefing
+import gate_pass_approval_engine as gate_pass
+
+LOGGER = logging.getLogger("eipl-synthetic-data")
+
+INSERT_BATCH_SIZE = 20000
+OPEN_INCIDENT_DAYS = 7
+
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    bays: int
+    trucks: int
+    years: float
+    incidents_per_day: float = 4.0
+    reading_minutes: int = 15
+    approvals_per_day: float = 60.0
+    queue_fraction: float = 0.05
+
+
+SCALES: Dict[str, Scale] = {
+    "small": Scale("small", bays=20, trucks=200, years=0.25),
+    "medium": Scale("medium", bays=80, trucks=2000, years=1.0),
+    "large": Scale("large", bays=300, trucks=20000, years=5.0, incidents_per_day=12.0),
+}
+
+
+def unified_metadata() -> MetaData:
+    """Every table the scripts map, with the columns of each same-named table merged."""
+    merged = MetaData()
+    for base in (watchdog.Base, briefing.Base, gate_pass.Base):
+        for table in base.metadata.sorted_tables:
+            target = merged.tables.get(table.name)
+            if target is None:
+                table.to_metadata(merged)
+                continue
+            for column in table.columns:
+                if column.name not in target.c:
+                    copied = column._copy()
+                    # Other scripts insert into this table without knowing the column.
+                    copied.nullable = True
+                    target.append_column(copied)
+    return merged
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int = INSERT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def populated_tables(engine: Engine, tables: Iterable[Table]) -> List[str]:
+    """Names of the ``tables`` that exist on ``engine`` and hold at least one row."""
+    existing = set(inspect(engine).get_table_names())
+    with engine.connect() as connection:
+        return [
+            table.name
+            for table in tables
+            if table.name in existing
+            and connection.execute(select(literal(1)).select_from(table).limit(1)).first() is not None
+        ]
+
+
+def generate(
+    engine: Engine, scale: Scale, seed: int = 7, now: Optional[datetime] = None, force: bool = False
+) -> Dict[str, int]:
+    """
+    Drop and recreate the terminal tables on ``engine`` and fill them at ``scale``.
+
+    Raises ValueError, before dropping anything, when a terminal table already holds rows, unless
+    ``force`` is set: pointed at a real terminal database this would wipe it.
+
+    Returns row counts per table. Incidents older than ``OPEN_INCIDENT_DAYS`` are closed; about a
+    quarter of the recent ones are still open.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    today = now.date()
+    days = max(1, int(scale.years * 365))
+    metadata = unified_metadata()
+    if not force:
+        populated = populated_tables(engine, metadata.sorted_tables)
+        if populated:
+            raise ValueError(f"Refusing to drop tables that hold data: {', '.join(populated)}.")
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    tables = metadata.tables
+    counts: Dict[str, int] = {}
+
+    def expiry(valid_share: float) -> date:
+        return today + timedelta(days=rng.randint(1, 365) if rng.random() < valid_share else -rng.randint(1, 90))
+
+    def trucks() -> Iterator[Dict[str, Any]]:
+        for i in range(scale.trucks):
+            peso = expiry(0.95)
+            yield {
+                "truck_id": f"TRK-{i:06d}",
+                "transporter_name": f"Transporter {i % 40:02d}",
+                "peso_expiry_date": datetime.combine(peso, datetime.min.time(), tzinfo=timezone.utc),
+                "peso_license_validity": peso,
+                "spark_arrestor_status": rng.choices(["OK", "PASS", "FAIL"], weights=[70, 25, 5])[0],
+                "earthing_relay_calibration": expiry(0.97),
+                "rc_fitness_certificate": expiry(0.98),
+                "updated_at": now - timedelta(days=rng.randint(0, days)),
+            }
+
+    def terminal_ops() -> Iterator[Dict[str, Any]]:
+        for i in range(scale.bays):
+            occupied = rng.random() < 0.6
+            yield {
+                "bay_id": f"BAY-{i:04d}",
+                "status": rng.choice(["LOADING", "WAITING", "DISCHARGING"]) if occupied else "IDLE",
+                "current_truck_id": f"TRK-{rng.randrange(scale.trucks):06d}" if occupied else None,
+                "lpg_inventory_level": rng.randint(30, 95),
+                "gate_entry_time": now - timedelta(minutes=rng.randint(5, 150)) if occupied else None,
+                "updated_at": now - timedelta(minutes=rng.randint(0, 60)),
+            }
+
+    def terminal_bays() -> Iterator[Dict[str, Any]]:
+        for i in range(scale.bays):
+            status = rng.choice(["ACTIVE", "LOADING", "DISCHARGING", "IDLE", None])
+            yield {
+                "bay_id": f"BAY-{i:04d}",
+                "status": status,
+                "active_truck_id": f"TRK-{rng.randrange(scale.trucks):06d}" if status else None,
+            }
+
+    def gate_queue() -> Iterator[Dict[str, Any]]:
+        for i in range(max(1, int(scale.trucks * scale.queue_fraction))):
+            yield {
+                "truck_id": f"TRK-{rng.randrange(scale.trucks):06d}",
+                "queue_status": "WAITING",
+                "peso_expiry_date": expiry(0.9),
+            }
+
+    def incidents() -> Iterator[Dict[str, Any]]:
+        total = int(days * scale.incidents_per_day)
+        for i in range(total):
+            created_at = now - timedelta(seconds=(total - i) * 86400 / scale.incidents_per_day)
+            is_open = created_at > now - timedelta(days=OPEN_INCIDENT_DAYS) and rng.random() < 0.25
+            closed_as = rng.choice(["resolved", "closed"])
+            yield {
+                "incident_id": f"INC-{i:08d}",
+                "severity": rng.choices(["LOW", "MED", "HIGH"], weights=[70, 25, 5])[0],
+                "description": "Synthetic safety observation at gantry.",
+                "resolved_status": "open" if is_open else closed_as,
+                "status": "OPEN" if is_open else closed_as.upper(),
+                "created_at": created_at,
+                "updated_at": created_at if is_open else created_at + timedelta(hours=rng.randint(1, 48)),
+            }
+
+    def readings() -> Iterator[Dict[str, Any]]:
+        total = days * 24 * 60 // scale.reading_minutes
+        level = 60.0
+        for i in range(total):
+            # A bounded random walk: the sphere fills from inbound tankers and drains at the gantry.
+            level = min(98.0, max(20.0, level + rng.uniform(-1.5, 1.5)))
+            yield {
+                "horton_sphere_level_percent": round(level, 2),
+                "recorded_at": now - timedelta(minutes=(total - i) * scale.reading_minutes),
+            }
+
+    def approvals() -> Iterator[Dict[str, Any]]:
+        total = int(days * scale.approvals_per_day)
+        for i in range(total):
+            stamp = now - timedelta(seconds=(total - i) * 86400 / scale.approvals_per_day)
+            truck_id = f"TRK-{rng.randrange(scale.trucks):06d}"
+            yield {
+                "id": f"gpa-{truck_id}-{i}",
+                "truck_id": truck_id,
+                "approved_by_user_id": f"user-{i % 25:02d}",
+                "timestamp": stamp,
+                "compliance_snapshot": {"truck_id": truck_id, "peso_license_validity": "valid"},
+                "gate_pass_issued": True,
+            }
+
+    sources = {
+        "truck_compliance": trucks(),
+        "terminal_ops": terminal_ops(),
+        "terminal_bays": terminal_bays(),
+        "gate_queue": gate_queue(),
+        "safety_incidents": incidents(),
+        "lpg_inventory": readings(),
+        "gate_pass_audit_log": approvals(),
+    }
+    with engine.begin() as connection:
+        for name, rows in sources.items():
+            started = time.perf_counter()
+            counts[name] = 0
+            for batch in _batches(rows):
+                connection.execute(insert(tables[name]), batch)
+                counts[name] += len(batch)
+            LOGGER.info("%s: %s row(s) in %.1fs", name, counts[name], time.perf_counter() - started)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", required=True, help="Target database; its terminal tables are dropped first.")
+    parser.add_argument("--force", action="store_true", help="Drop the terminal tables even if they hold data.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for scale_field in fields(Scale):
+        if scale_field.name != "name":
+            flag = "--" + scale_field.name.replace("_", "-")
+            parser.add_argument(flag, type=type(getattr(SCALES["small"], scale_field.name)), default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    overrides = {
+        scale_field.name: getattr(args, scale_field.name)
+        for scale_field in fields(Scale)
+        if scale_field.name != "name" and getattr(args, scale_field.name) is not None
+    }
+    scale = replace(SCALES[args.scale], **overrides)
+    engine = create_engine(args.db_url, future=True)
+    try:
+        counts = generate(engine, scale, seed=args.seed, force=args.force)
+    except ValueError as exc:
+        raise SystemExit(f"{exc} Pass --force to drop them anyway.") from exc
+    engine.dispose()
+    LOGGER.info("Generated %s: %s", scale, counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,31 +3,68 @@ EIPL Predictive Watchdog for LPG terminal operations.
 
 Capabilities:
 - Fetch live terminal data from SQL tables via SQLAlchemy.
-- Build terminal snapshot with wait-time intelligence.
-- Predict Horton Sphere bottleneck risk (time to tank-top).
+- Build terminal snapshot with wait-time intelligence, optionally as compact slotted records.
+- Read truck compliance through a shared TTL/LRU cache (optionally Redis-backed) instead of the full table.
+- Optionally evaluate the overdue-wait and open-incident predicates in SQL against partial indexes.
+- Optionally patch the snapshot incrementally from rows changed since an updated_at watermark.
+- Optionally detect new incidents from a persisted created_at watermark instead of the full id set.
+- Predict Horton Sphere bottleneck risk (time to tank-top), optionally per sphere from level history.
 - Deduplicate alerts for 30 minutes to avoid alert fatigue.
-- Push high-signal webhook payloads to the Buddy/chatbot API.
+- Push high-signal webhook payloads to the Buddy/chatbot API from a pooled background queue.
+- Watch several terminals from one process, optionally sharded across instances via Redis leases.
+- Event-driven mode: react to PostgreSQL LISTEN/NOTIFY row changes, with polling as a slow sweep.
+- Adaptive mode: each check on its own cadence, tightened automatically while risk is elevated.
+- Stage timings, row/alert counters and webhook latency on an optional Prometheus /metrics endpoint.
 """
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import logging
 import os
+import queue
+import selectors
+import socket
+import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import requests
-from sqlalchemy import DateTime, Integer, String, create_engine, select
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from sqlalchemy import DateTime, Integer, String, bindparam, create_engine, func, literal_column, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker, undefer
 
 try:
     import redis  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     redis = None
 
+import eipl_compact_snapshot as compact_snapshot
+import eipl_watchdog_metrics as metrics
+from eipl_compact_snapshot import (
+    CLOSED_INCIDENT_STATUSES,
+    BayRecord,
+    CompactSnapshot,
+    ComplianceRecord,
+    IncidentRecord,
+)
+from eipl_compliance_cache import ComplianceCache, create_compliance_cache_from_env
+
+try:
+    from eipl_sphere_forecast import SphereForecast, SphereForecaster
+except Exception:  # pragma: no cover - optional dependency (numpy)
+    SphereForecast = None  # type: ignore
+    SphereForecaster = None  # type: ignore
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +72,13 @@ logging.basicConfig(
 )
 LOGGER = logging.getLogger("eipl-predictive-watchdog")
 
+NOTIFY_CHANNEL = "eipl_watchdog"
+NOTIFY_TRIGGERS_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "watchdog_notify_triggers.sql")
+PUSHDOWN_INDEXES_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql", "watchdog_pushdown_indexes.sql")
+OVERDUE_WAIT_MINUTES = 45
+# Liquid LPG (typical Indian 40:60 propane/butane mix) near 15 C; converts sphere kl/h into TPH.
+DEFAULT_LPG_DENSITY_T_PER_KL = 0.55
+
 
 class Base(DeclarativeBase):
     pass
@@ -48,6 +92,9 @@ class TerminalOps(Base):
     current_truck_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     lpg_inventory_level: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     gate_entry_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Only read in incremental snapshot mode, which needs sql/watchdog_incremental.sql; deferred so
+    # the other modes work without the column.
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, deferred=True)
 
 
 class SafetyIncident(Base):
@@ -57,6 +104,9 @@ class SafetyIncident(Base):
     severity: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     description: Mapped[Optional[str]] = mapped_column(String(2048), nullable=True)
     resolved_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    # Only read by watermark incident tracking (WATCHDOG_INCIDENT_TRACKING=watermark, or pushdown snapshots).
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, deferred=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, deferred=True)
 
 
 class TruckCompliance(Base):
@@ -65,10 +115,34 @@ class TruckCompliance(Base):
     truck_id: Mapped[str] = mapped_column(String(64), primary_key=True)
     peso_expiry_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     spark_arrestor_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, deferred=True)
+
+
+class SystemClock:
+    """Wall clock used by the watchdog; replay swaps in a virtual clock through ``set_clock``."""
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+CLOCK: Any = SystemClock()
+
+
+def set_clock(clock: Any) -> Any:
+    """Install ``clock`` (``now()``, ``monotonic()`` and ``sleep()``) and return the previous one."""
+    global CLOCK
+    previous, CLOCK = CLOCK, clock
+    return previous
 
 
 def now_utc() -> datetime:
-    return datetime.now(timezone.utc)
+    return CLOCK.now()
 
 
 def to_iso(value: Optional[datetime]) -> Optional[str]:
@@ -101,83 +175,141 @@ def normalize_lpg_percent(raw_level: Optional[int], sphere_capacity_kl: float) -
     return min(100.0, (float(raw_level) / sphere_capacity_kl) * 100.0)
 
 
-def compute_discharge_rate_tph(ops_rows: List[TerminalOps], fallback_rate: float) -> float:
+def compute_discharge_rate_tph(
+    ops_rows: List[TerminalOps],
+    fallback_rate: float,
+    measured_rate_tph: Optional[float] = None,
+) -> float:
+    return _discharge_rate_from_statuses((row.status for row in ops_rows), fallback_rate, measured_rate_tph)
+
+
+def _discharge_rate_from_statuses(
+    statuses: Iterable[Optional[str]],
+    fallback_rate: float,
+    measured_rate_tph: Optional[float] = None,
+) -> float:
+    if measured_rate_tph is not None:
+        # Throughput measured from sphere level history beats the per-bay heuristic.
+        return max(0.0, measured_rate_tph)
     moving_statuses = {"DISCHARGING", "DECANTING", "LOADING", "ACTIVE"}
-    active = sum(1 for row in ops_rows if str(row.status or "").upper() in moving_statuses)
+    active = sum(1 for status in statuses if str(status or "").upper() in moving_statuses)
     if active == 0:
         return max(0.0, fallback_rate)
     # Simple operational estimate: 1 active discharge path ~= 6 TPH.
     return max(fallback_rate, float(active) * 6.0)
 
 
-def get_terminal_snapshot(
-    session: Session,
+def _truck_compliance_entry(row: TruckCompliance) -> Dict[str, Any]:
+    return {
+        "truck_id": row.truck_id,
+        "peso_expiry_date": to_iso(row.peso_expiry_date),
+        "spark_arrestor_status": row.spark_arrestor_status,
+    }
+
+
+def _bay_entry(
+    row: TerminalOps,
+    compliance: Optional[Dict[str, Any]],
+    now: datetime,
+) -> Dict[str, Any]:
+    truck_id = row.current_truck_id
+    if not truck_id:
+        truck_compliance = None
+    elif compliance:
+        truck_compliance = dict(compliance)
+    else:
+        truck_compliance = {"truck_id": truck_id, "peso_expiry_date": None, "spark_arrestor_status": None}
+    return {
+        "bay_id": row.bay_id,
+        "status": row.status,
+        "current_truck_id": truck_id,
+        "lpg_inventory_level": row.lpg_inventory_level,
+        "gate_entry_time": to_iso(row.gate_entry_time),
+        "wait_time_minutes": wait_time_minutes(row.gate_entry_time, now),
+        "truck_compliance": truck_compliance,
+    }
+
+
+def _incident_entry(row: SafetyIncident) -> Dict[str, Any]:
+    return {
+        "incident_id": row.incident_id,
+        "severity": row.severity,
+        "description": row.description,
+        "resolved_status": row.resolved_status,
+    }
+
+
+def _is_open_incident(incident: Dict[str, Any]) -> bool:
+    return str(incident.get("resolved_status", "")).strip().lower() not in CLOSED_INCIDENT_STATUSES
+
+
+def _overdue_wait_entry(bay: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    truck_id = bay["current_truck_id"]
+    wait_minutes = bay["wait_time_minutes"]
+    if not truck_id or wait_minutes is None or wait_minutes <= OVERDUE_WAIT_MINUTES:
+        return None
+    return {
+        "truck_id": truck_id,
+        "bay_id": bay["bay_id"],
+        "wait_time_minutes": wait_minutes,
+        "gate_entry_time": bay["gate_entry_time"],
+        "status": bay["status"],
+    }
+
+
+def _summarize_bays(
+    bays: Iterable[Any],
     *,
     horton_sphere_capacity_kl: float,
     fallback_discharge_rate_tph: float,
     inbound_truck_count: int,
-) -> Dict[str, Any]:
-    now = now_utc()
-    compliance_rows = session.execute(select(TruckCompliance)).scalars().all()
-    compliance_by_truck = {row.truck_id: row for row in compliance_rows}
-
-    ops_rows = session.execute(select(TerminalOps)).scalars().all()
-    bays: List[Dict[str, Any]] = []
+    measured_discharge_rate_tph: Optional[float] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Overdue waits and the inventory block; ``bays`` may be dicts or ``BayRecord`` views."""
     overdue_waits: List[Dict[str, Any]] = []
     lpg_levels: List[int] = []
 
-    for row in ops_rows:
-        truck_id = row.current_truck_id
-        compliance = compliance_by_truck.get(truck_id) if truck_id else None
-        wait_minutes = wait_time_minutes(row.gate_entry_time, now)
-        if row.lpg_inventory_level is not None:
-            lpg_levels.append(int(row.lpg_inventory_level))
-
-        bay = {
-            "bay_id": row.bay_id,
-            "status": row.status,
-            "current_truck_id": truck_id,
-            "lpg_inventory_level": row.lpg_inventory_level,
-            "gate_entry_time": to_iso(row.gate_entry_time),
-            "wait_time_minutes": wait_minutes,
-            "truck_compliance": {
-                "truck_id": compliance.truck_id if compliance else truck_id,
-                "peso_expiry_date": to_iso(compliance.peso_expiry_date) if compliance else None,
-                "spark_arrestor_status": compliance.spark_arrestor_status if compliance else None,
-            } if truck_id else None,
-        }
-        bays.append(bay)
-
-        if truck_id and wait_minutes is not None and wait_minutes > 45:
-            overdue_waits.append(
-                {
-                    "truck_id": truck_id,
-                    "bay_id": row.bay_id,
-                    "wait_time_minutes": wait_minutes,
-                    "gate_entry_time": to_iso(row.gate_entry_time),
-                    "status": row.status,
-                }
-            )
+    for bay in bays:
+        if bay["lpg_inventory_level"] is not None:
+            lpg_levels.append(int(bay["lpg_inventory_level"]))
+
+        overdue = _overdue_wait_entry(bay)
+        if overdue is not None:
+            overdue_waits.append(overdue)
 
     raw_lpg_level = max(lpg_levels) if lpg_levels else 0
     lpg_level_percent = normalize_lpg_percent(raw_lpg_level, horton_sphere_capacity_kl)
-    truck_discharge_rate_tph = compute_discharge_rate_tph(ops_rows, fallback_discharge_rate_tph)
-
-    incident_rows = session.execute(select(SafetyIncident)).scalars().all()
-    incidents = [
-        {
-            "incident_id": row.incident_id,
-            "severity": row.severity,
-            "description": row.description,
-            "resolved_status": row.resolved_status,
-        }
-        for row in incident_rows
-    ]
-    open_incidents = [
-        i
-        for i in incidents
-        if str(i.get("resolved_status", "")).strip().lower() not in {"resolved", "closed", "true", "1"}
-    ]
+    truck_discharge_rate_tph = _discharge_rate_from_statuses(
+        (bay["status"] for bay in bays), fallback_discharge_rate_tph, measured_discharge_rate_tph
+    )
+    inventory = {
+        "lpg_level_percent": round(lpg_level_percent, 2),
+        "raw_lpg_level": raw_lpg_level,
+        "horton_sphere_capacity_kl": horton_sphere_capacity_kl,
+        "inbound_truck_count": inbound_truck_count,
+        "truck_discharge_rate_tph": round(truck_discharge_rate_tph, 2),
+    }
+    return overdue_waits, inventory
+
+
+def _assemble_snapshot(
+    now: datetime,
+    bays: List[Dict[str, Any]],
+    incidents: List[Dict[str, Any]],
+    *,
+    horton_sphere_capacity_kl: float,
+    fallback_discharge_rate_tph: float,
+    inbound_truck_count: int,
+    measured_discharge_rate_tph: Optional[float] = None,
+) -> Dict[str, Any]:
+    overdue_waits, inventory = _summarize_bays(
+        bays,
+        horton_sphere_capacity_kl=horton_sphere_capacity_kl,
+        fallback_discharge_rate_tph=fallback_discharge_rate_tph,
+        inbound_truck_count=inbound_truck_count,
+        measured_discharge_rate_tph=measured_discharge_rate_tph,
+    )
+    open_incidents = [i for i in incidents if _is_open_incident(i)]
 
     return {
         "generated_at": now.isoformat(),
@@ -185,16 +317,381 @@ def get_terminal_snapshot(
         "safety_incidents": incidents,
         "open_safety_incidents": open_incidents,
         "overdue_waits": overdue_waits,
-        "inventory": {
-            "lpg_level_percent": round(lpg_level_percent, 2),
-            "raw_lpg_level": raw_lpg_level,
-            "horton_sphere_capacity_kl": horton_sphere_capacity_kl,
-            "inbound_truck_count": inbound_truck_count,
-            "truck_discharge_rate_tph": round(truck_discharge_rate_tph, 2),
-        },
+        "inventory": inventory,
     }
 
 
+def get_terminal_snapshot(
+    session: Session,
+    *,
+    horton_sphere_capacity_kl: float,
+    fallback_discharge_rate_tph: float,
+    inbound_truck_count: int,
+    measured_discharge_rate_tph: Optional[float] = None,
+    compliance_cache: Optional[ComplianceCache] = None,
+    compliance_view: str = "watchdog",
+) -> Dict[str, Any]:
+    now = now_utc()
+    if compliance_cache is None:
+        compliance_rows = _fetch_all(session, select(TruckCompliance), TruckCompliance.__tablename__)
+    ops_rows = _fetch_all(session, select(TerminalOps), TerminalOps.__tablename__)
+    incident_rows = _fetch_all(session, select(SafetyIncident), SafetyIncident.__tablename__)
+    if compliance_cache is not None:
+        # Only trucks standing in a bay are looked up, and mostly served from the cache.
+        truck_ids = [row.current_truck_id for row in ops_rows]
+        compliance_by_truck = _cached_compliance(session, compliance_cache, compliance_view, truck_ids)
+
+    with metrics.stage("assemble_snapshot"):
+        if compliance_cache is None:
+            compliance_by_truck = {row.truck_id: _truck_compliance_entry(row) for row in compliance_rows}
+        bays = [
+            _bay_entry(row, compliance_by_truck.get(row.current_truck_id) if row.current_truck_id else None, now)
+            for row in ops_rows
+        ]
+        incidents = [_incident_entry(row) for row in incident_rows]
+
+        return _assemble_snapshot(
+            now,
+            bays,
+            incidents,
+            horton_sphere_capacity_kl=horton_sphere_capacity_kl,
+            fallback_discharge_rate_tph=fallback_discharge_rate_tph,
+            inbound_truck_count=inbound_truck_count,
+            measured_discharge_rate_tph=measured_discharge_rate_tph,
+        )
+
+
+def get_compact_snapshot(
+    session: Session,
+    *,
+    horton_sphere_capacity_kl: float,
+    fallback_discharge_rate_tph: float,
+    inbound_truck_count: int,
+    measured_discharge_rate_tph: Optional[float] = None,
+    compliance_cache: Optional[ComplianceCache] = None,
+    compliance_view: str = "watchdog",
+) -> CompactSnapshot:
+    """Same content as ``get_terminal_snapshot`` in slotted records; ISO strings are built on read."""
+    now = now_utc()
+    if compliance_cache is None:
+        compliance_rows = _fetch_all(session, select(TruckCompliance), TruckCompliance.__tablename__)
+    ops_rows = _fetch_all(session, select(TerminalOps), TerminalOps.__tablename__)
+    incident_rows = _fetch_all(session, select(SafetyIncident), SafetyIncident.__tablename__)
+    if compliance_cache is not None:
+        cached = _cached_compliance(
+            session, compliance_cache, compliance_view, [row.current_truck_id for row in ops_rows]
+        )
+
+    with metrics.stage("assemble_snapshot"):
+        if compliance_cache is None:
+            compliance_by_truck = {
+                row.truck_id: ComplianceRecord(row.truck_id, row.peso_expiry_date, row.spark_arrestor_status)
+                for row in compliance_rows
+            }
+        else:
+            compliance_by_truck = {
+                truck_id: ComplianceRecord(
+                    truck_id,
+                    datetime.fromisoformat(entry["peso_expiry_date"]) if entry.get("peso_expiry_date") else None,
+                    entry.get("spark_arrestor_status"),
+                )
+                for truck_id, entry in cached.items()
+            }
+        bays: List[BayRecord] = []
+        for row in ops_rows:
+            truck_id = row.current_truck_id
+            compliance = None
+            if truck_id:
+                compliance = compliance_by_truck.get(truck_id) or ComplianceRecord(truck_id, None, None)
+            bays.append(
+                BayRecord(
+                    row.bay_id,
+                    row.status,
+                    truck_id,
+                    row.lpg_inventory_level,
+                    row.gate_entry_time,
+                    wait_time_minutes(row.gate_entry_time, now),
+                    compliance,
+                )
+            )
+        incidents = [
+            IncidentRecord(row.incident_id, row.severity, row.description, row.resolved_status)
+            for row in incident_rows
+        ]
+        overdue_waits, inventory = _summarize_bays(
+            bays,
+            horton_sphere_capacity_kl=horton_sphere_capacity_kl,
+            fallback_discharge_rate_tph=fallback_discharge_rate_tph,
+            inbound_truck_count=inbound_truck_count,
+            measured_discharge_rate_tph=measured_discharge_rate_tph,
+        )
+        return CompactSnapshot(now, bays, incidents, overdue_waits, inventory)
+
+
+def _open_incident_clause() -> Any:
+    # Same expression as the partial index in sql/watchdog_pushdown_indexes.sql; NULL counts as open.
+    # Rendered with literals: SQLite only matches a partial index against literal terms.
+    status = func.lower(func.trim(func.coalesce(SafetyIncident.resolved_status, literal_column("''"))))
+    closed = bindparam("closed_statuses", list(CLOSED_INCIDENT_STATUSES), expanding=True, literal_execute=True)
+    return status.not_in(closed)
+
+
+def _waiting_since_stmt(now: datetime, minutes: int) -> Any:
+    """Occupied bays whose ``wait_time_minutes`` is at least ``minutes`` at ``now``."""
+    return select(TerminalOps).where(
+        TerminalOps.current_truck_id.is_not(None),
+        TerminalOps.gate_entry_time <= now - timedelta(minutes=minutes),
+    )
+
+
+def get_pushdown_snapshot(
+    session: Session,
+    *,
+    horton_sphere_capacity_kl: float,
+    fallback_discharge_rate_tph: float,
+    inbound_truck_count: int,
+    measured_discharge_rate_tph: Optional[float] = None,
+    compliance_cache: Optional[ComplianceCache] = None,
+    compliance_view: str = "watchdog",
+) -> Dict[str, Any]:
+    """
+    ``get_terminal_snapshot`` with the overdue-wait and open-incident filters run in SQL.
+
+    ``safety_incidents`` holds open incidents only, so cycle time follows the number of open
+    incidents rather than the size of the incident history; new incidents are detected through an
+    ``IncidentWatermark`` instead (``TerminalWatcher`` adds one). Pair with
+    ``sql/watchdog_pushdown_indexes.sql``.
+    """
+    now = now_utc()
+    ops_rows = _fetch_all(session, select(TerminalOps), TerminalOps.__tablename__)
+    overdue_rows = _fetch_all(
+        session, _waiting_since_stmt(now, OVERDUE_WAIT_MINUTES + 1), TerminalOps.__tablename__
+    )
+    incident_rows = _fetch_all(
+        session, select(SafetyIncident).where(_open_incident_clause()), SafetyIncident.__tablename__
+    )
+    truck_ids = [row.current_truck_id for row in ops_rows]
+    if compliance_cache is not None:
+        compliance_by_truck = _cached_compliance(session, compliance_cache, compliance_view, truck_ids)
+    else:
+        stmt = select(TruckCompliance).where(TruckCompliance.truck_id.in_([t for t in truck_ids if t]))
+        compliance_rows = _fetch_all(session, stmt, TruckCompliance.__tablename__)
+        compliance_by_truck = {row.truck_id: _truck_compliance_entry(row) for row in compliance_rows}
+
+    with metrics.stage("assemble_snapshot"):
+        bays = [
+            _bay_entry(row, compliance_by_truck.get(row.current_truck_id) if row.current_truck_id else None, now)
+            for row in ops_rows
+        ]
+        _, inventory = _summarize_bays(
+            bays,
+            horton_sphere_capacity_kl=horton_sphere_capacity_kl,
+            fallback_discharge_rate_tph=fallback_discharge_rate_tph,
+            inbound_truck_count=inbound_truck_count,
+            measured_discharge_rate_tph=measured_discharge_rate_tph,
+        )
+        overdue_waits = []
+        for row in overdue_rows:
+            overdue = _overdue_wait_entry(_bay_entry(row, None, now))
+            if overdue is not None:
+                overdue_waits.append(overdue)
+        incidents = [_incident_entry(row) for row in incident_rows]
+
+        return {
+            "generated_at": now.isoformat(),
+            "terminal_ops": bays,
+            "safety_incidents": incidents,
+            "open_safety_incidents": incidents,
+            "overdue_waits": overdue_waits,
+            "inventory": inventory,
+        }
+
+
+def _cached_compliance(
+    session: Session,
+    cache: ComplianceCache,
+    view: str,
+    truck_ids: Iterable[Optional[str]],
+) -> Dict[str, Dict[str, Any]]:
+    def load(missing: List[str]) -> Dict[str, Dict[str, Any]]:
+        stmt = select(TruckCompliance).where(TruckCompliance.truck_id.in_(missing))
+        rows = _fetch_all(session, stmt, TruckCompliance.__tablename__)
+        return {row.truck_id: _truck_compliance_entry(row) for row in rows}
+
+    with metrics.stage("compliance_cache"):
+        return cache.get_many(view, truck_ids, load)
+
+
+def _fetch_all(session: Session, stmt: Any, table: str) -> List[Any]:
+    with metrics.stage(f"select_{table}"):
+        rows = session.execute(stmt).scalars().all()
+    metrics.ROWS_FETCHED.inc(len(rows), table=table)
+    return rows
+
+
+SNAPSHOT_BUILDERS: Dict[str, Callable[..., Any]] = {
+    "full": get_terminal_snapshot,
+    "compact": get_compact_snapshot,
+    "pushdown": get_pushdown_snapshot,
+}
+
+
+@dataclass
+class SnapshotDelta:
+    full_refresh: bool = False
+    changed_bay_ids: set[str] = field(default_factory=set)
+    changed_incident_ids: set[str] = field(default_factory=set)
+    changed_truck_ids: set[str] = field(default_factory=set)
+
+
+@dataclass
+class IncrementalSnapshot:
+    """
+    In-memory terminal snapshot patched from rows changed since a per-table watermark.
+
+    Relies on an ``updated_at`` column maintained on every write to ``terminal_ops``,
+    ``safety_incidents`` and ``truck_compliance`` (``sql/watchdog_incremental.sql``); a table whose
+    stamps are all NULL is refused. Rows are re-read from ``updated_at >= watermark - overlap_seconds``
+    so transactions that commit after a later-stamped row was already read are not lost; re-read rows
+    that did not actually change are not reported. A full reload every ``full_refresh_cycles`` picks
+    up deletions and rows without ``updated_at``.
+    """
+
+    horton_sphere_capacity_kl: float
+    fallback_discharge_rate_tph: float
+    inbound_truck_count: int
+    full_refresh_cycles: int = 60
+    overlap_seconds: float = 60.0
+    measured_discharge_rate_tph: Optional[float] = None
+    bays: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    incidents: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    compliance_by_truck: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    gate_entry_times: Dict[str, Optional[datetime]] = field(default_factory=dict)
+    watermarks: Dict[str, Optional[datetime]] = field(default_factory=dict)
+    cycles_since_full_refresh: int = 0
+
+    def refresh(self, session: Session) -> tuple[Dict[str, Any], SnapshotDelta]:
+        now = now_utc()
+        for bay_id, bay in self.bays.items():
+            bay["wait_time_minutes"] = wait_time_minutes(self.gate_entry_times.get(bay_id), now)
+
+        if not self.watermarks or self.cycles_since_full_refresh >= self.full_refresh_cycles:
+            delta = self._reload(session, now)
+            self.cycles_since_full_refresh = 0
+        else:
+            delta = self._apply_changes(session, now)
+            self.cycles_since_full_refresh += 1
+
+        with metrics.stage("assemble_snapshot"):
+            snapshot = _assemble_snapshot(
+                now,
+                list(self.bays.values()),
+                list(self.incidents.values()),
+                horton_sphere_capacity_kl=self.horton_sphere_capacity_kl,
+                fallback_discharge_rate_tph=self.fallback_discharge_rate_tph,
+                inbound_truck_count=self.inbound_truck_count,
+                measured_discharge_rate_tph=self.measured_discharge_rate_tph,
+            )
+        return snapshot, delta
+
+    def _changed_rows(self, session: Session, model: Any, full: bool) -> List[Any]:
+        table = model.__tablename__
+        stmt = select(model).options(undefer(model.updated_at))
+        watermark = self.watermarks.get(table)
+        if not full and watermark is not None:
+            stmt = stmt.where(model.updated_at >= watermark - timedelta(seconds=self.overlap_seconds))
+        rows = _fetch_all(session, stmt, table)
+        stamps = [row.updated_at for row in rows if row.updated_at is not None]
+        if full and len(stamps) < len(rows):
+            # Unstamped rows never match the watermark, so without a maintained column every change
+            # would wait for the next full reload.
+            if not stamps:
+                raise RuntimeError(
+                    f"{table}.updated_at is NULL on every row; incremental snapshots need it maintained "
+                    "(install sql/watchdog_incremental.sql) or WATCHDOG_SNAPSHOT_MODE=full."
+                )
+            LOGGER.warning(
+                "%s of %s %s row(s) have no updated_at; their changes are only seen on full reloads.",
+                len(rows) - len(stamps),
+                len(rows),
+                table,
+            )
+        if stamps:
+            self.watermarks[table] = max([*stamps, watermark] if watermark else stamps)
+        else:
+            self.watermarks.setdefault(table, watermark)
+        return rows
+
+    def _reload(self, session: Session, now: datetime) -> SnapshotDelta:
+        delta = SnapshotDelta(full_refresh=True)
+
+        compliance = {
+            row.truck_id: _truck_compliance_entry(row)
+            for row in self._changed_rows(session, TruckCompliance, True)
+        }
+        delta.changed_truck_ids = {
+            truck_id
+            for truck_id in compliance.keys() | self.compliance_by_truck.keys()
+            if compliance.get(truck_id) != self.compliance_by_truck.get(truck_id)
+        }
+        self.compliance_by_truck = compliance
+
+        bays: Dict[str, Dict[str, Any]] = {}
+        gate_entry_times: Dict[str, Optional[datetime]] = {}
+        for row in self._changed_rows(session, TerminalOps, True):
+            truck_id = row.current_truck_id
+            bays[row.bay_id] = _bay_entry(row, compliance.get(truck_id) if truck_id else None, now)
+            gate_entry_times[row.bay_id] = row.gate_entry_time
+        delta.changed_bay_ids = {
+            bay_id for bay_id in bays.keys() | self.bays.keys() if bays.get(bay_id) != self.bays.get(bay_id)
+        }
+        self.bays = bays
+        self.gate_entry_times = gate_entry_times
+
+        incidents = {
+            row.incident_id: _incident_entry(row) for row in self._changed_rows(session, SafetyIncident, True)
+        }
+        delta.changed_incident_ids = {
+            incident_id
+            for incident_id in incidents.keys() | self.incidents.keys()
+            if incidents.get(incident_id) != self.incidents.get(incident_id)
+        }
+        self.incidents = incidents
+        return delta
+
+    def _apply_changes(self, session: Session, now: datetime) -> SnapshotDelta:
+        delta = SnapshotDelta()
+
+        for row in self._changed_rows(session, TruckCompliance, False):
+            entry = _truck_compliance_entry(row)
+            if self.compliance_by_truck.get(row.truck_id) != entry:
+                self.compliance_by_truck[row.truck_id] = entry
+                delta.changed_truck_ids.add(row.truck_id)
+
+        if delta.changed_truck_ids:
+            for bay_id, bay in self.bays.items():
+                truck_id = bay["current_truck_id"]
+                if truck_id in delta.changed_truck_ids:
+                    bay["truck_compliance"] = dict(self.compliance_by_truck[truck_id])
+                    delta.changed_bay_ids.add(bay_id)
+
+        for row in self._changed_rows(session, TerminalOps, False):
+            truck_id = row.current_truck_id
+            entry = _bay_entry(row, self.compliance_by_truck.get(truck_id) if truck_id else None, now)
+            if self.bays.get(row.bay_id) != entry:
+                self.bays[row.bay_id] = entry
+                self.gate_entry_times[row.bay_id] = row.gate_entry_time
+                delta.changed_bay_ids.add(row.bay_id)
+
+        for row in self._changed_rows(session, SafetyIncident, False):
+            entry = _incident_entry(row)
+            if self.incidents.get(row.incident_id) != entry:
+                self.incidents[row.incident_id] = entry
+                delta.changed_incident_ids.add(row.incident_id)
+
+        return delta
+
+
 def predict_bottleneck(
     snapshot: Dict[str, Any],
     *,
@@ -255,34 +752,158 @@ def predict_bottleneck(
     }
 
 
+def sphere_levels_percent(
+    snapshot: Dict[str, Any],
+    sphere_by_bay: Optional[Dict[str, str]] = None,
+) -> Dict[str, float]:
+    """Per-sphere level from bay readings; unmapped bays are tracked as their own sphere."""
+    capacity_kl = float(snapshot.get("inventory", {}).get("horton_sphere_capacity_kl") or 10000.0)
+    levels: Dict[str, float] = {}
+    for bay in snapshot.get("terminal_ops", []):
+        if bay.get("lpg_inventory_level") is None:
+            continue
+        sphere_id = (sphere_by_bay or {}).get(bay["bay_id"], bay["bay_id"])
+        percent = normalize_lpg_percent(int(bay["lpg_inventory_level"]), capacity_kl)
+        levels[sphere_id] = max(percent, levels.get(sphere_id, 0.0))
+    return levels
+
+
+def predict_sphere_bottlenecks(forecast: "SphereForecast") -> List[Dict[str, Any]]:
+    """
+    Per-sphere counterpart of ``predict_bottleneck`` driven by measured level trends.
+
+    A sphere alerts when it is above 85% and its fitted level is still rising; priority uses the
+    same 2h/6h bands. Rates come from the sphere's own history, not the inbound truck estimate.
+    """
+    alerts: List[Dict[str, Any]] = []
+    for index in range(len(forecast.sphere_ids)):
+        if not forecast.ready[index]:
+            continue
+        lpg_percent = float(forecast.level_percent[index])
+        net_rate = float(forecast.net_rate_percent_per_hour[index])
+        if lpg_percent <= 85.0 or net_rate <= 0:
+            continue
+
+        hours_to_tank_top = float(forecast.hours_to_tank_top[index])
+        if hours_to_tank_top <= 2:
+            priority = "Critical"
+        elif hours_to_tank_top <= 6:
+            priority = "Warning"
+        else:
+            priority = "Info"
+
+        data = forecast.sphere(index)
+        sphere_id = data["sphere_id"]
+        alerts.append(
+            {
+                "event_type": "inventory_forecast",
+                "alert_id": f"inventory-tank-top-forecast-{sphere_id}",
+                "priority": priority,
+                "headline": f"Inventory Alert: Sphere {sphere_id} {max(hours_to_tank_top, 0.0):.1f}h to Tank Top",
+                "insight": (
+                    f"Sphere {sphere_id} at {lpg_percent:.1f}% and rising {net_rate:.2f}%/h; measured discharge is "
+                    f"{data['discharge_rate_kl_per_hour']:.1f} kl/h. "
+                    "Increase decanting throughput to prevent gantry choke."
+                ),
+                "action": {
+                    "label": "Increase Discharge Rate",
+                    "url": "/terminal/controls/pumps",
+                },
+                "data": data,
+            }
+        )
+    return alerts
+
+
 @dataclass
 class DedupStore:
+    """
+    Alert suppression window, in Redis when available and in process otherwise.
+
+    The in-process map is paired with a min-heap of ``(sent_at, alert_id)`` so expiry pops only
+    the entries that are due instead of scanning every key. Heap entries are invalidated lazily:
+    one whose timestamp no longer matches ``local`` was superseded or evicted and is skipped.
+    ``max_entries`` bounds the map with least-recently-used eviction.
+
+    An id counts as sent once it is claimed; ``forget`` gives it back when the alert was not
+    actually delivered, so the next cycle can raise it again.
+    """
+
     ttl_seconds: int
-    local: Dict[str, datetime] = field(default_factory=dict)
+    local: "OrderedDict[str, datetime]" = field(default_factory=OrderedDict)
     redis_client: Any = None
     redis_prefix: str = "eipl:watchdog:alert:"
+    max_entries: Optional[int] = None
+    _expiry_heap: List[Tuple[datetime, str]] = field(default_factory=list, repr=False)
+    # forget() runs on webhook worker threads while cycles claim ids.
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
     def should_send(self, alert_id: str, now: datetime) -> bool:
-        self._cleanup_local(now)
-
         if self.redis_client is not None:
             key = f"{self.redis_prefix}{alert_id}"
             set_ok = self.redis_client.set(name=key, value=now.isoformat(), nx=True, ex=self.ttl_seconds)
             return bool(set_ok)
 
+        with self._lock:
+            self._cleanup_local(now)
+            return self._should_send_local(alert_id, now)
+
+    def forget(self, alert_id: str) -> None:
+        """Release a claimed id whose alert was dropped or could not be delivered."""
+        if self.redis_client is not None:
+            try:
+                self.redis_client.delete(f"{self.redis_prefix}{alert_id}")
+            except Exception:
+                LOGGER.exception("Could not release dedup key for %s; it stays suppressed until expiry.", alert_id)
+            return
+        with self._lock:
+            # The stale heap entry is skipped lazily, as after an eviction.
+            self.local.pop(alert_id, None)
+
+    def should_send_many(self, alert_ids: Iterable[str], now: datetime) -> List[str]:
+        """Resolve a whole cycle's candidates at once; returns the ids to send, in input order."""
+        alert_ids = list(alert_ids)
+        if not alert_ids:
+            return []
+
+        if self.redis_client is None:
+            with self._lock:
+                self._cleanup_local(now)
+                return [alert_id for alert_id in alert_ids if self._should_send_local(alert_id, now)]
+
+        # One round trip: each SET NX is independent, so no MULTI/EXEC is needed.
+        pipe = self.redis_client.pipeline(transaction=False)
+        stamp = now.isoformat()
+        for alert_id in alert_ids:
+            pipe.set(name=f"{self.redis_prefix}{alert_id}", value=stamp, nx=True, ex=self.ttl_seconds)
+        results = pipe.execute()
+        return [alert_id for alert_id, set_ok in zip(alert_ids, results) if set_ok]
+
+    def _should_send_local(self, alert_id: str, now: datetime) -> bool:
         existing = self.local.get(alert_id)
         if existing and (now - existing).total_seconds() < self.ttl_seconds:
+            self.local.move_to_end(alert_id)
             return False
         self.local[alert_id] = now
+        self.local.move_to_end(alert_id)
+        heapq.heappush(self._expiry_heap, (now, alert_id))
+
+        if self.max_entries is not None:
+            while len(self.local) > self.max_entries:
+                self.local.popitem(last=False)
+        if len(self._expiry_heap) > 2 * len(self.local) + 64:
+            # Too many stale entries after evictions or re-sends; rebuild from the live map.
+            self._expiry_heap = [(ts, key) for key, ts in self.local.items()]
+            heapq.heapify(self._expiry_heap)
         return True
 
     def _cleanup_local(self, now: datetime) -> None:
-        expired = [
-            key for key, ts in self.local.items()
-            if (now - ts).total_seconds() >= self.ttl_seconds
-        ]
-        for key in expired:
-            self.local.pop(key, None)
+        cutoff = now - timedelta(seconds=self.ttl_seconds)
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= cutoff:
+            ts, key = heapq.heappop(heap)
+            if self.local.get(key) == ts:
+                del self.local[key]
 
 
 @dataclass
@@ -291,24 +912,370 @@ class WatchdogState:
     dedup: DedupStore
 
 
-def create_dedup_store(ttl_seconds: int, redis_url: Optional[str]) -> DedupStore:
+class IncidentWatermarkStore:
+    """Persists ``IncidentWatermark`` state as JSON, in a Redis key when given a client and in a file otherwise."""
+
+    def __init__(
+        self,
+        *,
+        redis_client: Any = None,
+        redis_key: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        if redis_client is not None and not redis_key:
+            raise ValueError("redis_key is required with redis_client.")
+        if redis_client is None and not path:
+            raise ValueError("Either redis_client or path is required.")
+        self.redis_client = redis_client
+        self.redis_key = redis_key
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if self.redis_client is not None:
+            raw = self.redis_client.get(self.redis_key)
+        else:
+            try:
+                with open(self.path, "r", encoding="utf-8") as handle:
+                    raw = handle.read()
+            except FileNotFoundError:
+                return None
+        return json.loads(raw) if raw else None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        raw = json.dumps(state, separators=(",", ":"))
+        if self.redis_client is not None:
+            self.redis_client.set(self.redis_key, raw)
+            return
+        # Write-then-rename so a crash mid-write leaves the previous state intact.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(raw)
+        os.replace(tmp_path, self.path)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+@dataclass
+class IncidentWatermark:
+    """
+    New-incident detection from ``safety_incidents.created_at``.
+
+    Each poll reads only rows created at or after ``watermark - overlap_seconds``; the overlap picks
+    up transactions that commit after a later-stamped incident was already seen. Every id read
+    inside that window is kept in ``recent`` so re-read rows are not reported twice. Should more
+    than ``window_size`` ids fall inside it, the oldest are dropped and ``floor`` is raised to the
+    newest dropped ``created_at``; polls then skip rows stamped at or before ``floor``, so a late
+    commit that old is missed rather than reported twice. Work and memory follow the rate of new
+    incidents rather than the table's history.
+
+    State is saved through ``store`` whenever a poll sees new rows, so a restart resumes from the
+    watermark: incidents created while the watchdog was down are reported, earlier ones are not.
+    Without stored state the first poll starts at the newest incident and reports nothing. Rows
+    with a NULL ``created_at`` are never reported.
+    """
+
+    store: Optional[IncidentWatermarkStore] = None
+    overlap_seconds: float = 60.0
+    window_size: int = 1000
+    watermark: Optional[datetime] = None
+    floor: Optional[datetime] = None
+    recent: "OrderedDict[str, datetime]" = field(default_factory=OrderedDict)
+    loaded: bool = False
+
+    def load(self, session: Session) -> None:
+        """Resume from the stored state, or baseline at the newest incident when there is none."""
+        state = None
+        if self.store is not None:
+            try:
+                state = self.store.load()
+            except Exception:
+                LOGGER.exception("Could not read the incident watermark; re-baselining.")
+        self.recent.clear()
+        self.floor = None
+        if state:
+            self.watermark = _as_utc(datetime.fromisoformat(state["watermark"]))
+            if state.get("floor"):
+                self.floor = _as_utc(datetime.fromisoformat(state["floor"]))
+            for incident_id, created_at in state.get("recent", {}).items():
+                self.recent[incident_id] = _as_utc(datetime.fromisoformat(created_at))
+            LOGGER.info("Incident watermark resumed at %s (%s recent id(s))", self.watermark, len(self.recent))
+        else:
+            latest = session.execute(select(func.max(SafetyIncident.created_at))).scalar()
+            self.watermark = _as_utc(latest) if latest is not None else now_utc()
+            self._remember(self._read_window(session))
+            self.save()
+        self.loaded = True
+
+    def forget(self) -> None:
+        """Drop in-memory state; the next poll reloads it from the store (e.g. after a lease handoff)."""
+        self.loaded = False
+        self.watermark = None
+        self.floor = None
+        self.recent.clear()
+
+    def poll(self, session: Session) -> List[Dict[str, Any]]:
+        """Incidents created since the last poll, oldest first."""
+        if not self.loaded:
+            self.load(session)
+        rows = self._read_window(session)
+        new_rows = [row for row in rows if row.incident_id not in self.recent]
+        self._remember(rows)
+        if new_rows:
+            self.save()
+        return [_incident_entry(row) for row in new_rows]
+
+    def save(self) -> None:
+        if self.store is None or self.watermark is None:
+            return
+        state = {
+            "watermark": self.watermark.isoformat(),
+            "recent": {incident_id: created_at.isoformat() for incident_id, created_at in self.recent.items()},
+        }
+        if self.floor is not None:
+            state["floor"] = self.floor.isoformat()
+        try:
+            self.store.save(state)
+        except Exception:
+            LOGGER.exception("Could not persist the incident watermark.")
+
+    def _read_window(self, session: Session) -> List[Any]:
+        assert self.watermark is not None
+        since = self.watermark - timedelta(seconds=self.overlap_seconds)
+        stmt = (
+            select(SafetyIncident)
+            .options(undefer(SafetyIncident.created_at))
+            .where(SafetyIncident.created_at >= since)
+            .order_by(SafetyIncident.created_at, SafetyIncident.incident_id)
+        )
+        if self.floor is not None:
+            stmt = stmt.where(SafetyIncident.created_at > self.floor)
+        return _fetch_all(session, stmt, SafetyIncident.__tablename__)
+
+    def _remember(self, rows: List[Any]) -> None:
+        for row in rows:
+            created_at = _as_utc(row.created_at)
+            self.recent[row.incident_id] = created_at
+            if self.watermark is None or created_at > self.watermark:
+                self.watermark = created_at
+        if self.watermark is None:
+            return
+        # Ids older than the overlap can no longer be re-read, so they need not be remembered.
+        cutoff = self.watermark - timedelta(seconds=self.overlap_seconds)
+        if any(created_at < cutoff for created_at in self.recent.values()):
+            self.recent = OrderedDict((i, c) for i, c in self.recent.items() if c >= cutoff)
+        if self.floor is not None and self.floor < cutoff:
+            self.floor = None
+        if len(self.recent) > self.window_size:
+            # Ids inside the overlap would be re-read, so instead of dropping them the window
+            # stops reading at or below the newest dropped timestamp (ties go with it).
+            stamps = sorted(self.recent.values())
+            self.floor = stamps[len(stamps) - self.window_size - 1]
+            self.recent = OrderedDict((i, c) for i, c in self.recent.items() if c > self.floor)
+            LOGGER.warning(
+                "More than %s incident id(s) inside the %ss overlap; skipping rows created at or before %s.",
+                self.window_size,
+                self.overlap_seconds,
+                self.floor,
+            )
+
+
+def create_incident_watermark_from_env(terminal_id: str, redis_client: Any = None) -> Optional[IncidentWatermark]:
+    """
+    Watermark tracker when ``WATCHDOG_INCIDENT_TRACKING=watermark``, else None (full id-set tracking,
+    or an unpersisted watermark with pushdown snapshots).
+
+    State goes to Redis when a client is given, otherwise to ``WATCHDOG_STATE_DIR`` (default: cwd).
+    """
+    if os.getenv("WATCHDOG_INCIDENT_TRACKING", "ids").strip().lower() != "watermark":
+        return None
+    if redis_client is not None:
+        store = IncidentWatermarkStore(
+            redis_client=redis_client,
+            redis_key=f"eipl:watchdog:incident-watermark:{terminal_id}",
+        )
+    else:
+        state_dir = os.getenv("WATCHDOG_STATE_DIR", "").strip() or "."
+        store = IncidentWatermarkStore(path=os.path.join(state_dir, f"incident-watermark-{terminal_id}.json"))
+    return IncidentWatermark(
+        store=store,
+        overlap_seconds=float(os.getenv("WATCHDOG_INCIDENT_OVERLAP_SECONDS", "60")),
+        window_size=int(os.getenv("WATCHDOG_INCIDENT_WINDOW", "1000")),
+    )
+
+
+def create_dedup_store(
+    ttl_seconds: int,
+    redis_url: Optional[str],
+    max_local_entries: Optional[int] = None,
+) -> DedupStore:
     if redis_url and redis is not None:
         try:
             client = redis.Redis.from_url(redis_url, decode_responses=True)
             client.ping()
             LOGGER.info("Alert deduplication is using Redis.")
-            return DedupStore(ttl_seconds=ttl_seconds, redis_client=client)
+            return DedupStore(ttl_seconds=ttl_seconds, redis_client=client, max_entries=max_local_entries)
         except Exception:
             LOGGER.exception("Redis unavailable; using in-process deduplication.")
-    return DedupStore(ttl_seconds=ttl_seconds)
+    return DedupStore(ttl_seconds=ttl_seconds, max_entries=max_local_entries)
 
 
-def send_webhook(endpoint: str, payload: Dict[str, Any], timeout_seconds: int = 8) -> None:
+def send_webhook(
+    endpoint: str,
+    payload: Any,
+    timeout_seconds: int = 8,
+    session: Optional[requests.Session] = None,
+) -> None:
     headers = {"Content-Type": "application/json"}
-    response = requests.post(endpoint, data=json.dumps(payload), headers=headers, timeout=timeout_seconds)
+    poster = session.post if session is not None else requests.post
+    response = poster(endpoint, data=compact_snapshot.dumps(payload), headers=headers, timeout=timeout_seconds)
     response.raise_for_status()
 
 
+def create_webhook_session(pool_size: int, max_retries: int = 2) -> requests.Session:
+    # The Buddy webhook does not deduplicate, so a POST is retried only when it cannot have been
+    # processed: the connection failed, or the receiver answered 429/503 (honouring Retry-After).
+    # Read timeouts and 502/504 may follow a delivered alert and are not retried.
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        other=0,
+        status=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 503),
+        allowed_methods=None,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size), max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_STOP = object()
+_Queued = Tuple[Dict[str, Any], Optional[Callable[[Dict[str, Any]], None]]]
+
+
+class WebhookDispatcher:
+    """
+    Delivers Buddy payloads off the detection path.
+
+    ``submit`` never blocks: payloads go onto a bounded queue drained by worker threads that share
+    one keep-alive connection pool. With ``batch_size > 1`` a worker groups whatever is queued
+    (waiting at most ``batch_wait_seconds``) into a single ``alert_batch`` request. A payload that
+    is dropped or whose delivery fails is passed to its ``on_undelivered`` callback.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        *,
+        workers: int = 2,
+        max_queue: int = 1000,
+        batch_size: int = 1,
+        batch_wait_seconds: float = 0.25,
+        timeout_seconds: int = 8,
+    ) -> None:
+        self.endpoint = endpoint
+        self.batch_size = max(1, batch_size)
+        self.batch_wait_seconds = batch_wait_seconds
+        self.timeout_seconds = timeout_seconds
+        self.session = create_webhook_session(pool_size=workers)
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"watchdog-webhook-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self, payload: Dict[str, Any], on_undelivered: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> bool:
+        try:
+            self._queue.put_nowait((payload, on_undelivered))
+            metrics.ALERTS.inc(outcome="queued")
+            metrics.WEBHOOK_QUEUE_DEPTH.set(self._queue.qsize())
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            metrics.ALERTS.inc(outcome="dropped")
+            LOGGER.error("Webhook queue full; dropped alert %s", payload.get("alert_id"))
+            if on_undelivered is not None:
+                on_undelivered(payload)
+            return False
+
+    def close(self, timeout_seconds: float = 10.0) -> None:
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        deadline = time.monotonic() + timeout_seconds
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self.session.close()
+
+    def _next_batch(self) -> tuple[List[_Queued], bool]:
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.batch_wait_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        metrics.WEBHOOK_QUEUE_DEPTH.set(self._queue.qsize())
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._deliver(batch)
+            if stopping:
+                return
+
+    def _deliver(self, batch: List[_Queued]) -> None:
+        payloads = [payload for payload, _ in batch]
+        if len(payloads) == 1:
+            body: Any = payloads[0]
+        else:
+            body = {"event_type": "alert_batch", "count": len(payloads), "alerts": payloads}
+        alert_ids = [payload.get("alert_id") for payload in payloads]
+        try:
+            with metrics.WEBHOOK_SECONDS.time():
+                send_webhook(self.endpoint, body, self.timeout_seconds, session=self.session)
+        except Exception:
+            with self._lock:
+                self.failed += len(batch)
+            metrics.ALERTS.inc(len(batch), outcome="failed")
+            LOGGER.exception("Webhook delivery failed for %s", alert_ids)
+            for payload, on_undelivered in batch:
+                if on_undelivered is not None:
+                    on_undelivered(payload)
+            return
+        with self._lock:
+            self.delivered += len(batch)
+        metrics.ALERTS.inc(len(batch), outcome="delivered")
+        LOGGER.warning("Alert sent: %s", ", ".join(str(a) for a in alert_ids))
+
+
 def build_buddy_payload(
     *,
     event_type: str,
@@ -318,8 +1285,9 @@ def build_buddy_payload(
     insight: str,
     action: Dict[str, str],
     data: Any,
+    terminal_id: Optional[str] = None,
 ) -> Dict[str, Any]:
-    return {
+    payload = {
         "event_type": event_type,
         "alert_id": alert_id,
         "priority": priority,
@@ -329,6 +1297,9 @@ def build_buddy_payload(
         "data": data,
         "triggered_at": now_utc().isoformat(),
     }
+    if terminal_id is not None:
+        payload["terminal_id"] = terminal_id
+    return payload
 
 
 def incident_priority(incident: Dict[str, Any]) -> str:
@@ -348,120 +1319,980 @@ def wait_priority(wait_minutes: int) -> str:
     return "Info"
 
 
-def monitor_and_trigger(
-    db_url: str,
-    chatbot_webhook_url: str,
-    poll_seconds: int = 60,
-) -> None:
-    engine = create_engine(db_url, future=True)
-    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+@dataclass
+class TerminalConfig:
+    terminal_id: str
+    db_url: str
+    horton_sphere_capacity_kl: float = 10000.0
+    fallback_discharge_rate_tph: float = 6.0
+    discharge_threshold_tph: float = 12.0
+    avg_inbound_truck_rate_tph: float = 1.25
+    inbound_truck_count: int = 10
+    lpg_density_t_per_kl: float = DEFAULT_LPG_DENSITY_T_PER_KL
+    sphere_by_bay: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls, terminal_id: str, db_url: str, **overrides: Any) -> "TerminalConfig":
+        config = cls(
+            terminal_id=terminal_id,
+            db_url=db_url,
+            horton_sphere_capacity_kl=float(os.getenv("HORTON_SPHERE_CAPACITY_KL", "10000")),
+            fallback_discharge_rate_tph=float(os.getenv("FALLBACK_TRUCK_DISCHARGE_RATE_TPH", "6")),
+            discharge_threshold_tph=float(os.getenv("TRUCK_DISCHARGE_RATE_THRESHOLD_TPH", "12")),
+            avg_inbound_truck_rate_tph=float(os.getenv("AVG_INBOUND_TRUCK_RATE_TPH", "1.25")),
+            inbound_truck_count=int(os.getenv("INBOUND_TRUCK_COUNT", "10")),
+            lpg_density_t_per_kl=float(os.getenv("LPG_DENSITY_T_PER_KL", str(DEFAULT_LPG_DENSITY_T_PER_KL))),
+        )
+        for key, value in overrides.items():
+            if not hasattr(config, key):
+                raise ValueError(f"Unknown terminal config field: {key}")
+            setattr(config, key, type(getattr(config, key))(value))
+        return config
+
+
+def load_terminal_configs(path: str) -> List[TerminalConfig]:
+    """Read a JSON list of terminals; omitted thresholds fall back to the single-terminal env vars."""
+    with open(path, "r", encoding="utf-8") as handle:
+        entries = json.load(handle)
+    configs = []
+    for entry in entries:
+        entry = dict(entry)
+        terminal_id = str(entry.pop("terminal_id")).strip()
+        db_url = str(entry.pop("db_url")).strip()
+        configs.append(TerminalConfig.from_env(terminal_id, db_url, **entry))
+    ids = [config.terminal_id for config in configs]
+    if len(set(ids)) != len(ids):
+        raise ValueError("terminal_id values must be unique.")
+    return configs
+
+
+class TerminalWatcher:
+    """
+    One terminal's engine, snapshot state and alert rules.
+
+    With ``namespace_alerts`` every alert id is prefixed with the terminal id so several terminals
+    can share one dedup namespace and one webhook sink without collisions.
+    """
+
+    def __init__(
+        self,
+        config: TerminalConfig,
+        *,
+        dedup: DedupStore,
+        dispatcher: WebhookDispatcher,
+        snapshot_mode: str = "full",
+        full_refresh_cycles: int = 60,
+        namespace_alerts: bool = False,
+        forecast_mode: str = "simple",
+        compliance_cache: Optional[ComplianceCache] = None,
+        incident_watermark: Optional[IncidentWatermark] = None,
+    ) -> None:
+        self.config = config
+        self.dedup = dedup
+        self.dispatcher = dispatcher
+        self.snapshot_mode = snapshot_mode
+        self.full_refresh_cycles = full_refresh_cycles
+        self.namespace_alerts = namespace_alerts
+        self.engine = create_engine(config.db_url, future=True)
+        self.session_factory = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
+        self.incremental: Optional[IncrementalSnapshot] = None
+        self.state: Optional[WatchdogState] = None
+        self.forecaster = None
+        if forecast_mode == "sphere":
+            if SphereForecaster is None:
+                LOGGER.warning("numpy unavailable; using the single-level tank-top forecast.")
+            else:
+                self.forecaster = SphereForecaster(
+                    config.horton_sphere_capacity_kl,
+                    window=int(os.getenv("WATCHDOG_FORECAST_WINDOW", "60")),
+                )
+        self.measured_discharge_rate_tph: Optional[float] = None
+        self.compliance_cache = compliance_cache
+        # Terminals have separate databases, so each keeps its own view of a truck id.
+        self.compliance_view = f"watchdog:{config.terminal_id}"
+        # When set, new incidents come from the created_at watermark and known_incident_ids stays empty.
+        # Pushdown snapshots hold open incidents only, so diffing their ids would miss incidents opened
+        # and closed between polls and re-alert reopened ones; that mode always uses a watermark.
+        if incident_watermark is None and snapshot_mode == "pushdown":
+            incident_watermark = IncidentWatermark()
+        self.incident_watermark = incident_watermark
+
+    def alert_id(self, raw_alert_id: str) -> str:
+        if self.namespace_alerts:
+            return f"{self.config.terminal_id}:{raw_alert_id}"
+        return raw_alert_id
+
+    def reset(self) -> None:
+        """Drop cached state, e.g. after losing the terminal's lease; the next cycle re-baselines."""
+        self.incremental = None
+        self.state = None
+        if self.incident_watermark is not None:
+            self.incident_watermark.forget()
+
+    def start(self) -> None:
+        if self.snapshot_mode == "incremental":
+            self.incremental = IncrementalSnapshot(
+                horton_sphere_capacity_kl=self.config.horton_sphere_capacity_kl,
+                fallback_discharge_rate_tph=self.config.fallback_discharge_rate_tph,
+                inbound_truck_count=self.config.inbound_truck_count,
+                full_refresh_cycles=self.full_refresh_cycles,
+                overlap_seconds=float(os.getenv("WATCHDOG_INCREMENTAL_OVERLAP_SECONDS", "60")),
+            )
 
+        with self.session_factory() as session:
+            if self.incremental is not None:
+                self.incremental.refresh(session)
+            if self.incident_watermark is not None:
+                self.incident_watermark.load(session)
+                baseline_ids = []
+            elif self.incremental is not None:
+                baseline_ids = list(self.incremental.incidents.keys())
+            else:
+                baseline_ids = session.execute(select(SafetyIncident.incident_id)).scalars().all()
+            if self.compliance_cache is not None and self.incremental is None:
+                rows = _fetch_all(session, select(TruckCompliance), TruckCompliance.__tablename__)
+                self.compliance_cache.warm(
+                    self.compliance_view, {row.truck_id: _truck_compliance_entry(row) for row in rows}
+                )
+        self.state = WatchdogState(known_incident_ids=set(baseline_ids), dedup=self.dedup)
+
+    def run_cycle(self) -> None:
+        if self.state is None:
+            self.start()
+        state = self.state
+        assert state is not None
+        config = self.config
+
+        with self.session_factory() as session:
+            if self.incremental is not None:
+                self.incremental.measured_discharge_rate_tph = self.measured_discharge_rate_tph
+                snapshot, delta = self.incremental.refresh(session)
+            else:
+                build_snapshot = SNAPSHOT_BUILDERS.get(self.snapshot_mode, get_terminal_snapshot)
+                snapshot = build_snapshot(
+                    session,
+                    horton_sphere_capacity_kl=config.horton_sphere_capacity_kl,
+                    fallback_discharge_rate_tph=config.fallback_discharge_rate_tph,
+                    inbound_truck_count=config.inbound_truck_count,
+                    measured_discharge_rate_tph=self.measured_discharge_rate_tph,
+                    compliance_cache=self.compliance_cache,
+                    compliance_view=self.compliance_view,
+                )
+                delta = None
+            new_incidents = self.incident_watermark.poll(session) if self.incident_watermark is not None else None
+
+        now = now_utc()
+        if new_incidents is not None:
+            incident_by_id = {str(incident["incident_id"]): incident for incident in new_incidents}
+            new_ids = list(incident_by_id)
+        elif self.incremental is not None and delta is not None:
+            # Only incidents touched since the last watermark can be new.
+            incident_by_id = self.incremental.incidents
+            new_ids = sorted(
+                incident_id
+                for incident_id in delta.changed_incident_ids
+                if incident_id in incident_by_id and incident_id not in state.known_incident_ids
+            )
+            if delta.full_refresh:
+                state.known_incident_ids = set(incident_by_id.keys())
+            else:
+                state.known_incident_ids.update(new_ids)
+        else:
+            incidents = snapshot.get("safety_incidents", [])
+            incident_by_id = {str(i["incident_id"]): i for i in incidents if i.get("incident_id")}
+            current_ids = set(incident_by_id.keys())
+            new_ids = sorted(current_ids - state.known_incident_ids)
+            state.known_incident_ids = current_ids
+
+        candidates = [self._incident_payload(incident_id, incident_by_id[incident_id]) for incident_id in new_ids]
+        for wait_record in snapshot.get("overdue_waits", []):
+            payload = self._wait_payload(wait_record)
+            if payload is not None:
+                candidates.append(payload)
+
+        with metrics.stage("forecast"):
+            forecasts = self._forecast_alerts(snapshot, now)
+        for forecast in forecasts:
+            candidates.append(self._forecast_payload(forecast))
+
+        self._dispatch(candidates, now)
+
+    def checks(self) -> Dict[str, Callable[[], bool]]:
+        """Per-check entry points for ``AdaptiveScheduler``; each returns True while risk is elevated."""
+        return {
+            "incidents": self.check_incidents,
+            "waits": self.check_waits,
+            "inventory": self.check_inventory,
+        }
+
+    def check_incidents(self) -> bool:
+        """New-incident rule on its own; elevated for the round after a new incident arrives."""
+        if self.state is None:
+            self.start()
+        state = self.state
+        assert state is not None
+
+        if self.incident_watermark is not None:
+            with self.session_factory() as session:
+                new_incidents = self.incident_watermark.poll(session)
+            self._dispatch([self._incident_payload(i["incident_id"], i) for i in new_incidents], now_utc())
+            return bool(new_incidents)
+
+        # Probe ids only; full rows are read just for the incidents not seen before.
+        with self.session_factory() as session:
+            current_ids = set(_fetch_all(session, select(SafetyIncident.incident_id), SafetyIncident.__tablename__))
+            current_ids.discard(None)
+            new_ids = sorted(current_ids - state.known_incident_ids)
+            rows = []
+            if new_ids:
+                stmt = select(SafetyIncident).where(SafetyIncident.incident_id.in_(new_ids))
+                rows = _fetch_all(session, stmt, SafetyIncident.__tablename__)
+            incident_by_id = {row.incident_id: _incident_entry(row) for row in rows}
+        state.known_incident_ids = current_ids
+        candidates = [self._incident_payload(i, incident_by_id[i]) for i in new_ids if i in incident_by_id]
+        self._dispatch(candidates, now_utc())
+        return bool(new_ids)
+
+    def check_waits(self) -> bool:
+        """Overdue-wait rule on its own; elevated while any truck is within 15 minutes of the threshold."""
+        if self.state is None:
+            self.start()
+        now = now_utc()
+        # Only trucks already past the elevation point are read; the rest cannot alert yet.
+        with self.session_factory() as session:
+            stmt = _waiting_since_stmt(now, OVERDUE_WAIT_MINUTES - 15)
+            bays = [_bay_entry(row, None, now) for row in _fetch_all(session, stmt, TerminalOps.__tablename__)]
+
+        candidates: List[Dict[str, Any]] = []
+        for bay in bays:
+            overdue = _overdue_wait_entry(bay)
+            payload = self._wait_payload(overdue) if overdue is not None else None
+            if payload is not None:
+                candidates.append(payload)
+        self._dispatch(candidates, now)
+        return any(bay["current_truck_id"] for bay in bays)
+
+    def check_inventory(self) -> bool:
+        """Tank-top forecast on its own; elevated while any forecast is Warning or Critical."""
+        if self.state is None:
+            self.start()
+        now = now_utc()
+        bays = self._current_bays(now)
+        _, inventory = _summarize_bays(
+            bays,
+            horton_sphere_capacity_kl=self.config.horton_sphere_capacity_kl,
+            fallback_discharge_rate_tph=self.config.fallback_discharge_rate_tph,
+            inbound_truck_count=self.config.inbound_truck_count,
+            measured_discharge_rate_tph=self.measured_discharge_rate_tph,
+        )
+
+        with metrics.stage("forecast"):
+            forecasts = self._forecast_alerts({"terminal_ops": bays, "inventory": inventory}, now)
+        self._dispatch([self._forecast_payload(forecast) for forecast in forecasts], now)
+        return any(forecast["priority"] in {"Warning", "Critical"} for forecast in forecasts)
+
+    def _current_bays(self, now: datetime) -> List[Dict[str, Any]]:
+        # Alert rules never read bay compliance, so the per-check path skips truck_compliance.
+        with self.session_factory() as session:
+            rows = _fetch_all(session, select(TerminalOps), TerminalOps.__tablename__)
+            return [_bay_entry(row, None, now) for row in rows]
+
+    def _forecast_alerts(self, snapshot: Dict[str, Any], now: datetime) -> List[Dict[str, Any]]:
+        if self.forecaster is not None:
+            self.forecaster.observe(now, sphere_levels_percent(snapshot, self.config.sphere_by_bay))
+            result = self.forecaster.forecast(now)
+            if result.ready.any():
+                # Fed into the next snapshot's truck_discharge_rate_tph, so converted from kl/h to TPH.
+                self.measured_discharge_rate_tph = (
+                    result.total_discharge_rate_kl_per_hour * self.config.lpg_density_t_per_kl
+                )
+                return predict_sphere_bottlenecks(result)
+            # Not enough level history (e.g. after a gap): fall back to the bay-status estimate.
+            self.measured_discharge_rate_tph = None
+
+        forecast = predict_bottleneck(
+            snapshot,
+            discharge_threshold_tph=self.config.discharge_threshold_tph,
+            avg_inbound_truck_rate_tph=self.config.avg_inbound_truck_rate_tph,
+        )
+        return [forecast] if forecast else []
+
+    def evaluate_incident(self, incident_id: str) -> None:
+        """Targeted check for one changed ``safety_incidents`` row (event-driven mode)."""
+        if self.state is None:
+            self.start()
+        state = self.state
+        assert state is not None
+        if self.incident_watermark is not None:
+            # The notified row may be an update to an old incident; the watermark decides what is new.
+            with self.session_factory() as session:
+                new_incidents = self.incident_watermark.poll(session)
+            if self.incremental is not None:
+                self.incremental.incidents.update((i["incident_id"], i) for i in new_incidents)
+            self._dispatch([self._incident_payload(i["incident_id"], i) for i in new_incidents], now_utc())
+            return
+        if incident_id in state.known_incident_ids:
+            return
+
+        with self.session_factory() as session:
+            row = session.get(SafetyIncident, incident_id)
+            if row is None:
+                return
+            incident = _incident_entry(row)
+
+        state.known_incident_ids.add(incident_id)
+        if self.incremental is not None:
+            self.incremental.incidents[incident_id] = incident
+        self._dispatch([self._incident_payload(incident_id, incident)], now_utc())
+
+    def evaluate_bay(self, bay_id: str) -> None:
+        """Targeted overdue-wait check for one changed ``terminal_ops`` row (event-driven mode)."""
+        if self.state is None:
+            self.start()
+
+        now = now_utc()
+        with self.session_factory() as session:
+            row = session.get(TerminalOps, bay_id)
+            if row is None:
+                return
+            truck_id = row.current_truck_id
+            if not truck_id:
+                compliance = None
+            elif self.compliance_cache is not None:
+                cached = _cached_compliance(session, self.compliance_cache, self.compliance_view, [truck_id])
+                compliance = cached.get(truck_id)
+            else:
+                compliance_row = session.get(TruckCompliance, truck_id)
+                compliance = _truck_compliance_entry(compliance_row) if compliance_row is not None else None
+            bay = _bay_entry(row, compliance, now)
+
+        overdue = _overdue_wait_entry(bay)
+        payload = self._wait_payload(overdue) if overdue is not None else None
+        if payload is not None:
+            self._dispatch([payload], now)
+
+    def handle_change(self, table: str, key: str) -> None:
+        if table == SafetyIncident.__tablename__:
+            self.evaluate_incident(key)
+        elif table == TerminalOps.__tablename__:
+            self.evaluate_bay(key)
+        # No alert rule reads truck_compliance directly; the sweep picks those changes up.
+
+    def _payload_terminal_id(self) -> Optional[str]:
+        return self.config.terminal_id if self.namespace_alerts else None
+
+    def _incident_payload(self, incident_id: str, incident: Dict[str, Any]) -> Dict[str, Any]:
+        return build_buddy_payload(
+            event_type="new_safety_incident",
+            alert_id=self.alert_id(f"incident-{incident_id}"),
+            priority=incident_priority(incident),
+            headline=f"Safety Incident Raised: {incident_id}",
+            insight=(incident.get("description") or "New safety incident requires immediate review."),
+            action={"label": "Open Incident", "url": f"/hse/incidents/{incident_id}"},
+            data=dict(incident),
+            terminal_id=self._payload_terminal_id(),
+        )
+
+    def _forecast_payload(self, forecast: Dict[str, Any]) -> Dict[str, Any]:
+        return build_buddy_payload(
+            event_type=forecast["event_type"],
+            alert_id=self.alert_id(forecast["alert_id"]),
+            priority=forecast["priority"],
+            headline=forecast["headline"],
+            insight=forecast["insight"],
+            action=forecast["action"],
+            data=forecast["data"],
+            terminal_id=self._payload_terminal_id(),
+        )
+
+    def _wait_payload(self, wait_record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        truck_id = str(wait_record.get("truck_id") or "").strip()
+        if not truck_id:
+            return None
+        wait_minutes = int(wait_record.get("wait_time_minutes") or 0)
+        return build_buddy_payload(
+            event_type="wait_time_exceeded",
+            alert_id=self.alert_id(f"truck-wait-{truck_id}"),
+            priority=wait_priority(wait_minutes),
+            headline=f"Queue Delay: Truck {truck_id} waiting {wait_minutes} minutes",
+            insight=(
+                f"Truck {truck_id} crossed the 45-minute wait threshold at Bay {wait_record.get('bay_id')}. "
+                "Re-sequence gantry allocation to prevent dispatch slippage."
+            ),
+            action={"label": "Open Controller Console", "url": "/controller/console"},
+            data=wait_record,
+            terminal_id=self._payload_terminal_id(),
+        )
+
+    def _dispatch(self, candidates: List[Dict[str, Any]], now: datetime) -> None:
+        assert self.state is not None
+        with metrics.stage("dedup"):
+            allowed = set(self.state.dedup.should_send_many([p["alert_id"] for p in candidates], now))
+        metrics.ALERTS.inc(len(candidates), outcome="generated")
+        metrics.ALERTS.inc(len(candidates) - len(allowed), outcome="deduped")
+        for payload in candidates:
+            if payload["alert_id"] in allowed:
+                allowed.discard(payload["alert_id"])
+                self.dispatcher.submit(payload, on_undelivered=self._release_alert)
+
+    def _release_alert(self, payload: Dict[str, Any]) -> None:
+        # Undelivered: let the next cycle raise it again instead of suppressing it for the dedup window.
+        self.dedup.forget(payload["alert_id"])
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+class TerminalLeaseManager:
+    """
+    Redis-backed terminal ownership so several watchdog instances can split a fleet of terminals.
+
+    Each instance heartbeats under ``{prefix}instance:{id}`` and prefers the terminals it wins by
+    rendezvous hashing over the live instances. A terminal is polled only while this instance holds
+    its ``{prefix}lease:{terminal_id}`` key; leases are renewed every cycle and released when the
+    terminal hashes to another live instance, so load rebalances as instances join or leave.
+    """
+
+    _RENEW_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+    )
+    _RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        lease_seconds: int,
+        instance_id: Optional[str] = None,
+        prefix: str = "eipl:watchdog:",
+    ) -> None:
+        self.redis_client = redis_client
+        self.lease_ms = max(1, lease_seconds) * 1000
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.prefix = prefix
+        self.owned: set[str] = set()
+        self._renew = redis_client.register_script(self._RENEW_SCRIPT)
+        self._release = redis_client.register_script(self._RELEASE_SCRIPT)
+
+    def _lease_key(self, terminal_id: str) -> str:
+        return f"{self.prefix}lease:{terminal_id}"
+
+    def live_instances(self) -> List[str]:
+        pattern = f"{self.prefix}instance:*"
+        offset = len(f"{self.prefix}instance:")
+        return sorted({key[offset:] for key in self.redis_client.scan_iter(match=pattern)} | {self.instance_id})
+
+    def _preferred(self, terminal_ids: Iterable[str], instances: List[str]) -> set[str]:
+        preferred = set()
+        for terminal_id in terminal_ids:
+            winner = max(instances, key=lambda inst: hashlib.sha1(f"{inst}|{terminal_id}".encode()).digest())
+            if winner == self.instance_id:
+                preferred.add(terminal_id)
+        return preferred
+
+    def refresh(self, terminal_ids: Iterable[str]) -> set[str]:
+        """Heartbeat, renew or acquire preferred leases, hand back the rest; returns owned terminal ids."""
+        terminal_ids = list(terminal_ids)
+        self.redis_client.set(f"{self.prefix}instance:{self.instance_id}", "1", px=self.lease_ms)
+        preferred = self._preferred(terminal_ids, self.live_instances())
+
+        owned: set[str] = set()
+        for terminal_id in terminal_ids:
+            key = self._lease_key(terminal_id)
+            if terminal_id in self.owned and terminal_id not in preferred:
+                self._release(keys=[key], args=[self.instance_id])
+            elif terminal_id in self.owned and self._renew(keys=[key], args=[self.instance_id, self.lease_ms]):
+                owned.add(terminal_id)
+            elif terminal_id in preferred and self.redis_client.set(key, self.instance_id, nx=True, px=self.lease_ms):
+                owned.add(terminal_id)
+        self.owned = owned
+        return set(owned)
+
+    def release_all(self) -> None:
+        for terminal_id in self.owned:
+            self._release(keys=[self._lease_key(terminal_id)], args=[self.instance_id])
+        self.owned = set()
+        self.redis_client.delete(f"{self.prefix}instance:{self.instance_id}")
+
+
+def _run_timed_cycle(watcher: TerminalWatcher, interval_seconds: float) -> None:
+    terminal_id = watcher.config.terminal_id
+    started = time.perf_counter()
+    try:
+        watcher.run_cycle()
+    except Exception:
+        metrics.CYCLE_FAILURES.inc(terminal=terminal_id)
+        LOGGER.exception("Watchdog cycle failed (terminal=%s)", terminal_id)
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.CYCLE_SECONDS.observe(elapsed, terminal=terminal_id)
+        if elapsed > interval_seconds:
+            metrics.CYCLE_OVERRUNS.inc(terminal=terminal_id)
+            LOGGER.warning("Watchdog cycle overran (terminal=%s, %.1fs > %ss)", terminal_id, elapsed, interval_seconds)
+
+
+DEFAULT_CHECK_SCHEDULES = "incidents=30:10,waits=120:30,inventory=600:120"
+
+
+@dataclass
+class CheckSchedule:
+    """Cadence of one watchdog check; ``fast_seconds`` applies while the check reports elevated risk."""
+
+    name: str
+    base_seconds: float
+    fast_seconds: float
+    next_due: Optional[float] = None
+    elevated: bool = False
+
+    @property
+    def interval_seconds(self) -> float:
+        return self.fast_seconds if self.elevated else self.base_seconds
+
+
+def parse_check_schedules(spec: str) -> List[CheckSchedule]:
+    """``"incidents=15:5,waits=60:30"`` -> schedules; the fast cadence defaults to the base one."""
+    schedules: List[CheckSchedule] = []
+    for part in spec.split(","):
+        name, _, cadence = part.strip().partition("=")
+        if not name:
+            continue
+        base, _, fast = cadence.partition(":")
+        base_seconds = float(base)
+        schedules.append(CheckSchedule(name.strip(), base_seconds, float(fast) if fast else base_seconds))
+    return schedules
+
+
+class AdaptiveScheduler:
+    """
+    Monotonic-clock loop that runs each check on its own cadence.
+
+    A check that returns True switches to its fast cadence until it returns False again. The next
+    run is due one interval after the previous due time, so runtime comes out of the wait rather
+    than stretching the cadence; a check that falls behind is re-based on now instead of bursting.
+    """
+
+    def __init__(
+        self,
+        checks: Dict[str, Callable[[], bool]],
+        schedules: List[CheckSchedule],
+        *,
+        terminal_id: str = "default",
+    ) -> None:
+        unknown = [schedule.name for schedule in schedules if schedule.name not in checks]
+        if unknown:
+            raise ValueError(f"Unknown watchdog check(s): {', '.join(unknown)}")
+        if not schedules:
+            raise ValueError("At least one check schedule is required.")
+        self.checks = checks
+        self.schedules = schedules
+        self.terminal_id = terminal_id
+        self.runs: Dict[str, int] = {schedule.name: 0 for schedule in schedules}
+
+    def run_due(self) -> float:
+        """Run every check that is due and return the seconds until the next one is."""
+        for schedule in self.schedules:
+            now = CLOCK.monotonic()
+            if schedule.next_due is not None and schedule.next_due > now:
+                continue
+            self._run(schedule)
+            interval = schedule.interval_seconds
+            due = (schedule.next_due if schedule.next_due is not None else now) + interval
+            current = CLOCK.monotonic()
+            schedule.next_due = due if due > current else current + interval
+        return max(0.0, min(s.next_due or 0.0 for s in self.schedules) - CLOCK.monotonic())
+
+    def run_forever(self) -> None:
+        while True:
+            CLOCK.sleep(self.run_due())
+
+    def _run(self, schedule: CheckSchedule) -> None:
+        started = time.perf_counter()
+        try:
+            with metrics.stage(f"check_{schedule.name}"):
+                elevated = bool(self.checks[schedule.name]())
+        except Exception:
+            metrics.CYCLE_FAILURES.inc(terminal=self.terminal_id)
+            LOGGER.exception("Watchdog check %s failed (terminal=%s)", schedule.name, self.terminal_id)
+            elevated = schedule.elevated
+        elapsed = time.perf_counter() - started
+        self.runs[schedule.name] += 1
+
+        if elevated != schedule.elevated:
+            LOGGER.info(
+                "Check %s cadence -> %ss (terminal=%s, elevated=%s)",
+                schedule.name,
+                schedule.fast_seconds if elevated else schedule.base_seconds,
+                self.terminal_id,
+                elevated,
+            )
+        schedule.elevated = elevated
+        if elapsed > schedule.interval_seconds:
+            metrics.CYCLE_OVERRUNS.inc(terminal=self.terminal_id)
+            LOGGER.warning(
+                "Check %s overran (terminal=%s, %.1fs > %ss)",
+                schedule.name,
+                self.terminal_id,
+                elapsed,
+                schedule.interval_seconds,
+            )
+
+
+def start_observability() -> metrics.SamplingProfiler:
+    """Start the optional /metrics endpoint and wire the sampling profiler to SIGUSR1 / WATCHDOG_PROFILE."""
+    port = os.getenv("WATCHDOG_METRICS_PORT", "").strip()
+    if port:
+        metrics.start_metrics_server(int(port), host=os.getenv("WATCHDOG_METRICS_HOST", "127.0.0.1"))
+
+    profiler = metrics.SamplingProfiler(
+        output_path=os.getenv("WATCHDOG_PROFILE_OUTPUT", "watchdog-profile.folded"),
+        interval_seconds=float(os.getenv("WATCHDOG_PROFILE_INTERVAL_SECONDS", "0.005")),
+    )
+    metrics.install_profiler_toggle(profiler)
+    if os.getenv("WATCHDOG_PROFILE", "").strip() == "1":
+        profiler.start()
+    return profiler
+
+
+def _create_dedup_from_env() -> DedupStore:
     redis_url = os.getenv("WATCHDOG_REDIS_URL", "").strip() or None
     dedup_minutes = int(os.getenv("WATCHDOG_ALERT_DEDUP_MINUTES", "30"))
-    dedup_store = create_dedup_store(ttl_seconds=dedup_minutes * 60, redis_url=redis_url)
+    return create_dedup_store(
+        ttl_seconds=dedup_minutes * 60,
+        redis_url=redis_url,
+        max_local_entries=int(os.getenv("WATCHDOG_DEDUP_MAX_ENTRIES", "0")) or None,
+    )
 
-    horton_capacity_kl = float(os.getenv("HORTON_SPHERE_CAPACITY_KL", "10000"))
-    fallback_discharge_rate_tph = float(os.getenv("FALLBACK_TRUCK_DISCHARGE_RATE_TPH", "6"))
-    discharge_threshold_tph = float(os.getenv("TRUCK_DISCHARGE_RATE_THRESHOLD_TPH", "12"))
-    avg_inbound_truck_rate_tph = float(os.getenv("AVG_INBOUND_TRUCK_RATE_TPH", "1.25"))
-    inbound_truck_count = int(os.getenv("INBOUND_TRUCK_COUNT", "10"))
 
-    with session_factory() as session:
-        baseline_ids = session.execute(select(SafetyIncident.incident_id)).scalars().all()
-        state = WatchdogState(known_incident_ids=set(baseline_ids), dedup=dedup_store)
+def _create_dispatcher(chatbot_webhook_url: str) -> WebhookDispatcher:
+    return WebhookDispatcher(
+        chatbot_webhook_url,
+        workers=int(os.getenv("WATCHDOG_WEBHOOK_WORKERS", "2")),
+        max_queue=int(os.getenv("WATCHDOG_WEBHOOK_QUEUE_SIZE", "1000")),
+        batch_size=int(os.getenv("WATCHDOG_WEBHOOK_BATCH_SIZE", "1")),
+    )
+
+
+def monitor_and_trigger(
+    db_url: str,
+    chatbot_webhook_url: str,
+    poll_seconds: int = 60,
+) -> None:
+    dedup_store = _create_dedup_from_env()
+    snapshot_mode = os.getenv("WATCHDOG_SNAPSHOT_MODE", "full").strip().lower()
+    dispatcher = _create_dispatcher(chatbot_webhook_url)
+    watcher = TerminalWatcher(
+        TerminalConfig.from_env("default", db_url),
+        dedup=dedup_store,
+        dispatcher=dispatcher,
+        snapshot_mode=snapshot_mode,
+        full_refresh_cycles=int(os.getenv("WATCHDOG_FULL_REFRESH_CYCLES", "60")),
+        forecast_mode=os.getenv("WATCHDOG_FORECAST_MODE", "simple").strip().lower(),
+        compliance_cache=create_compliance_cache_from_env(),
+        incident_watermark=create_incident_watermark_from_env("default", dedup_store.redis_client),
+    )
+    if os.getenv("WATCHDOG_INSTALL_INDEXES", "").strip() == "1":
+        install_pushdown_indexes(watcher.engine)
+    watcher.start()
 
     LOGGER.info(
-        "Predictive Watchdog started (poll=%ss, dedup=%sm)",
+        "Predictive Watchdog started (poll=%ss, dedup=%ss, snapshot=%s)",
         poll_seconds,
-        dedup_minutes,
+        dedup_store.ttl_seconds,
+        snapshot_mode,
     )
 
-    while True:
-        try:
-            with session_factory() as session:
-                snapshot = get_terminal_snapshot(
-                    session,
-                    horton_sphere_capacity_kl=horton_capacity_kl,
-                    fallback_discharge_rate_tph=fallback_discharge_rate_tph,
-                    inbound_truck_count=inbound_truck_count,
-                )
+    try:
+        next_run = CLOCK.monotonic()
+        while True:
+            _run_timed_cycle(watcher, poll_seconds)
+            # Fixed rate: cycle runtime comes out of the wait; after an overrun the next cycle starts now.
+            next_run = max(next_run + poll_seconds, CLOCK.monotonic())
+            CLOCK.sleep(max(0.0, next_run - CLOCK.monotonic()))
+    finally:
+        dispatcher.close()
+        watcher.close()
 
-            now = now_utc()
-            incidents = snapshot.get("safety_incidents", [])
-            incident_by_id = {str(i["incident_id"]): i for i in incidents if i.get("incident_id")}
-            current_ids = set(incident_by_id.keys())
-            new_ids = sorted(current_ids - state.known_incident_ids)
-            state.known_incident_ids = current_ids
 
-            for incident_id in new_ids:
-                incident = incident_by_id[incident_id]
-                payload = build_buddy_payload(
-                    event_type="new_safety_incident",
-                    alert_id=f"incident-{incident_id}",
-                    priority=incident_priority(incident),
-                    headline=f"Safety Incident Raised: {incident_id}",
-                    insight=(incident.get("description") or "New safety incident requires immediate review."),
-                    action={"label": "Open Incident", "url": f"/hse/incidents/{incident_id}"},
-                    data=incident,
-                )
-                if state.dedup.should_send(payload["alert_id"], now):
-                    send_webhook(chatbot_webhook_url, payload)
-                    LOGGER.warning("Alert sent: %s", payload["alert_id"])
-
-            for wait_record in snapshot.get("overdue_waits", []):
-                truck_id = str(wait_record.get("truck_id") or "").strip()
-                if not truck_id:
-                    continue
-                wait_minutes = int(wait_record.get("wait_time_minutes") or 0)
-                payload = build_buddy_payload(
-                    event_type="wait_time_exceeded",
-                    alert_id=f"truck-wait-{truck_id}",
-                    priority=wait_priority(wait_minutes),
-                    headline=f"Queue Delay: Truck {truck_id} waiting {wait_minutes} minutes",
-                    insight=(
-                        f"Truck {truck_id} crossed the 45-minute wait threshold at Bay {wait_record.get('bay_id')}. "
-                        "Re-sequence gantry allocation to prevent dispatch slippage."
-                    ),
-                    action={"label": "Open Controller Console", "url": "/controller/console"},
-                    data=wait_record,
-                )
-                if state.dedup.should_send(payload["alert_id"], now):
-                    send_webhook(chatbot_webhook_url, payload)
-                    LOGGER.warning("Alert sent: %s", payload["alert_id"])
-
-            forecast = predict_bottleneck(
-                snapshot,
-                discharge_threshold_tph=discharge_threshold_tph,
-                avg_inbound_truck_rate_tph=avg_inbound_truck_rate_tph,
-            )
-            if forecast and state.dedup.should_send(forecast["alert_id"], now):
-                payload = build_buddy_payload(
-                    event_type=forecast["event_type"],
-                    alert_id=forecast["alert_id"],
-                    priority=forecast["priority"],
-                    headline=forecast["headline"],
-                    insight=forecast["insight"],
-                    action=forecast["action"],
-                    data=forecast["data"],
+def adaptive_monitor_and_trigger(
+    db_url: str,
+    chatbot_webhook_url: str,
+    schedule_spec: str = DEFAULT_CHECK_SCHEDULES,
+) -> None:
+    """Single-terminal loop where incidents, waits and inventory each poll on their own cadence."""
+    dedup_store = _create_dedup_from_env()
+    dispatcher = _create_dispatcher(chatbot_webhook_url)
+    watcher = TerminalWatcher(
+        TerminalConfig.from_env("default", db_url),
+        dedup=dedup_store,
+        dispatcher=dispatcher,
+        forecast_mode=os.getenv("WATCHDOG_FORECAST_MODE", "simple").strip().lower(),
+        incident_watermark=create_incident_watermark_from_env("default", dedup_store.redis_client),
+    )
+    watcher.start()
+    schedules = parse_check_schedules(schedule_spec)
+    scheduler = AdaptiveScheduler(watcher.checks(), schedules, terminal_id=watcher.config.terminal_id)
+
+    LOGGER.info(
+        "Predictive Watchdog started (adaptive: %s, dedup=%ss)",
+        ", ".join(f"{s.name}={s.base_seconds:g}s/{s.fast_seconds:g}s" for s in schedules),
+        dedup_store.ttl_seconds,
+    )
+
+    try:
+        scheduler.run_forever()
+    finally:
+        dispatcher.close()
+        watcher.close()
+
+
+def install_pushdown_indexes(engine: Engine) -> None:
+    """Apply ``sql/watchdog_pushdown_indexes.sql`` one statement at a time (SQLite cannot batch)."""
+    with open(PUSHDOWN_INDEXES_SQL, "r", encoding="utf-8") as handle:
+        lines = [line for line in handle if not line.lstrip().startswith("--")]
+    statements = [statement.strip() for statement in "".join(lines).split(";") if statement.strip()]
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+
+
+def install_notify_triggers(engine: Engine) -> None:
+    with open(NOTIFY_TRIGGERS_SQL, "r", encoding="utf-8") as handle:
+        ddl = handle.read()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(ddl)
+
+
+class NotificationListener:
+    """
+    Dedicated psycopg2 connection LISTENing on the watchdog channel.
+
+    The connection is detached from the engine's pool because it is switched to autocommit and
+    must stay open between waits.
+    """
+
+    def __init__(self, engine: Engine, channel: str = NOTIFY_CHANNEL) -> None:
+        self.raw = engine.raw_connection()
+        self.raw.detach()
+        self.conn = self.raw.driver_connection
+        self.conn.set_session(autocommit=True)
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {channel}")
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.conn, selectors.EVENT_READ)
+
+    def wait(self, timeout_seconds: float) -> List[Dict[str, Any]]:
+        if not self.selector.select(timeout_seconds):
+            return []
+        self.conn.poll()
+        events = []
+        while self.conn.notifies:
+            notify = self.conn.notifies.pop(0)
+            try:
+                events.append(json.loads(notify.payload))
+            except ValueError:
+                LOGGER.warning("Ignoring malformed notification payload: %r", notify.payload)
+        return events
+
+    def close(self) -> None:
+        self.selector.close()
+        self.raw.close()
+
+
+def listen_and_trigger(
+    db_url: str,
+    chatbot_webhook_url: str,
+    sweep_seconds: int = 300,
+    *,
+    install_triggers: bool = False,
+) -> None:
+    """
+    Event-driven watchdog: each NOTIFY re-evaluates only the changed incident or bay.
+
+    Time-driven alerts (a wait crossing 45 minutes, the tank-top forecast) have no row change to
+    react to, so a full cycle still runs every ``sweep_seconds`` and after every reconnect.
+    Requires PostgreSQL with psycopg2 and the triggers in ``sql/watchdog_notify_triggers.sql``.
+    """
+    dedup_store = _create_dedup_from_env()
+    dispatcher = _create_dispatcher(chatbot_webhook_url)
+    watcher = TerminalWatcher(
+        TerminalConfig.from_env("default", db_url),
+        dedup=dedup_store,
+        dispatcher=dispatcher,
+        snapshot_mode=os.getenv("WATCHDOG_SNAPSHOT_MODE", "full").strip().lower(),
+        full_refresh_cycles=int(os.getenv("WATCHDOG_FULL_REFRESH_CYCLES", "60")),
+        forecast_mode=os.getenv("WATCHDOG_FORECAST_MODE", "simple").strip().lower(),
+        compliance_cache=create_compliance_cache_from_env(),
+        incident_watermark=create_incident_watermark_from_env("default", dedup_store.redis_client),
+    )
+    if install_triggers:
+        install_notify_triggers(watcher.engine)
+    watcher.start()
+
+    LOGGER.info("Predictive Watchdog started (event-driven, sweep=%ss)", sweep_seconds)
+
+    listener: Optional[NotificationListener] = None
+    next_sweep = CLOCK.monotonic()
+    try:
+        while True:
+            try:
+                if listener is None:
+                    listener = NotificationListener(watcher.engine)
+                    next_sweep = CLOCK.monotonic()
+
+                events = listener.wait(max(0.0, next_sweep - CLOCK.monotonic()))
+                # Coalesce bursts: a row updated several times is re-evaluated once.
+                changes = dict.fromkeys(
+                    (str(event.get("table")), str(event.get("id")))
+                    for event in events
+                    if event.get("op") != "DELETE" and event.get("id")
                 )
-                send_webhook(chatbot_webhook_url, payload)
-                LOGGER.warning("Alert sent: %s", payload["alert_id"])
+                for table, key in changes:
+                    watcher.handle_change(table, key)
+
+                if CLOCK.monotonic() >= next_sweep:
+                    _run_timed_cycle(watcher, sweep_seconds)
+                    next_sweep = CLOCK.monotonic() + sweep_seconds
+            except Exception:
+                LOGGER.exception("Event-driven watchdog iteration failed; reconnecting listener")
+                if listener is not None:
+                    try:
+                        listener.close()
+                    except Exception:
+                        pass
+                    listener = None
+                CLOCK.sleep(max(0.0, min(5, sweep_seconds)))
+    finally:
+        if listener is not None:
+            listener.close()
+        dispatcher.close()
+        watcher.close()
+
+
+def monitor_terminals(
+    configs: List[TerminalConfig],
+    chatbot_webhook_url: str,
+    poll_seconds: int = 60,
+    *,
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Poll several terminals concurrently, one engine per terminal, from a shared thread pool.
+
+    With ``WATCHDOG_SHARDING=redis`` terminals are split across watchdog instances through
+    ``TerminalLeaseManager``; otherwise this instance polls every configured terminal.
+    """
+    shared_dedup = _create_dedup_from_env()
+
+    lease_manager: Optional[TerminalLeaseManager] = None
+    if os.getenv("WATCHDOG_SHARDING", "").strip().lower() == "redis":
+        if shared_dedup.redis_client is None:
+            raise SystemExit("WATCHDOG_SHARDING=redis requires a reachable WATCHDOG_REDIS_URL.")
+        lease_manager = TerminalLeaseManager(
+            shared_dedup.redis_client,
+            lease_seconds=int(os.getenv("WATCHDOG_LEASE_SECONDS", str(max(30, poll_seconds * 3)))),
+        )
+
+    snapshot_mode = os.getenv("WATCHDOG_SNAPSHOT_MODE", "full").strip().lower()
+    full_refresh_cycles = int(os.getenv("WATCHDOG_FULL_REFRESH_CYCLES", "60"))
+    forecast_mode = os.getenv("WATCHDOG_FORECAST_MODE", "simple").strip().lower()
+    compliance_cache = create_compliance_cache_from_env()
+    dispatcher = _create_dispatcher(chatbot_webhook_url)
+    watchers = {
+        # Each terminal gets its own local dedup map (cycles run on different threads) over the shared Redis client.
+        config.terminal_id: TerminalWatcher(
+            config,
+            dedup=DedupStore(
+                ttl_seconds=shared_dedup.ttl_seconds,
+                redis_client=shared_dedup.redis_client,
+                max_entries=shared_dedup.max_entries,
+            ),
+            dispatcher=dispatcher,
+            snapshot_mode=snapshot_mode,
+            full_refresh_cycles=full_refresh_cycles,
+            namespace_alerts=True,
+            forecast_mode=forecast_mode,
+            compliance_cache=compliance_cache,
+            incident_watermark=create_incident_watermark_from_env(config.terminal_id, shared_dedup.redis_client),
+        )
+        for config in configs
+    }
+    if os.getenv("WATCHDOG_INSTALL_INDEXES", "").strip() == "1":
+        for watcher in watchers.values():
+            install_pushdown_indexes(watcher.engine)
 
-        except Exception:
-            LOGGER.exception("Watchdog cycle failed")
+    LOGGER.info(
+        "Predictive Watchdog started for %s terminal(s) (poll=%ss, sharding=%s)",
+        len(watchers),
+        poll_seconds,
+        "redis" if lease_manager else "off",
+    )
 
-        time.sleep(poll_seconds)
+    pool = ThreadPoolExecutor(max_workers=max_workers or min(32, len(watchers) or 1), thread_name_prefix="watchdog")
+    try:
+        next_run = CLOCK.monotonic()
+        while True:
+            if lease_manager is not None:
+                try:
+                    owned = lease_manager.refresh(watchers.keys())
+                except Exception:
+                    LOGGER.exception("Lease refresh failed; skipping cycle")
+                    owned = set()
+                for terminal_id, watcher in watchers.items():
+                    if terminal_id not in owned and watcher.state is not None:
+                        LOGGER.info("Released terminal %s", terminal_id)
+                        watcher.reset()
+            else:
+                owned = set(watchers.keys())
+
+            futures = [
+                pool.submit(_run_timed_cycle, watchers[terminal_id], poll_seconds) for terminal_id in sorted(owned)
+            ]
+            for future in as_completed(futures):
+                future.result()
+
+            # Fixed rate, as in monitor_and_trigger: the slowest terminal's cycle comes out of the wait.
+            next_run = max(next_run + poll_seconds, CLOCK.monotonic())
+            CLOCK.sleep(max(0.0, next_run - CLOCK.monotonic()))
+    finally:
+        pool.shutdown(wait=True)
+        if lease_manager is not None:
+            lease_manager.release_all()
+        dispatcher.close()
+        for watcher in watchers.values():
+            watcher.close()
 
 
 if __name__ == "__main__":
     db_url = os.getenv("TERMINAL_DB_URL", "").strip()
+    terminals_file = os.getenv("WATCHDOG_TERMINALS_FILE", "").strip()
     webhook_url = os.getenv("CHATBOT_WEBHOOK_URL", "").strip()
     poll_seconds = int(os.getenv("WATCHDOG_POLL_SECONDS", "60"))
 
-    if not db_url:
-        raise SystemExit("Missing TERMINAL_DB_URL environment variable.")
+    if not db_url and not terminals_file:
+        raise SystemExit("Missing TERMINAL_DB_URL (or WATCHDOG_TERMINALS_FILE) environment variable.")
     if not webhook_url:
         raise SystemExit("Missing CHATBOT_WEBHOOK_URL environment variable.")
 
     LOGGER.info("Booting EIPL Predictive Watchdog...")
-    monitor_and_trigger(db_url=db_url, chatbot_webhook_url=webhook_url, poll_seconds=poll_seconds)
+    start_observability()
+    if terminals_file:
+        monitor_terminals(load_terminal_configs(terminals_file), webhook_url, poll_seconds=poll_seconds)
+    elif os.getenv("WATCHDOG_MODE", "poll").strip().lower() == "event":
+        listen_and_trigger(
+            db_url=db_url,
+            chatbot_webhook_url=webhook_url,
+            sweep_seconds=int(os.getenv("WATCHDOG_SWEEP_SECONDS", "300")),
+            install_triggers=os.getenv("WATCHDOG_INSTALL_TRIGGERS", "").strip() == "1",
+        )
+    elif os.getenv("WATCHDOG_MODE", "poll").strip().lower() == "adaptive":
+        adaptive_monitor_and_trigger(
+            db_url=db_url,
+            chatbot_webhook_url=webhook_url,
+            schedule_spec=os.getenv("WATCHDOG_CHECK_SECONDS", DEFAULT_CHECK_SCHEDULES),
+        )
+    else:
+        monitor_and_trigger(db_url=db_url, chatbot_webhook_url=webhook_url, poll_seconds=poll_seconds)
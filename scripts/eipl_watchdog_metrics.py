@@ -0,0 +1,289 @@
+"""
+Dependency-free instrumentation for the EIPL Predictive Watchdog.
+
+- Counters, gauges and histograms rendered in the Prometheus text exposition format.
+- Optional local HTTP endpoint serving ``/metrics``.
+- Sampling profiler writing collapsed stacks (flamegraph.pl / speedscope input), toggled by a
+  signal or started from an env var.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter as _StackCounter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+LOGGER = logging.getLogger("eipl-predictive-watchdog")
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[str, ...]
+MetricT = TypeVar("MetricT", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, label_names)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), []))
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key in sorted(self._counts):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), self._counts[key]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    bucket_labels = _format_labels(self.label_names, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                labels = _format_labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{labels} {self._sums[key]:g}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram("eipl_watchdog_stage_seconds", "Time spent per watchdog cycle stage.", ["stage"])
+)
+CYCLE_SECONDS = REGISTRY.register(
+    Histogram("eipl_watchdog_cycle_seconds", "End-to-end watchdog cycle duration.", ["terminal"])
+)
+CYCLE_OVERRUNS = REGISTRY.register(
+    Counter("eipl_watchdog_cycle_overruns_total", "Cycles that took longer than the poll interval.", ["terminal"])
+)
+CYCLE_FAILURES = REGISTRY.register(
+    Counter("eipl_watchdog_cycle_failures_total", "Cycles that raised an exception.", ["terminal"])
+)
+ROWS_FETCHED = REGISTRY.register(
+    Counter("eipl_watchdog_rows_fetched_total", "Rows read from each source table.", ["table"])
+)
+ALERTS = REGISTRY.register(
+    Counter(
+        "eipl_watchdog_alerts_total",
+        "Alert outcomes: generated, deduped, queued, delivered, failed, dropped.",
+        ["outcome"],
+    )
+)
+WEBHOOK_SECONDS = REGISTRY.register(
+    Histogram("eipl_watchdog_webhook_seconds", "Webhook POST latency, including retries.")
+)
+WEBHOOK_QUEUE_DEPTH = REGISTRY.register(
+    Gauge("eipl_watchdog_webhook_queue_depth", "Payloads waiting in the webhook queue.")
+)
+
+
+def stage(name: str):
+    """``with stage("dedup"): ...`` records into ``eipl_watchdog_stage_seconds``."""
+    return STAGE_SECONDS.time(stage=name)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - http.server signature
+        return
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="watchdog-metrics", daemon=True).start()
+    LOGGER.info("Metrics endpoint listening on http://%s:%s/metrics", host, server.server_port)
+    return server
+
+
+class SamplingProfiler:
+    """
+    Background sampler of every thread's stack via ``sys._current_frames``.
+
+    Cheap enough to leave on for a few cycles in production; ``stop`` writes collapsed stacks
+    (``frame;frame;frame count`` per line) to ``output_path``.
+    """
+
+    def __init__(self, output_path: str, interval_seconds: float = 0.005) -> None:
+        self.output_path = output_path
+        self.interval_seconds = interval_seconds
+        self._stacks: "_StackCounter[str]" = _StackCounter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stacks.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="watchdog-profiler", daemon=True)
+        self._thread.start()
+        LOGGER.info("Sampling profiler started (interval=%ss)", self.interval_seconds)
+
+    def stop(self) -> Optional[str]:
+        if not self.running:
+            return None
+        self._stop.set()
+        assert self._thread is not None
+        self._thread.join()
+        with open(self.output_path, "w", encoding="utf-8") as handle:
+            for stack, count in self._stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+        LOGGER.info("Sampling profiler wrote %s stacks to %s", len(self._stacks), self.output_path)
+        return self.output_path
+
+    def toggle(self) -> None:
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def _sample(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self._stacks[";".join(reversed(names))] += 1
+
+
+def install_profiler_toggle(profiler: SamplingProfiler, signum: Optional[int] = None) -> None:
+    """Toggle ``profiler`` on the given signal (SIGUSR1 by default, where the platform has it)."""
+    signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        LOGGER.warning("No SIGUSR1 on this platform; profiler can only be started via env var.")
+        return
+    signal.signal(signum, lambda *_: profiler.toggle())
@@ -0,0 +1,501 @@
+"""
+Record/replay harness for the EIPL Predictive Watchdog.
+
+- ``record``: poll a live terminal DB and write per-table row deltas to a gzip'd JSON-lines file.
+- ``synthesize``: generate a recording offline (queue build-up, incidents, rising spheres).
+- ``replay``: feed a recording through the real watchdog cycle on an in-memory SQLite copy with a
+  virtual clock and an in-process webhook sink, as fast as the code allows.
+
+Usage:
+    python scripts/eipl_watchdog_replay.py record --db-url "$TERMINAL_DB_URL" --out day.jsonl.gz --frames 1440
+    python scripts/eipl_watchdog_replay.py synthesize --out synthetic.jsonl.gz --bays 40 --hours 24
+    python scripts/eipl_watchdog_replay.py replay day.jsonl.gz --snapshot-mode incremental --forecast-mode sphere
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import gzip
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import eipl_terminal_watchdog as watchdog
+
+FORMAT = "eipl-watchdog-recording"
+VERSION = 1
+TABLES = (watchdog.TruckCompliance, watchdog.TerminalOps, watchdog.SafetyIncident)
+TANK_TOP_PERCENT = 99.0
+
+
+class VirtualClock:
+    """Drop-in for ``watchdog.SystemClock``: time only moves when the driver sets or sleeps it."""
+
+    def __init__(self, start: datetime) -> None:
+        self.current = start
+        self.slept_seconds = 0.0
+
+    def now(self) -> datetime:
+        return self.current
+
+    def monotonic(self) -> float:
+        return self.current.timestamp()
+
+    def sleep(self, seconds: float) -> None:
+        self.current += timedelta(seconds=seconds)
+        self.slept_seconds += seconds
+
+    def set(self, at: datetime) -> None:
+        self.current = at
+
+
+class ReplaySink:
+    """In-process stand-in for ``WebhookDispatcher`` that keeps every payload."""
+
+    def __init__(self) -> None:
+        self.payloads: List[Dict[str, Any]] = []
+
+    def submit(
+        self, payload: Dict[str, Any], on_undelivered: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> bool:
+        self.payloads.append(payload)
+        return True
+
+    def close(self) -> None:
+        return None
+
+
+def _recorded_columns(model: Any) -> List[Any]:
+    # updated_at is re-derived from frame times on replay, so recordings work without it.
+    return [column for column in model.__table__.columns if column.name != "updated_at"]
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+
+def _pk_index(model: Any) -> int:
+    names = [column.name for column in _recorded_columns(model)]
+    return names.index(model.__table__.primary_key.columns.values()[0].name)
+
+
+class RecordingWriter:
+    """Writes a header line, then one line per frame holding only rows that changed or vanished."""
+
+    def __init__(self, path: str, config: Dict[str, Any]) -> None:
+        self.handle = gzip.open(path, "wt", encoding="utf-8")
+        header = {
+            "format": FORMAT,
+            "version": VERSION,
+            "columns": {model.__tablename__: [c.name for c in _recorded_columns(model)] for model in TABLES},
+            "config": config,
+        }
+        self.handle.write(json.dumps(header, separators=(",", ":")) + "\n")
+        self._previous: Dict[str, Dict[Any, Tuple[Any, ...]]] = {}
+        self.frames = 0
+
+    def write_frame(self, at: datetime, rows_by_table: Dict[str, List[Tuple[Any, ...]]]) -> None:
+        changes: Dict[str, Dict[str, List[Any]]] = {}
+        for model in TABLES:
+            name = model.__tablename__
+            pk = _pk_index(model)
+            previous = self._previous.get(name, {})
+            current = {row[pk]: row for row in rows_by_table.get(name, [])}
+            upsert = [list(row) for key, row in current.items() if previous.get(key) != row]
+            removed = [key for key in previous if key not in current]
+            if upsert or removed:
+                changes[name] = {"upsert": upsert, "delete": removed}
+            self._previous[name] = current
+        frame = {"at": at.isoformat(), "tables": changes}
+        self.handle.write(json.dumps(frame, separators=(",", ":")) + "\n")
+        self.frames += 1
+
+    def close(self) -> None:
+        self.handle.close()
+
+
+def read_recording(path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    handle = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(handle.readline())
+    if header.get("format") != FORMAT or header.get("version") != VERSION:
+        handle.close()
+        raise ValueError(f"{path} is not a {FORMAT} v{VERSION} file.")
+
+    def frames() -> Iterator[Dict[str, Any]]:
+        with handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, frames()
+
+
+def _config_header(config: watchdog.TerminalConfig) -> Dict[str, Any]:
+    values = asdict(config)
+    values.pop("terminal_id")
+    values.pop("db_url")
+    return values
+
+
+def record(db_url: str, out_path: str, *, interval_seconds: float, frames: int) -> int:
+    engine = create_engine(db_url, future=True)
+    session_factory = sessionmaker(bind=engine)
+    writer = RecordingWriter(out_path, _config_header(watchdog.TerminalConfig.from_env("recorded", db_url)))
+    try:
+        for index in range(frames):
+            at = watchdog.now_utc()
+            with session_factory() as session:
+                rows_by_table = {
+                    model.__tablename__: [
+                        tuple(_encode(value) for value in row)
+                        for row in session.execute(select(*_recorded_columns(model))).all()
+                    ]
+                    for model in TABLES
+                }
+            writer.write_frame(at, rows_by_table)
+            watchdog.LOGGER.info("Recorded frame %s/%s", index + 1, frames)
+            if index + 1 < frames:
+                watchdog.CLOCK.sleep(interval_seconds)
+    finally:
+        writer.close()
+        engine.dispose()
+    return writer.frames
+
+
+def synthesize(
+    out_path: str,
+    *,
+    bays: int = 40,
+    spheres: int = 4,
+    trucks: int = 400,
+    hours: float = 24.0,
+    interval_seconds: float = 60.0,
+    incidents_per_day: float = 6.0,
+    seed: int = 7,
+) -> int:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    config = watchdog.TerminalConfig(
+        terminal_id="synthetic",
+        db_url="",
+        sphere_by_bay={f"BAY-{i:03d}": f"HS-{i % spheres + 1}" for i in range(bays)},
+    )
+    writer = RecordingWriter(out_path, _config_header(config))
+
+    compliance = {
+        f"TRK-{i:05d}": (
+            f"TRK-{i:05d}",
+            (start + timedelta(days=rng.randint(-30, 365))).isoformat(),
+            rng.choice(["OK", "OK", "OK", "PASS", "FAIL"]),
+        )
+        for i in range(trucks)
+    }
+    # Each sphere drifts with its own fill bias; bays report their sphere's level as a percent.
+    levels = {f"HS-{s + 1}": rng.uniform(55.0, 80.0) for s in range(spheres)}
+    drift = {sphere: rng.uniform(-0.01, 0.05) for sphere in levels}
+    bay_state: Dict[str, Dict[str, Any]] = {
+        bay_id: {"truck": None, "entered": None, "leave_at": None} for bay_id in config.sphere_by_bay
+    }
+    incidents: Dict[str, Tuple[Any, ...]] = {}
+    open_until: Dict[str, datetime] = {}
+    incident_seq = 0
+    step_hours = interval_seconds / 3600.0
+    incident_p = incidents_per_day / 24.0 * step_hours
+
+    for index in range(int(hours * 3600 / interval_seconds)):
+        at = start + timedelta(seconds=index * interval_seconds)
+        for sphere in levels:
+            levels[sphere] = min(100.0, max(5.0, levels[sphere] + drift[sphere] * interval_seconds / 60.0
+                                            + rng.gauss(0.0, 0.05)))
+
+        ops_rows = []
+        for bay_id, state in bay_state.items():
+            if state["truck"] is not None and at >= state["leave_at"]:
+                state.update(truck=None, entered=None, leave_at=None)
+            if state["truck"] is None and rng.random() < 0.05:
+                state.update(
+                    truck=rng.choice(list(compliance)),
+                    entered=at,
+                    leave_at=at + timedelta(minutes=rng.choice([20, 30, 40, 55, 70, 95])),
+                )
+            status = "LOADING" if state["truck"] and rng.random() < 0.6 else ("WAITING" if state["truck"] else "IDLE")
+            ops_rows.append(
+                (
+                    bay_id,
+                    status,
+                    state["truck"],
+                    int(levels[config.sphere_by_bay[bay_id]]),
+                    state["entered"].isoformat() if state["entered"] else None,
+                )
+            )
+
+        if rng.random() < incident_p:
+            incident_seq += 1
+            incident_id = f"INC-{incident_seq:05d}"
+            incidents[incident_id] = (
+                incident_id,
+                rng.choice(["LOW", "MED", "HIGH"]),
+                "Synthetic safety observation at gantry.",
+                "open",
+                at.isoformat(),
+            )
+            open_until[incident_id] = at + timedelta(hours=rng.uniform(0.5, 6.0))
+        for incident_id, closes_at in list(open_until.items()):
+            if at >= closes_at:
+                incidents[incident_id] = (*incidents[incident_id][:3], "resolved", *incidents[incident_id][4:])
+                del open_until[incident_id]
+
+        writer.write_frame(
+            at,
+            {
+                watchdog.TruckCompliance.__tablename__: list(compliance.values()),
+                watchdog.TerminalOps.__tablename__: ops_rows,
+                watchdog.SafetyIncident.__tablename__: list(incidents.values()),
+            },
+        )
+
+    writer.close()
+    return writer.frames
+
+
+@dataclass
+class ReplayReport:
+    frames: int = 0
+    cycle_seconds: float = 0.0
+    virtual_hours: float = 0.0
+    alerts_by_event: Dict[str, int] = field(default_factory=dict)
+    alerts_by_priority: Dict[str, int] = field(default_factory=dict)
+    forecast: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def cycles_per_second(self) -> float:
+        return self.frames / self.cycle_seconds if self.cycle_seconds > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        values = asdict(self)
+        values["cycles_per_second"] = round(self.cycles_per_second, 1)
+        values["speedup_vs_real_time"] = (
+            round(self.virtual_hours * 3600 / self.cycle_seconds, 1) if self.cycle_seconds > 0 else None
+        )
+        return values
+
+
+def _apply_frame(engine: Any, header: Dict[str, Any], frame: Dict[str, Any], at: datetime) -> None:
+    with engine.begin() as conn:
+        for model in TABLES:
+            change = frame["tables"].get(model.__tablename__)
+            if not change:
+                continue
+            table = model.__table__
+            columns = [table.c[name] for name in header["columns"][model.__tablename__]]
+            pk_column = table.primary_key.columns.values()[0]
+            pk = [c.name for c in columns].index(pk_column.name)
+            keys = list(change["delete"]) + [row[pk] for row in change["upsert"]]
+            if keys:
+                conn.execute(delete(table).where(pk_column.in_(keys)))
+            if change["upsert"]:
+                conn.execute(
+                    insert(table),
+                    [
+                        {**{c.name: _decode(c, v) for c, v in zip(columns, row)}, "updated_at": at}
+                        for row in change["upsert"]
+                    ],
+                )
+
+
+def _forecast_accuracy(
+    forecasts: List[Tuple[datetime, Dict[str, Any]]],
+    timeline: List[Tuple[datetime, float, Dict[str, float]]],
+) -> Dict[str, Any]:
+    times = [entry[0] for entry in timeline]
+    end = times[-1] if times else None
+
+    def level_at(index: int, sphere_id: Optional[str]) -> Optional[float]:
+        _, overall, spheres = timeline[index]
+        return overall if sphere_id is None else spheres.get(sphere_id)
+
+    tank_top_errors: List[float] = []
+    false_alarms = 0
+    horizon_errors: Dict[str, List[float]] = {}
+    for at, data in forecasts:
+        sphere_id = data.get("sphere_id")
+        hours = data.get("time_to_tank_top_hours")
+        start = bisect.bisect_left(times, at)
+        if hours is not None:
+            predicted = at + timedelta(hours=float(hours))
+            reached = next(
+                (
+                    times[i]
+                    for i in range(start, len(times))
+                    if (level_at(i, sphere_id) or 0.0) >= TANK_TOP_PERCENT
+                ),
+                None,
+            )
+            if reached is not None:
+                tank_top_errors.append(abs((reached - predicted).total_seconds()) / 3600.0)
+            elif end is not None and predicted <= end:
+                false_alarms += 1
+        for label, projected in (data.get("projected_percent") or {}).items():
+            target = at + timedelta(hours=float(label.rstrip("h")))
+            index = bisect.bisect_left(times, target)
+            if index < len(times):
+                actual = level_at(index, sphere_id)
+                if actual is not None:
+                    horizon_errors.setdefault(label, []).append(abs(actual - float(projected)))
+
+    return {
+        "forecasts": len(forecasts),
+        "tank_top_reached": len(tank_top_errors),
+        "tank_top_mae_hours": round(sum(tank_top_errors) / len(tank_top_errors), 3) if tank_top_errors else None,
+        "tank_top_false_alarms": false_alarms,
+        "horizon_mae_percent": {
+            label: round(sum(errors) / len(errors), 3) for label, errors in sorted(horizon_errors.items())
+        },
+    }
+
+
+def replay(
+    path: str,
+    *,
+    snapshot_mode: str = "full",
+    forecast_mode: str = "simple",
+    dedup_minutes: int = 30,
+    incident_tracking: str = "ids",
+    sink: Optional[Any] = None,
+) -> ReplayReport:
+    header, frames = read_recording(path)
+    config_values = dict(header.get("config") or {})
+    config = watchdog.TerminalConfig(terminal_id="replay", db_url="sqlite://", **config_values)
+    sink = sink if sink is not None else ReplaySink()
+    report = ReplayReport()
+    forecasts: List[Tuple[datetime, Dict[str, Any]]] = []
+    timeline: List[Tuple[datetime, float, Dict[str, float]]] = []
+
+    clock = VirtualClock(datetime.now(timezone.utc))
+    previous_clock = watchdog.set_clock(clock)
+    # In-memory SQLite is per-thread under SQLAlchemy's default pool; the replay stays on one thread.
+    watcher = watchdog.TerminalWatcher(
+        config,
+        dedup=watchdog.DedupStore(ttl_seconds=dedup_minutes * 60),
+        dispatcher=sink,
+        snapshot_mode=snapshot_mode,
+        forecast_mode=forecast_mode,
+        incident_watermark=watchdog.IncidentWatermark() if incident_tracking == "watermark" else None,
+    )
+    watchdog.Base.metadata.create_all(watcher.engine)
+
+    forecast_alerts = watcher._forecast_alerts
+
+    def observed_forecast_alerts(snapshot: Dict[str, Any], now: datetime) -> List[Dict[str, Any]]:
+        alerts = forecast_alerts(snapshot, now)
+        timeline.append(
+            (
+                now,
+                float(snapshot["inventory"]["lpg_level_percent"]),
+                watchdog.sphere_levels_percent(snapshot, config.sphere_by_bay),
+            )
+        )
+        forecasts.extend((now, alert["data"]) for alert in alerts)
+        return alerts
+
+    watcher._forecast_alerts = observed_forecast_alerts  # type: ignore[method-assign]
+
+    first_at: Optional[datetime] = None
+    try:
+        for frame in frames:
+            at = datetime.fromisoformat(frame["at"])
+            first_at = first_at or at
+            clock.set(at)
+            _apply_frame(watcher.engine, header, frame, at)
+            started = time.perf_counter()
+            if watcher.state is None:
+                watcher.start()
+            watcher.run_cycle()
+            report.cycle_seconds += time.perf_counter() - started
+            report.frames += 1
+            report.virtual_hours = (at - first_at).total_seconds() / 3600.0
+    finally:
+        watchdog.set_clock(previous_clock)
+        watcher.close()
+
+    payloads = getattr(sink, "payloads", [])
+    report.alerts_by_event = dict(Counter(p["event_type"] for p in payloads))
+    report.alerts_by_priority = dict(Counter(p["priority"] for p in payloads))
+    report.forecast = _forecast_accuracy(forecasts, timeline)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Record table deltas from a live terminal DB.")
+    rec.add_argument("--db-url", required=True)
+    rec.add_argument("--out", required=True)
+    rec.add_argument("--interval", type=float, default=60.0)
+    rec.add_argument("--frames", type=int, default=60)
+
+    syn = sub.add_parser("synthesize", help="Write a synthetic recording.")
+    syn.add_argument("--out", required=True)
+    syn.add_argument("--bays", type=int, default=40)
+    syn.add_argument("--spheres", type=int, default=4)
+    syn.add_argument("--trucks", type=int, default=400)
+    syn.add_argument("--hours", type=float, default=24.0)
+    syn.add_argument("--interval", type=float, default=60.0)
+    syn.add_argument("--seed", type=int, default=7)
+
+    rep = sub.add_parser("replay", help="Replay a recording through the watchdog.")
+    rep.add_argument("path")
+    rep.add_argument("--snapshot-mode", choices=["full", "incremental", "compact", "pushdown"], default="full")
+    rep.add_argument("--forecast-mode", choices=["simple", "sphere"], default="simple")
+    rep.add_argument("--dedup-minutes", type=int, default=30)
+    rep.add_argument("--incident-tracking", choices=["ids", "watermark"], default="ids")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        frames = record(args.db_url, args.out, interval_seconds=args.interval, frames=args.frames)
+        print(f"Recorded {frames} frame(s) to {args.out}")
+    elif args.command == "synthesize":
+        frames = synthesize(
+            args.out,
+            bays=args.bays,
+            spheres=args.spheres,
+            trucks=args.trucks,
+            hours=args.hours,
+            interval_seconds=args.interval,
+            seed=args.seed,
+        )
+        print(f"Wrote {frames} synthetic frame(s) to {args.out}")
+    else:
+        report = replay(
+            args.path,
+            snapshot_mode=args.snapshot_mode,
+            forecast_mode=args.forecast_mode,
+            dedup_minutes=args.dedup_minutes,
+            incident_tracking=args.incident_tracking,
+        )
+        print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,33 @@
 """
 Start-of-Day Executive Briefing synthesis engine for EIPL terminal operations.
+
+Metrics are read either one statement at a time or, with ``single_query=True``
+(``BRIEFING_SINGLE_QUERY=1`` for the HTTP wrapper), in a single round trip.
+
+``get_executive_briefings`` returns briefings for many terminals (rows tagged with ``terminal_id``)
+from one grouped statement, however many terminals are requested.
+
+With ``include_trends=True`` a ``trends`` section is added from the hourly rollup tables maintained
+by ``eipl_briefing_rollup.py``; it never reads raw history.
+
+The HTTP wrapper serves from a ``BriefingCache`` when one is configured (see ``set_briefing_cache``).
 """
 
 from __future__ import annotations
 
-from datetime import date, datetime, timezone
-from typing import Any, Dict, Optional
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
-from sqlalchemy import Date, DateTime, Float, Integer, String, func, select
+from sqlalchemy import JSON, Date, DateTime, Float, Integer, String, and_, case, func, select, union
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 
+from eipl_briefing_cache import BriefingCache
+from eipl_session_hooks import rehook
+
+_BRIEFING_CACHE: Optional[BriefingCache] = None
+_BRIEFING_CACHE_UNHOOK: Optional[Callable[[], None]] = None
+
 
 class Base(DeclarativeBase):
     pass
@@ -21,6 +39,8 @@ class TerminalBay(Base):
     bay_id: Mapped[str] = mapped_column(String(64), primary_key=True)
     status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     active_truck_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Only read by the multi-terminal briefings (get_executive_briefings); NULL for single-terminal rows.
+    terminal_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, deferred=True)
 
 
 class LPGInventory(Base):
@@ -29,6 +49,8 @@ class LPGInventory(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     horton_sphere_level_percent: Mapped[float] = mapped_column(Float, nullable=False)
     recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Only read by the multi-terminal briefings (get_executive_briefings); NULL for single-terminal rows.
+    terminal_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, deferred=True)
 
 
 class GateQueue(Base):
@@ -38,6 +60,8 @@ class GateQueue(Base):
     truck_id: Mapped[str] = mapped_column(String(64), nullable=False)
     queue_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     peso_expiry_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    # Only read by the multi-terminal briefings (get_executive_briefings); NULL for single-terminal rows.
+    terminal_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, deferred=True)
 
 
 class SafetyIncident(Base):
@@ -47,43 +71,171 @@ class SafetyIncident(Base):
     status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     description: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Only read by the multi-terminal briefings (get_executive_briefings); NULL for single-terminal rows.
+    terminal_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, deferred=True)
 
 
-def get_executive_briefing(db_session: Session) -> Dict[str, Any]:
-    latest_inventory = db_session.execute(
-        select(LPGInventory).order_by(LPGInventory.recorded_at.desc()).limit(1)
-    ).scalar_one_or_none()
-    lpg_percent = float(latest_inventory.horton_sphere_level_percent) if latest_inventory else 0.0
+class BriefingHourlyRollup(Base):
+    """One hour of briefing aggregates for one terminal ("" for untagged rows)."""
 
-    open_incidents = int(
-        db_session.execute(
-            select(func.count()).select_from(SafetyIncident).where(
-                func.coalesce(SafetyIncident.status, "OPEN").not_in(["CLOSED", "RESOLVED"])
-            )
-        ).scalar_one()
-    )
+    __tablename__ = "briefing_hourly_rollup"
 
-    queue_length = int(
-        db_session.execute(select(func.count()).select_from(GateQueue)).scalar_one()
-    )
+    terminal_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    inventory_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    inventory_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    inventory_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    inventory_readings: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    queue_length_max: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    queue_length_last: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    active_bays_max: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    active_bays_last: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    open_incidents_last: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    incidents_opened: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    incidents_closed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class BriefingRollupState(Base):
+    """Rollup watermarks, committed in the same transaction as the rollup rows they cover."""
+
+    __tablename__ = "briefing_rollup_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    state: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
-    active_trips = int(
-        db_session.execute(
-            select(func.count()).select_from(TerminalBay).where(
-                func.coalesce(TerminalBay.status, "").in_(["ACTIVE", "DISCHARGING", "LOADING", "OCCUPIED"])
-            )
-        ).scalar_one()
+
+OPEN_INCIDENT_EXCLUDED_STATUSES = ("CLOSED", "RESOLVED")
+ACTIVE_BAY_STATUSES = ("ACTIVE", "DISCHARGING", "LOADING", "OCCUPIED")
+UNTAGGED_TERMINAL = ""
+SHIFT_HOURS = 8
+
+
+def open_incident_clause() -> Any:
+    return func.coalesce(SafetyIncident.status, "OPEN").not_in(OPEN_INCIDENT_EXCLUDED_STATUSES)
+
+
+def active_bay_clause() -> Any:
+    return func.coalesce(TerminalBay.status, "").in_(ACTIVE_BAY_STATUSES)
+
+
+def _expired_peso_clause(today: date) -> Any:
+    return and_(GateQueue.peso_expiry_date.is_not(None), GateQueue.peso_expiry_date < today)
+
+
+def briefing_metric_stmts(today: date) -> Dict[str, Any]:
+    """The independent per-metric statements, each returning one scalar."""
+    return {
+        "lpg_percent": select(LPGInventory.horton_sphere_level_percent)
+        .order_by(LPGInventory.recorded_at.desc())
+        .limit(1),
+        "open_incidents": select(func.count()).select_from(SafetyIncident).where(open_incident_clause()),
+        "queue_length": select(func.count()).select_from(GateQueue),
+        "active_trips": select(func.count()).select_from(TerminalBay).where(active_bay_clause()),
+        "expired_peso": select(func.count()).select_from(GateQueue).where(_expired_peso_clause(today)),
+    }
+
+
+def top_incident_stmt() -> Any:
+    return (
+        select(SafetyIncident.incident_id)
+        .where(open_incident_clause())
+        .order_by(SafetyIncident.created_at.desc())
+        .limit(1)
     )
 
-    today = date.today()
-    expired_peso = int(
-        db_session.execute(
-            select(func.count()).select_from(GateQueue).where(
-                GateQueue.peso_expiry_date.is_not(None),
-                GateQueue.peso_expiry_date < today,
-            )
-        ).scalar_one()
+
+def briefing_metrics_from_scalars(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize per-metric scalars (a missing inventory reading counts as 0%)."""
+    lpg_percent = values.get("lpg_percent")
+    return {
+        "lpg_percent": float(lpg_percent) if lpg_percent is not None else 0.0,
+        "open_incidents": int(values["open_incidents"]),
+        "queue_length": int(values["queue_length"]),
+        "active_trips": int(values["active_trips"]),
+        "expired_peso": int(values["expired_peso"]),
+        "top_incident_id": values.get("top_incident_id"),
+    }
+
+
+def _fetch_briefing_metrics(db_session: Session) -> Dict[str, Any]:
+    """One statement per metric, plus the newest open incident when there is one."""
+    values = {
+        name: db_session.execute(stmt).scalar_one_or_none()
+        for name, stmt in briefing_metric_stmts(date.today()).items()
+    }
+    if values["open_incidents"]:
+        values["top_incident_id"] = db_session.execute(top_incident_stmt()).scalar_one_or_none()
+    return briefing_metrics_from_scalars(values)
+
+
+def briefing_metrics_stmt(today: date) -> Any:
+    """
+    Every briefing metric, and the newest open incident id, as a single-row SELECT.
+
+    Both ``gate_queue`` counts come from one CTE; the remaining metrics are scalar subqueries.
+    """
+    queue = (
+        select(
+            func.count().label("queue_length"),
+            func.coalesce(func.sum(case((_expired_peso_clause(today), 1), else_=0)), 0).label("expired_peso"),
+        )
+        .select_from(GateQueue)
+        .cte("queue_counts")
     )
+    lpg_percent = (
+        select(LPGInventory.horton_sphere_level_percent)
+        .order_by(LPGInventory.recorded_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    open_incidents = (
+        select(func.count()).select_from(SafetyIncident).where(open_incident_clause()).scalar_subquery()
+    )
+    active_trips = select(func.count()).select_from(TerminalBay).where(active_bay_clause()).scalar_subquery()
+    top_incident_id = top_incident_stmt().scalar_subquery()
+    return select(
+        lpg_percent.label("lpg_percent"),
+        open_incidents.label("open_incidents"),
+        queue.c.queue_length,
+        active_trips.label("active_trips"),
+        queue.c.expired_peso,
+        top_incident_id.label("top_incident_id"),
+    ).select_from(queue)
+
+
+def _fetch_briefing_metrics_single_query(db_session: Session) -> Dict[str, Any]:
+    row = db_session.execute(briefing_metrics_stmt(date.today())).one()
+    return briefing_metrics_from_scalars(row._asdict())
+
+
+def get_executive_briefing(
+    db_session: Session, *, single_query: bool = False, include_trends: bool = False
+) -> Dict[str, Any]:
+    """
+    Synthesize the start-of-day briefing.
+
+    ``single_query`` reads every metric, and the top open incident, in one round trip
+    (``briefing_metrics_stmt``) instead of up to six sequential statements. ``include_trends``
+    adds the last 24 hours from the rollup tables (one more statement).
+    """
+    if single_query:
+        briefing_metrics = _fetch_briefing_metrics_single_query(db_session)
+    else:
+        briefing_metrics = _fetch_briefing_metrics(db_session)
+    briefing = synthesize_briefing(briefing_metrics)
+    if include_trends:
+        briefing["trends"] = get_briefing_trends(db_session)
+    return briefing
+
+
+def synthesize_briefing(briefing_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Status, headline and primary action from the metrics dict both fetch paths produce."""
+    lpg_percent = briefing_metrics["lpg_percent"]
+    open_incidents = briefing_metrics["open_incidents"]
+    queue_length = briefing_metrics["queue_length"]
+    active_trips = briefing_metrics["active_trips"]
+    expired_peso = briefing_metrics["expired_peso"]
 
     if open_incidents > 0 or lpg_percent > 90:
         status = "CRITICAL"
@@ -93,12 +245,7 @@ def get_executive_briefing(db_session: Session) -> Dict[str, Any]:
         status = "STABLE"
 
     if status == "CRITICAL" and open_incidents > 0:
-        top_incident = db_session.execute(
-            select(SafetyIncident).where(
-                func.coalesce(SafetyIncident.status, "OPEN").not_in(["CLOSED", "RESOLVED"])
-            ).order_by(SafetyIncident.created_at.desc()).limit(1)
-        ).scalar_one_or_none()
-        incident_id = top_incident.incident_id if top_incident else "latest"
+        incident_id = briefing_metrics["top_incident_id"] or "latest"
         headline = "Gantry stalled due to open incident."
         primary_action = {
             "label": "Resolve Bay Incident",
@@ -137,6 +284,268 @@ def get_executive_briefing(db_session: Session) -> Dict[str, Any]:
     }
 
 
+def _empty_briefing_metrics() -> Dict[str, Any]:
+    return {
+        "lpg_percent": 0.0,
+        "open_incidents": 0,
+        "queue_length": 0,
+        "active_trips": 0,
+        "expired_peso": 0,
+        "top_incident_id": None,
+    }
+
+
+def terminal_briefing_metrics_stmt(today: date, terminal_ids: Optional[Sequence[str]] = None) -> Any:
+    """
+    One row of briefing metrics per terminal, for ``terminal_ids`` or every tagged terminal.
+
+    Counts are grouped by ``terminal_id``; the latest inventory reading and the newest open
+    incident come from ``ROW_NUMBER()`` windows partitioned by terminal. A terminal appears when
+    any source table has a row for it.
+    """
+
+    def scoped(stmt: Any, column: Any) -> Any:
+        stmt = stmt.where(column.is_not(None))
+        return stmt.where(column.in_(list(terminal_ids))) if terminal_ids is not None else stmt
+
+    ranked_inventory = scoped(
+        select(
+            LPGInventory.terminal_id,
+            LPGInventory.horton_sphere_level_percent,
+            func.row_number()
+            .over(partition_by=LPGInventory.terminal_id, order_by=LPGInventory.recorded_at.desc())
+            .label("rank"),
+        ),
+        LPGInventory.terminal_id,
+    ).subquery("ranked_inventory")
+    inventory = (
+        select(ranked_inventory.c.terminal_id, ranked_inventory.c.horton_sphere_level_percent.label("lpg_percent"))
+        .where(ranked_inventory.c.rank == 1)
+        .cte("terminal_inventory")
+    )
+
+    ranked_incidents = scoped(
+        select(
+            SafetyIncident.terminal_id,
+            SafetyIncident.incident_id,
+            func.count().over(partition_by=SafetyIncident.terminal_id).label("open_incidents"),
+            func.row_number()
+            .over(partition_by=SafetyIncident.terminal_id, order_by=SafetyIncident.created_at.desc())
+            .label("rank"),
+        ).where(open_incident_clause()),
+        SafetyIncident.terminal_id,
+    ).subquery("ranked_incidents")
+    incidents = (
+        select(
+            ranked_incidents.c.terminal_id,
+            ranked_incidents.c.open_incidents,
+            ranked_incidents.c.incident_id.label("top_incident_id"),
+        )
+        .where(ranked_incidents.c.rank == 1)
+        .cte("terminal_incidents")
+    )
+
+    queue = scoped(
+        select(
+            GateQueue.terminal_id,
+            func.count().label("queue_length"),
+            func.sum(case((_expired_peso_clause(today), 1), else_=0)).label("expired_peso"),
+        ),
+        GateQueue.terminal_id,
+    ).group_by(GateQueue.terminal_id).cte("terminal_queue")
+
+    bays = scoped(
+        select(
+            TerminalBay.terminal_id,
+            func.sum(case((active_bay_clause(), 1), else_=0)).label("active_trips"),
+        ),
+        TerminalBay.terminal_id,
+    ).group_by(TerminalBay.terminal_id).cte("terminal_bays_active")
+
+    terminals = union(
+        *(select(cte.c.terminal_id) for cte in (inventory, incidents, queue, bays))
+    ).subquery("terminals")
+
+    return (
+        select(
+            terminals.c.terminal_id,
+            inventory.c.lpg_percent,
+            func.coalesce(incidents.c.open_incidents, 0).label("open_incidents"),
+            func.coalesce(queue.c.queue_length, 0).label("queue_length"),
+            func.coalesce(bays.c.active_trips, 0).label("active_trips"),
+            func.coalesce(queue.c.expired_peso, 0).label("expired_peso"),
+            incidents.c.top_incident_id,
+        )
+        .select_from(terminals)
+        .outerjoin(inventory, inventory.c.terminal_id == terminals.c.terminal_id)
+        .outerjoin(incidents, incidents.c.terminal_id == terminals.c.terminal_id)
+        .outerjoin(queue, queue.c.terminal_id == terminals.c.terminal_id)
+        .outerjoin(bays, bays.c.terminal_id == terminals.c.terminal_id)
+        .order_by(terminals.c.terminal_id)
+    )
+
+
+def get_executive_briefings(
+    db_session: Session, terminal_ids: Optional[Sequence[str]] = None, *, include_trends: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Briefings keyed by terminal id, for ``terminal_ids`` (in that order) or every tagged terminal.
+
+    One statement regardless of the number of terminals (two with ``include_trends``). A requested
+    terminal with no rows gets the same briefing an empty single-terminal database would.
+    """
+    if terminal_ids is not None:
+        terminal_ids = list(dict.fromkeys(terminal_ids))
+        if not terminal_ids:
+            return {}
+    rows = db_session.execute(terminal_briefing_metrics_stmt(date.today(), terminal_ids)).all()
+    metrics_by_terminal = {
+        row.terminal_id: {
+            "lpg_percent": float(row.lpg_percent) if row.lpg_percent is not None else 0.0,
+            "open_incidents": int(row.open_incidents),
+            "queue_length": int(row.queue_length),
+            "active_trips": int(row.active_trips),
+            "expired_peso": int(row.expired_peso),
+            "top_incident_id": row.top_incident_id,
+        }
+        for row in rows
+    }
+    ordered = terminal_ids if terminal_ids is not None else list(metrics_by_terminal)
+    briefings = {
+        terminal_id: synthesize_briefing(metrics_by_terminal.get(terminal_id) or _empty_briefing_metrics())
+        for terminal_id in ordered
+    }
+    if include_trends and briefings:
+        for terminal_id, trends in _trends_by_terminal(db_session, list(briefings)).items():
+            briefings[terminal_id]["trends"] = trends
+    return briefings
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; every stored timestamp is UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def hour_bucket(value: datetime) -> datetime:
+    return _as_utc(value).replace(minute=0, second=0, microsecond=0)
+
+
+def trend_rollup_stmt(terminal_ids: Sequence[str], hours: int = 24, now: Optional[datetime] = None) -> Any:
+    since = hour_bucket(now or datetime.now(timezone.utc)) - timedelta(hours=hours - 1)
+    return (
+        select(BriefingHourlyRollup)
+        .where(
+            BriefingHourlyRollup.terminal_id.in_(list(terminal_ids)),
+            BriefingHourlyRollup.bucket_start >= since,
+        )
+        .order_by(BriefingHourlyRollup.terminal_id, BriefingHourlyRollup.bucket_start)
+    )
+
+
+def _trends_by_terminal(
+    db_session: Session,
+    terminal_ids: Sequence[str],
+    hours: int = 24,
+    now: Optional[datetime] = None,
+    shift_start_hour_utc: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    rows = db_session.execute(trend_rollup_stmt(terminal_ids, hours, now)).scalars()
+    return trends_from_rollups(rows, terminal_ids, hours, shift_start_hour_utc)
+
+
+def trends_from_rollups(
+    rows: Iterable[BriefingHourlyRollup],
+    terminal_ids: Sequence[str],
+    hours: int = 24,
+    shift_start_hour_utc: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    hourly_by_terminal: Dict[str, List[Dict[str, Any]]] = {terminal_id: [] for terminal_id in terminal_ids}
+    shifts_by_terminal: Dict[str, Dict[datetime, Dict[str, Any]]] = {terminal_id: {} for terminal_id in terminal_ids}
+    for row in rows:
+        bucket = _as_utc(row.bucket_start)
+        hourly_by_terminal[row.terminal_id].append(
+            {
+                "hour": bucket.isoformat(),
+                "inventory_min": row.inventory_min,
+                "inventory_max": row.inventory_max,
+                "inventory_avg": (
+                    round(row.inventory_sum / row.inventory_readings, 2) if row.inventory_readings else None
+                ),
+                "queue_length_peak": row.queue_length_max,
+                "active_bays_peak": row.active_bays_max,
+                "incidents_opened": row.incidents_opened,
+                "incidents_closed": row.incidents_closed,
+            }
+        )
+        offset = (bucket.hour - shift_start_hour_utc) % SHIFT_HOURS
+        shift_start = bucket - timedelta(hours=offset)
+        shift = shifts_by_terminal[row.terminal_id].setdefault(
+            shift_start, {"shift_start": shift_start.isoformat(), "incidents_opened": 0, "incidents_closed": 0}
+        )
+        shift["incidents_opened"] += row.incidents_opened
+        shift["incidents_closed"] += row.incidents_closed
+
+    trends: Dict[str, Dict[str, Any]] = {}
+    for terminal_id, hourly in hourly_by_terminal.items():
+        averages = [hour["inventory_avg"] for hour in hourly if hour["inventory_avg"] is not None]
+        trends[terminal_id] = {
+            "window_hours": hours,
+            "inventory_change_percent": round(averages[-1] - averages[0], 2) if len(averages) > 1 else None,
+            "hourly": hourly,
+            "shifts": list(shifts_by_terminal[terminal_id].values()),
+        }
+    return trends
+
+
+def get_briefing_trends(
+    db_session: Session,
+    terminal_id: str = UNTAGGED_TERMINAL,
+    *,
+    hours: int = 24,
+    now: Optional[datetime] = None,
+    shift_start_hour_utc: int = 0,
+) -> Dict[str, Any]:
+    """
+    Hourly inventory, queue, bay and incident trends for the last ``hours`` hours, plus incidents
+    per ``SHIFT_HOURS``-hour shift. Reads only ``briefing_hourly_rollup``; hours the rollup has not
+    covered are absent rather than zero.
+    """
+    return _trends_by_terminal(
+        db_session, [terminal_id], hours=hours, now=now, shift_start_hour_utc=shift_start_hour_utc
+    )[terminal_id]
+
+
+def set_briefing_cache(cache: Optional[BriefingCache]) -> Optional[BriefingCache]:
+    """
+    Serve ``get_executive_briefing_http`` from ``cache`` (None disables) and return the previous cache.
+
+    Commits that write a briefing source table through any SQLAlchemy ``Session`` invalidate it.
+    """
+    global _BRIEFING_CACHE, _BRIEFING_CACHE_UNHOOK
+    previous, _BRIEFING_CACHE = _BRIEFING_CACHE, cache
+    if cache is not previous:
+        _BRIEFING_CACHE_UNHOOK = rehook(_BRIEFING_CACHE_UNHOOK, cache, lambda c: c.invalidate_on_commit(Session))
+    return previous
+
+
+def invalidate_briefing() -> None:
+    """For writers outside SQLAlchemy (e.g. the Next.js API) after a new incident or inventory reading."""
+    if _BRIEFING_CACHE is not None:
+        _BRIEFING_CACHE.invalidate()
+
+
 def get_executive_briefing_http(db_session: Session) -> Dict[str, Any]:
     # Thin API wrapper kept separate so this function can be mounted in Flask/FastAPI.
-    return get_executive_briefing(db_session)
+    single_query = os.getenv("BRIEFING_SINGLE_QUERY", "").strip() == "1"
+    include_trends = os.getenv("BRIEFING_INCLUDE_TRENDS", "").strip() == "1"
+    if _BRIEFING_CACHE is None:
+        return get_executive_briefing(db_session, single_query=single_query, include_trends=include_trends)
+
+    # Refreshes may outlive this request, so they run on their own session.
+    bind = db_session.get_bind()
+
+    def compute() -> Dict[str, Any]:
+        with Session(bind=bind) as session:
+            return get_executive_briefing(session, single_query=single_query, include_trends=include_trends)
+
+    return _BRIEFING_CACHE.get(compute)
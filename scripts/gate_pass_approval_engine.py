@@ -5,15 +5,40 @@ Regulatory focus:
 - PESO license validity
 - OISD-144 aligned safety checks (spark arrestor, earthing relay calibration)
 - Motor vehicles fitness validity
+
+Compliance records can be served from the shared ``ComplianceCache`` (see ``set_compliance_cache``).
+Convoys are pre-checked in bulk with ``process_gate_passes``. Audit rows can be group-committed by
+an ``AuditLogWriter`` (see ``set_audit_writer``). Compliance snapshots can be stored once per distinct
+content in ``gate_pass_compliance_snapshot`` (see ``set_snapshot_dedup``).
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import uuid
 from datetime import date, datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
-from sqlalchemy import JSON, Boolean, Date, DateTime, String, select
+from sqlalchemy import JSON, Boolean, CheckConstraint, Date, DateTime, FetchedValue, ForeignKey, String, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy.orm.attributes import set_committed_value
+
+from eipl_audit_writer import AuditLogWriter
+from eipl_compliance_cache import ComplianceCache
+from eipl_session_hooks import rehook
+
+COMPLIANCE_VIEW = "gate_pass"
+COMPLIANCE_DATE_FIELDS = ("peso_license_validity", "earthing_relay_calibration", "rc_fitness_certificate")
+# Keeps each IN list well under driver parameter limits (SQLite: 32766).
+BULK_LOOKUP_CHUNK = 1000
+
+_COMPLIANCE_CACHE: Optional[ComplianceCache] = None
+_COMPLIANCE_CACHE_UNHOOK: Optional[Callable[[], None]] = None
+_AUDIT_WRITER: Optional[AuditLogWriter] = None
+_SNAPSHOT_DEDUP = False
 
 
 class Base(DeclarativeBase):
@@ -33,13 +58,65 @@ class TruckComplianceRecord(Base):
 
 class GatePassAuditLog(Base):
     __tablename__ = "gate_pass_audit_log"
+    __table_args__ = (
+        CheckConstraint(
+            "(compliance_snapshot IS NULL) <> (snapshot_sha256 IS NULL)", name="ck_gate_pass_audit_log_snapshot"
+        ),
+    )
+    # Never read server-side values back after an INSERT (see snapshot_sha256).
+    __mapper_args__ = {"eager_defaults": False}
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     truck_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     approved_by_user_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
-    compliance_snapshot: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # The snapshot inline, or NULL when deduplicated into snapshot_sha256 (see audit_snapshot).
+    compliance_snapshot: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON(none_as_null=True), nullable=True)
     gate_pass_issued: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Added by sql/gate_pass_snapshot_dedup.sql. Deferred, and left out of INSERTs while unset
+    # (FetchedValue), so tables without the column still take inline snapshots.
+    snapshot_sha256: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        ForeignKey("gate_pass_compliance_snapshot.snapshot_hash"),
+        nullable=True,
+        deferred=True,
+        server_default=FetchedValue(),
+    )
+
+
+class ComplianceSnapshot(Base):
+    """One row per distinct compliance snapshot, keyed by the SHA-256 of its canonical JSON."""
+
+    __tablename__ = "gate_pass_compliance_snapshot"
+
+    snapshot_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    snapshot: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class TruckComplianceVerdict(Base):
+    """
+    Materialized pre-check per truck, kept current by ``eipl_compliance_verdicts``.
+
+    The source fields are copied so a gate check reads this row alone. ``next_expiry`` is the
+    earliest dated certificate still valid on ``evaluated_on``; the flags hold until that day passes.
+    """
+
+    __tablename__ = "truck_compliance_verdict"
+
+    truck_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    transporter_name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    peso_license_validity: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    spark_arrestor_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    earthing_relay_calibration: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    rc_fitness_certificate: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    peso_license_valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    spark_arrestor_ok: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    earthing_relay_valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    rc_fitness_valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    cleared: Mapped[bool] = mapped_column(Boolean, nullable=False, index=True)
+    next_expiry: Mapped[Optional[date]] = mapped_column(Date, nullable=True, index=True)
+    evaluated_on: Mapped[date] = mapped_column(Date, nullable=False)
 
 
 def _to_utc_iso(dt: Optional[datetime]) -> Optional[str]:
@@ -50,12 +127,244 @@ def _to_utc_iso(dt: Optional[datetime]) -> Optional[str]:
     return dt.isoformat()
 
 
-def process_gate_pass(db_session: Session, truck_id: str, user_id: str) -> Dict[str, Any]:
+def set_compliance_cache(cache: Optional[ComplianceCache]) -> Optional[ComplianceCache]:
+    """
+    Serve compliance lookups from ``cache`` (None disables) and return the previous cache.
+
+    Commits that write ``truck_compliance`` through any SQLAlchemy ``Session`` invalidate the
+    affected trucks in ``cache``.
+    """
+    global _COMPLIANCE_CACHE, _COMPLIANCE_CACHE_UNHOOK
+    previous, _COMPLIANCE_CACHE = _COMPLIANCE_CACHE, cache
+    if cache is not previous:
+        _COMPLIANCE_CACHE_UNHOOK = rehook(_COMPLIANCE_CACHE_UNHOOK, cache, lambda c: c.invalidate_on_commit(Session))
+    return previous
+
+
+def set_audit_writer(writer: Optional[AuditLogWriter]) -> Optional[AuditLogWriter]:
+    """
+    Write ``approve_gate_pass`` audit rows through ``writer`` (None commits each on the caller's
+    session) and return the previous writer.
+    """
+    global _AUDIT_WRITER
+    previous, _AUDIT_WRITER = _AUDIT_WRITER, writer
+    if writer is not None and writer.prepare is None:
+        writer.prepare = prepare_audit_rows
+    return previous
+
+
+def set_snapshot_dedup(enabled: bool) -> bool:
+    """
+    Store new audit snapshots once per distinct content in ``gate_pass_compliance_snapshot`` and
+    keep only its hash in the audit row's ``snapshot_sha256``, leaving ``compliance_snapshot`` NULL
+    (apply sql/gate_pass_snapshot_dedup.sql first). Returns the previous setting.
+    """
+    global _SNAPSHOT_DEDUP
+    previous, _SNAPSHOT_DEDUP = _SNAPSHOT_DEDUP, enabled
+    return previous
+
+
+def get_compliance_cache() -> Optional[ComplianceCache]:
+    return _COMPLIANCE_CACHE
+
+
+def get_audit_writer() -> Optional[AuditLogWriter]:
+    return _AUDIT_WRITER
+
+
+def snapshot_dedup_enabled() -> bool:
+    return _SNAPSHOT_DEDUP
+
+
+def compliance_stmt(truck_ids: Sequence[str]) -> Any:
+    return select(TruckComplianceRecord).where(TruckComplianceRecord.truck_id.in_(truck_ids))
+
+
+def verdict_stmt(truck_ids: Sequence[str]) -> Any:
+    return select(TruckComplianceVerdict).where(TruckComplianceVerdict.truck_id.in_(truck_ids))
+
+
+def compliance_entry(record: TruckComplianceRecord) -> Dict[str, Any]:
+    """The cached form of a compliance record (JSON-serializable; see ``record_from_entry``)."""
+    return {
+        "truck_id": record.truck_id,
+        "transporter_name": record.transporter_name,
+        "peso_license_validity": record.peso_license_validity.isoformat() if record.peso_license_validity else None,
+        "spark_arrestor_status": record.spark_arrestor_status,
+        "earthing_relay_calibration": (
+            record.earthing_relay_calibration.isoformat() if record.earthing_relay_calibration else None
+        ),
+        "rc_fitness_certificate": record.rc_fitness_certificate.isoformat() if record.rc_fitness_certificate else None,
+    }
+
+
+def record_from_entry(entry: Dict[str, Any]) -> TruckComplianceRecord:
+    # Transient instance: never added to a session, only read by the checks below.
+    values = dict(entry)
+    for name in COMPLIANCE_DATE_FIELDS:
+        values[name] = date.fromisoformat(values[name]) if values.get(name) else None
+    return TruckComplianceRecord(**values)
+
+
+def _load_compliance_record(db_session: Session, truck_id: str) -> Optional[TruckComplianceRecord]:
+    if _COMPLIANCE_CACHE is None:
+        return db_session.execute(
+            select(TruckComplianceRecord).where(TruckComplianceRecord.truck_id == truck_id)
+        ).scalar_one_or_none()
+
+    def load(missing: List[str]) -> Dict[str, Dict[str, Any]]:
+        rows = db_session.execute(compliance_stmt(missing)).scalars()
+        return {row.truck_id: compliance_entry(row) for row in rows}
+
+    entry = _COMPLIANCE_CACHE.get(COMPLIANCE_VIEW, truck_id, load)
+    return record_from_entry(entry) if entry is not None else None
+
+
+def _load_compliance_records(
+    db_session: Session, truck_ids: Sequence[str]
+) -> Dict[str, TruckComplianceRecord]:
+    def fetch(wanted: List[str]) -> Iterable[TruckComplianceRecord]:
+        for start in range(0, len(wanted), BULK_LOOKUP_CHUNK):
+            chunk = wanted[start : start + BULK_LOOKUP_CHUNK]
+            yield from db_session.execute(compliance_stmt(chunk)).scalars()
+
+    if _COMPLIANCE_CACHE is None:
+        return {row.truck_id: row for row in fetch(list(truck_ids))}
+
+    def load(missing: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {row.truck_id: compliance_entry(row) for row in fetch(missing)}
+
+    entries = _COMPLIANCE_CACHE.get_many(COMPLIANCE_VIEW, truck_ids, load)
+    return {truck_id: record_from_entry(entry) for truck_id, entry in entries.items()}
+
+
+def warm_compliance_cache(db_session: Session) -> int:
+    """Load every truck's compliance record into the configured cache in one query."""
+    if _COMPLIANCE_CACHE is None:
+        return 0
+    rows = db_session.execute(select(TruckComplianceRecord)).scalars()
+    return _COMPLIANCE_CACHE.warm(COMPLIANCE_VIEW, {row.truck_id: compliance_entry(row) for row in rows})
+
+
+def verdict_result(
+    verdict: TruckComplianceVerdict, truck_id: str, user_id: str, today: date
+) -> Optional[Dict[str, Any]]:
+    """
+    The pre-check response from the verdict's stored flags, or None once a certificate may have
+    expired since ``evaluated_on`` (the daily sweep has not caught up) and the flags cannot be trusted.
+    """
+    if verdict.evaluated_on > today or (verdict.next_expiry is not None and verdict.next_expiry < today):
+        return None
+    flags = {
+        "peso_license_validity": verdict.peso_license_valid,
+        "spark_arrestor_status": verdict.spark_arrestor_ok,
+        "earthing_relay_calibration": verdict.earthing_relay_valid,
+        "rc_fitness_certificate": verdict.rc_fitness_valid,
+    }
+    details = _check_details(verdict)
+    checks = {name: {"valid": flags[name], "detail": details[name]} for name in flags}
+    return gate_pass_result(verdict, truck_id, user_id, today, checks=checks)
+
+
+def _verdict_results(
+    db_session: Session, truck_ids: Sequence[str], user_id: str, today: date
+) -> Dict[str, Dict[str, Any]]:
+    # Trucks without a current verdict (registered before the first refresh, or past next_expiry
+    # before the sweep) are checked against truck_compliance instead.
+    results: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(truck_ids), BULK_LOOKUP_CHUNK):
+        chunk = truck_ids[start : start + BULK_LOOKUP_CHUNK]
+        for verdict in db_session.execute(verdict_stmt(chunk)).scalars():
+            result = verdict_result(verdict, verdict.truck_id, user_id, today)
+            if result is not None:
+                results[verdict.truck_id] = result
+    missing = [truck_id for truck_id in truck_ids if truck_id not in results]
+    if missing:
+        records = _load_compliance_records(db_session, missing)
+        for truck_id in missing:
+            results[truck_id] = gate_pass_result(records.get(truck_id), truck_id, user_id, today)
+    return results
+
+
+def process_gate_pass(
+    db_session: Session, truck_id: str, user_id: str, *, use_verdicts: bool = False
+) -> Dict[str, Any]:
+    """
+    Pre-check one truck. ``use_verdicts`` answers from the stored flags of the materialized
+    ``truck_compliance_verdict`` row instead of ``truck_compliance`` (and the compliance cache).
+    Verdicts are only as fresh as their maintenance: enable
+    ``eipl_compliance_verdicts.set_verdict_maintenance`` in every process that writes compliance
+    through the ORM, and run ``eipl_compliance_verdicts.py --rebuild`` after any other write.
+    """
+    today = date.today()
+    if use_verdicts:
+        return _verdict_results(db_session, [truck_id], user_id, today)[truck_id]
+    record = _load_compliance_record(db_session, truck_id)
+    return gate_pass_result(record, truck_id, user_id, today)
+
+
+def process_gate_passes(
+    db_session: Session, truck_ids: Sequence[str], user_id: str, *, use_verdicts: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    ``process_gate_pass`` for a convoy: one result per entry of ``truck_ids``, in order.
+
+    Compliance records are read with one ``IN`` query (or from the compliance cache, with misses
+    loaded in one batch) and every truck is checked against the same ``today``.
+    """
+    wanted = list(dict.fromkeys(truck_ids))
+    if not wanted:
+        return []
     today = date.today()
-    record = db_session.execute(
-        select(TruckComplianceRecord).where(TruckComplianceRecord.truck_id == truck_id)
-    ).scalar_one_or_none()
+    if use_verdicts:
+        results = _verdict_results(db_session, wanted, user_id, today)
+    else:
+        records = _load_compliance_records(db_session, wanted)
+        results = {truck_id: gate_pass_result(records.get(truck_id), truck_id, user_id, today) for truck_id in wanted}
+    return [results[truck_id] for truck_id in truck_ids]
+
+
+def _check_details(record: Any) -> Dict[str, str]:
+    # ``record`` is a TruckComplianceRecord or a TruckComplianceVerdict (same field names).
+    return {
+        "peso_license_validity": (
+            f"Valid till {record.peso_license_validity}" if record.peso_license_validity else "Missing"
+        ),
+        "spark_arrestor_status": record.spark_arrestor_status or "Missing",
+        "earthing_relay_calibration": (
+            f"Calibrated till {record.earthing_relay_calibration}" if record.earthing_relay_calibration else "Missing"
+        ),
+        "rc_fitness_certificate": (
+            f"Valid till {record.rc_fitness_certificate}" if record.rc_fitness_certificate else "Missing"
+        ),
+    }
+
+
+def precheck(record: TruckComplianceRecord, today: date) -> Dict[str, Dict[str, Any]]:
+    """Per-check validity and detail for one compliance record, as of ``today``."""
+    valid = {
+        "peso_license_validity": bool(record.peso_license_validity and record.peso_license_validity >= today),
+        "spark_arrestor_status": str(record.spark_arrestor_status or "").strip().upper() in {"OK", "PASS", "VALID"},
+        "earthing_relay_calibration": bool(
+            record.earthing_relay_calibration and record.earthing_relay_calibration >= today
+        ),
+        "rc_fitness_certificate": bool(record.rc_fitness_certificate and record.rc_fitness_certificate >= today),
+    }
+    details = _check_details(record)
+    return {name: {"valid": valid[name], "detail": details[name]} for name in valid}
+
 
+def gate_pass_result(
+    record: Optional[Any],
+    truck_id: str,
+    user_id: str,
+    today: date,
+    checks: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    The pre-check response for one truck's compliance record (None when it has none). ``checks``
+    overrides ``precheck(record, today)``, e.g. with a verdict's stored flags.
+    """
     if record is None:
         return {
             "status": "BLOCKED",
@@ -70,31 +379,8 @@ def process_gate_pass(db_session: Session, truck_id: str, user_id: str) -> Dict[
             },
         }
 
-    checks = {
-        "peso_license_validity": {
-            "valid": bool(record.peso_license_validity and record.peso_license_validity >= today),
-            "detail": f"Valid till {record.peso_license_validity}" if record.peso_license_validity else "Missing",
-        },
-        "spark_arrestor_status": {
-            "valid": str(record.spark_arrestor_status or "").strip().upper() in {"OK", "PASS", "VALID"},
-            "detail": record.spark_arrestor_status or "Missing",
-        },
-        "earthing_relay_calibration": {
-            "valid": bool(record.earthing_relay_calibration and record.earthing_relay_calibration >= today),
-            "detail": (
-                f"Calibrated till {record.earthing_relay_calibration}"
-                if record.earthing_relay_calibration
-                else "Missing"
-            ),
-        },
-        "rc_fitness_certificate": {
-            "valid": bool(record.rc_fitness_certificate and record.rc_fitness_certificate >= today),
-            "detail": (
-                f"Valid till {record.rc_fitness_certificate}" if record.rc_fitness_certificate else "Missing"
-            ),
-        },
-    }
-
+    if checks is None:
+        checks = precheck(record, today)
     failed = [name for name, value in checks.items() if not bool(value["valid"])]
 
     if failed:
@@ -135,24 +421,140 @@ def process_gate_pass(db_session: Session, truck_id: str, user_id: str) -> Dict[
     }
 
 
-def approve_gate_pass(
-    db_session: Session,
-    *,
+def new_audit_log(
     truck_id: str,
     approved_by_user_id: str,
     compliance_snapshot: Dict[str, Any],
-    gate_pass_issued: bool = True,
+    gate_pass_issued: bool,
 ) -> GatePassAuditLog:
     stamp = datetime.now(timezone.utc)
-    log = GatePassAuditLog(
-        id=f"gpa-{truck_id}-{int(stamp.timestamp())}",
+    return GatePassAuditLog(
+        # Fixed length (36) whatever the truck id, and unique for repeat approvals in the same second.
+        id=f"gpa-{uuid.uuid4().hex}",
         truck_id=truck_id,
         approved_by_user_id=approved_by_user_id,
         timestamp=stamp,
         compliance_snapshot=compliance_snapshot,
         gate_pass_issued=gate_pass_issued,
     )
+
+
+def snapshot_hash(snapshot: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON (sorted keys, no whitespace), so equal snapshots hash alike."""
+    canonical = json.dumps(snapshot, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def store_snapshots(connection: Connection, snapshots: Dict[str, Dict[str, Any]]) -> None:
+    """Insert the snapshots (keyed by hash) that are not stored yet."""
+    if not snapshots:
+        return
+    table = ComplianceSnapshot.__table__
+    stamp = datetime.now(timezone.utc)
+    rows = [{"snapshot_hash": key, "snapshot": value, "created_at": stamp} for key, value in snapshots.items()]
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        connection.execute(dialect_insert(table).on_conflict_do_nothing(index_elements=["snapshot_hash"]), rows)
+        return
+    existing = set(
+        connection.execute(select(table.c.snapshot_hash).where(table.c.snapshot_hash.in_(list(snapshots)))).scalars()
+    )
+    missing = [row for row in rows if row["snapshot_hash"] not in existing]
+    if missing:
+        connection.execute(insert(table), missing)
+
+
+def dedup_snapshots(connection: Connection, snapshots: List[Dict[str, Any]]) -> List[str]:
+    """Store ``snapshots`` in the snapshot table and return their hashes, in order."""
+    keys = [snapshot_hash(snapshot) for snapshot in snapshots]
+    store_snapshots(connection, dict(zip(keys, snapshots)))
+    return keys
+
+
+def dedup_audit_snapshot(connection: Connection, log: GatePassAuditLog) -> None:
+    """With snapshot dedup enabled, store ``log``'s snapshot and keep only its hash on the log."""
+    if _SNAPSHOT_DEDUP and log.compliance_snapshot is not None:
+        log.snapshot_sha256 = dedup_snapshots(connection, [log.compliance_snapshot])[0]
+        log.compliance_snapshot = None
+
+
+def prepare_audit_rows(connection: Connection, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """``AuditLogWriter`` hook: deduplicates the rows' snapshots in the writer's transaction when enabled."""
+    if not _SNAPSHOT_DEDUP:
+        return rows
+    keys = dedup_snapshots(connection, [row["compliance_snapshot"] for row in rows])
+    return [dict(row, compliance_snapshot=None, snapshot_sha256=key) for row, key in zip(rows, keys)]
+
+
+def audit_snapshot(db_session: Session, log: GatePassAuditLog) -> Dict[str, Any]:
+    """
+    The compliance snapshot recorded for ``log``, whether inline or deduplicated. Raises
+    ``LookupError`` when the referenced snapshot row is missing.
+    """
+    if log.compliance_snapshot is not None:
+        return log.compliance_snapshot
+    key = log.snapshot_sha256
+    stored = db_session.get(ComplianceSnapshot, key)
+    if stored is None:
+        raise LookupError(f"Audit log {log.id} references missing compliance snapshot {key}.")
+    return stored.snapshot
+
+
+def approve_gate_pass(
+    db_session: Session,
+    *,
+    truck_id: str,
+    approved_by_user_id: str,
+    compliance_snapshot: Dict[str, Any],
+    gate_pass_issued: bool = True,
+) -> GatePassAuditLog:
+    """
+    Record a gate-pass decision. With an audit writer configured the row is written by the writer
+    and the returned log is transient; ``db_session`` is not touched. Otherwise the log is committed
+    on ``db_session`` and returned detached, readable without another query.
+    """
+    log = new_audit_log(truck_id, approved_by_user_id, compliance_snapshot, gate_pass_issued)
+    if _AUDIT_WRITER is not None:
+        _AUDIT_WRITER.write(writer_audit_row(log))
+        return log
+    dedup_audit_snapshot(db_session.connection(), log)
+    values = audit_log_values(log)
     db_session.add(log)
     db_session.commit()
-    db_session.refresh(log)
+    detach_committed(db_session, log, values)
     return log
+
+
+def detach_committed(db_session: Any, log: GatePassAuditLog, row: Dict[str, Any]) -> None:
+    """
+    Detach ``log`` after its commit, with ``row`` (every column value as written) as loaded state.
+    Commit expires the instance, and every column is set client-side, so this saves the SELECT the
+    next attribute read would otherwise issue. ``db_session`` may be a ``Session`` or ``AsyncSession``.
+    """
+    db_session.expunge(log)
+    for key, value in row.items():
+        set_committed_value(log, key, value)
+
+
+def audit_log_values(log: GatePassAuditLog) -> Dict[str, Any]:
+    return {column.key: getattr(log, column.key) for column in GatePassAuditLog.__table__.columns}
+
+
+def audit_log_row(log: GatePassAuditLog) -> Dict[str, Any]:
+    # An unset snapshot_sha256 is left out so rows also insert into tables without the column.
+    row = audit_log_values(log)
+    if row["snapshot_sha256"] is None:
+        del row["snapshot_sha256"]
+    return row
+
+
+def writer_audit_row(log: GatePassAuditLog) -> Dict[str, Any]:
+    """
+    The row to hand the audit writer for ``log``. The snapshot goes inline, since the writer's
+    prepare hook deduplicates it; ``log`` is reshaped to match the row as written.
+    """
+    row = audit_log_row(log)
+    if _SNAPSHOT_DEDUP:
+        log.snapshot_sha256, log.compliance_snapshot = snapshot_hash(log.compliance_snapshot), None
+    return row
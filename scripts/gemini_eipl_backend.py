@@ -2,9 +2,14 @@ from google import genai
 from google.genai import types
 import json
 
+from eipl_assistant_cache import create_assistant_cache_from_env
+
 # Initialize the Gemini Client
 client = genai.Client(api_key="YOUR_GEMINI_API_KEY")
 
+# Identical questions on unchanged terminal data share one model call (ASSISTANT_CACHE_TTL_SECONDS=0 disables)
+response_cache = create_assistant_cache_from_env()
+
 # 1. Define the Tool (The Action Button Generator)
 suggest_action_tool = types.FunctionDeclaration(
     name="suggest_dashboard_action",
@@ -32,6 +37,16 @@ If operations are stalled due to an incident or stop-work order, explain it clea
 
 # 3. The Chat Handler Function
 def get_eipl_bot_response(user_message: str, terminal_context_json: str):
+    if response_cache is None:
+        return generate_eipl_bot_response(user_message, terminal_context_json)
+    return response_cache.get(
+        terminal_context_json,
+        user_message,
+        lambda: generate_eipl_bot_response(user_message, terminal_context_json),
+    )
+
+
+def generate_eipl_bot_response(user_message: str, terminal_context_json: str):
     prompt = f"LIVE TERMINAL DATA:\n{terminal_context_json}\n\nUSER QUESTION:\n{user_message}"
 
     # Call Gemini 2.5 Flash for fast, real-time agentic reasoning
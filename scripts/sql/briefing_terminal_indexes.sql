@@ -0,0 +1,24 @@
+-- Terminal tagging and indexes behind the multi-terminal executive briefings (get_executive_briefings).
+-- Rows left with a NULL terminal_id keep serving the single-terminal briefing unchanged.
+-- PostgreSQL 9.6+ (ADD COLUMN IF NOT EXISTS); on SQLite drop "IF NOT EXISTS" from the ALTERs.
+-- Install with: psql "$TERMINAL_DB_URL" -f scripts/sql/briefing_terminal_indexes.sql
+
+ALTER TABLE terminal_bays ADD COLUMN IF NOT EXISTS terminal_id VARCHAR(64);
+ALTER TABLE lpg_inventory ADD COLUMN IF NOT EXISTS terminal_id VARCHAR(64);
+ALTER TABLE gate_queue ADD COLUMN IF NOT EXISTS terminal_id VARCHAR(64);
+ALTER TABLE safety_incidents ADD COLUMN IF NOT EXISTS terminal_id VARCHAR(64);
+
+-- Latest reading per terminal: the ROW_NUMBER() window reads each partition newest first.
+CREATE INDEX IF NOT EXISTS ix_lpg_inventory_terminal_recorded_at
+    ON lpg_inventory (terminal_id, recorded_at DESC);
+
+-- Open incidents per terminal, newest first. The predicate matches the briefing query text.
+CREATE INDEX IF NOT EXISTS ix_safety_incidents_terminal_open
+    ON safety_incidents (terminal_id, created_at DESC)
+    WHERE coalesce(status, 'OPEN') NOT IN ('CLOSED', 'RESOLVED');
+
+CREATE INDEX IF NOT EXISTS ix_gate_queue_terminal ON gate_queue (terminal_id);
+CREATE INDEX IF NOT EXISTS ix_terminal_bays_terminal ON terminal_bays (terminal_id);
+
+-- New readings by recorded_at, for the hourly rollup's watermark range scan (eipl_briefing_rollup.py).
+CREATE INDEX IF NOT EXISTS ix_lpg_inventory_recorded_at ON lpg_inventory (recorded_at);
@@ -0,0 +1,28 @@
+-- Content-addressed compliance snapshots for the gate-pass audit log (set_snapshot_dedup).
+-- Each distinct snapshot is stored once, keyed by the SHA-256 of its canonical JSON. A deduplicated
+-- audit row holds that hash in snapshot_sha256 (a foreign key) and leaves compliance_snapshot NULL;
+-- rows written inline keep compliance_snapshot and a NULL snapshot_sha256.
+-- PostgreSQL 9.6+. SQLite cannot drop NOT NULL or add constraints in place: recreate
+-- gate_pass_audit_log from the ORM model (Base.metadata.create_all) instead.
+-- Install with: psql "$TERMINAL_DB_URL" -f scripts/sql/gate_pass_snapshot_dedup.sql
+-- Then compact existing rows: python scripts/eipl_snapshot_dedup.py
+
+CREATE TABLE IF NOT EXISTS gate_pass_compliance_snapshot (
+    snapshot_hash VARCHAR(64) PRIMARY KEY,
+    snapshot JSON NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+ALTER TABLE gate_pass_audit_log
+    ADD COLUMN IF NOT EXISTS snapshot_sha256 VARCHAR(64)
+    REFERENCES gate_pass_compliance_snapshot (snapshot_hash);
+ALTER TABLE gate_pass_audit_log ALTER COLUMN compliance_snapshot DROP NOT NULL;
+
+-- Exactly one of the inline snapshot and the reference.
+ALTER TABLE gate_pass_audit_log DROP CONSTRAINT IF EXISTS ck_gate_pass_audit_log_snapshot;
+ALTER TABLE gate_pass_audit_log ADD CONSTRAINT ck_gate_pass_audit_log_snapshot
+    CHECK ((compliance_snapshot IS NULL) <> (snapshot_sha256 IS NULL));
+
+-- Keeps the foreign-key check cheap when snapshot rows are deleted.
+CREATE INDEX IF NOT EXISTS ix_gate_pass_audit_log_snapshot_sha256
+    ON gate_pass_audit_log (snapshot_sha256);
@@ -0,0 +1,38 @@
+-- Maintained updated_at columns for the EIPL Predictive Watchdog incremental snapshot mode
+-- (WATCHDOG_SNAPSHOT_MODE=incremental), PostgreSQL 11+.
+-- Existing rows are stamped with the migration time; the trigger re-stamps every insert and update,
+-- whatever the writer sends. The watchdog re-reads an overlap window (WATCHDOG_INCREMENTAL_OVERLAP_SECONDS)
+-- behind its watermark, since now() is the transaction start and a long transaction can commit a row
+-- stamped earlier than rows already read.
+-- Install with: psql "$TERMINAL_DB_URL" -f scripts/sql/watchdog_incremental.sql
+
+ALTER TABLE terminal_ops ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+ALTER TABLE safety_incidents ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+ALTER TABLE truck_compliance ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION eipl_watchdog_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS eipl_watchdog_touch_updated_at ON terminal_ops;
+CREATE TRIGGER eipl_watchdog_touch_updated_at
+    BEFORE INSERT OR UPDATE ON terminal_ops
+    FOR EACH ROW EXECUTE FUNCTION eipl_watchdog_touch_updated_at();
+
+DROP TRIGGER IF EXISTS eipl_watchdog_touch_updated_at ON safety_incidents;
+CREATE TRIGGER eipl_watchdog_touch_updated_at
+    BEFORE INSERT OR UPDATE ON safety_incidents
+    FOR EACH ROW EXECUTE FUNCTION eipl_watchdog_touch_updated_at();
+
+DROP TRIGGER IF EXISTS eipl_watchdog_touch_updated_at ON truck_compliance;
+CREATE TRIGGER eipl_watchdog_touch_updated_at
+    BEFORE INSERT OR UPDATE ON truck_compliance
+    FOR EACH ROW EXECUTE FUNCTION eipl_watchdog_touch_updated_at();
+
+-- Range scans for the per-cycle changed-row reads.
+CREATE INDEX IF NOT EXISTS ix_terminal_ops_updated_at ON terminal_ops (updated_at);
+CREATE INDEX IF NOT EXISTS ix_safety_incidents_updated_at ON safety_incidents (updated_at);
+CREATE INDEX IF NOT EXISTS ix_truck_compliance_updated_at ON truck_compliance (updated_at);
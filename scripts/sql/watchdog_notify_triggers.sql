@@ -0,0 +1,35 @@
+-- LISTEN/NOTIFY triggers for the EIPL Predictive Watchdog event-driven mode (PostgreSQL 11+).
+-- Every row change on the watched tables publishes {"table", "op", "id"} on channel eipl_watchdog.
+-- Install with: psql "$TERMINAL_DB_URL" -f scripts/sql/watchdog_notify_triggers.sql
+
+CREATE OR REPLACE FUNCTION eipl_watchdog_notify() RETURNS trigger AS $$
+DECLARE
+    row_data jsonb;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_data := to_jsonb(OLD);
+    ELSE
+        row_data := to_jsonb(NEW);
+    END IF;
+    PERFORM pg_notify(
+        'eipl_watchdog',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_data ->> TG_ARGV[0])::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS eipl_watchdog_notify ON safety_incidents;
+CREATE TRIGGER eipl_watchdog_notify
+    AFTER INSERT OR UPDATE OR DELETE ON safety_incidents
+    FOR EACH ROW EXECUTE FUNCTION eipl_watchdog_notify('incident_id');
+
+DROP TRIGGER IF EXISTS eipl_watchdog_notify ON terminal_ops;
+CREATE TRIGGER eipl_watchdog_notify
+    AFTER INSERT OR UPDATE OR DELETE ON terminal_ops
+    FOR EACH ROW EXECUTE FUNCTION eipl_watchdog_notify('bay_id');
+
+DROP TRIGGER IF EXISTS eipl_watchdog_notify ON truck_compliance;
+CREATE TRIGGER eipl_watchdog_notify
+    AFTER INSERT OR UPDATE OR DELETE ON truck_compliance
+    FOR EACH ROW EXECUTE FUNCTION eipl_watchdog_notify('truck_id');
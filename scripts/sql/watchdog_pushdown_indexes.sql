@@ -0,0 +1,19 @@
+-- Indexes behind the EIPL Predictive Watchdog pushdown snapshot mode (WATCHDOG_SNAPSHOT_MODE=pushdown)
+-- and watermark incident tracking (WATCHDOG_INCIDENT_TRACKING=watermark).
+-- Each keeps its scan proportional to what is live or new, not to table history.
+-- Works on PostgreSQL and SQLite 3.8+.
+-- Install with: psql "$TERMINAL_DB_URL" -f scripts/sql/watchdog_pushdown_indexes.sql
+
+-- Open incidents. The predicate matches the watchdog query text exactly so the planner can use it.
+CREATE INDEX IF NOT EXISTS ix_safety_incidents_open
+    ON safety_incidents (incident_id)
+    WHERE lower(trim(coalesce(resolved_status, ''))) NOT IN ('resolved', 'closed', 'true', '1');
+
+-- Occupied bays ordered by gate entry, for the overdue-wait range scan.
+CREATE INDEX IF NOT EXISTS ix_terminal_ops_occupied_gate_entry
+    ON terminal_ops (gate_entry_time)
+    WHERE current_truck_id IS NOT NULL;
+
+-- New incidents by creation time, for the watermark range scan.
+CREATE INDEX IF NOT EXISTS ix_safety_incidents_created_at
+    ON safety_incidents (created_at);